@@ -0,0 +1,59 @@
+# src/almacenamiento.py - Interfaz común de los backends de persistencia
+from typing import Callable, Dict, Iterable, List, Protocol, runtime_checkable
+
+from src.cambios import Cambio
+from src.carga import CargaTablas
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.persistencia import PersistenciaCSV
+from src.persistencia_memoria import PersistenciaMemoria
+from src.persistencia_sqlite import PersistenciaSQLite
+
+
+@runtime_checkable
+class Almacenamiento(Protocol):
+    """Lo que main, la interfaz y las pruebas esperan de un backend.
+
+    Carga y guardado completos por tabla, escritura por fila (`upsert` y
+    `eliminar` con el nombre de la tabla: 'estudiantes', 'cursos',
+    'inscripciones' o 'matriculas') y exportación a JSON. `registrar_cambios`
+    recibe los cambios que publica ConsultasAcademicas. Si
+    `escritura_por_fila` es verdadero, cada cambio registrado ya queda
+    guardado y no hace falta reescribir tablas al salir. `cargar_todo` carga
+    las cuatro tablas (a la vez, si el backend lo aprovecha) con sus tiempos.
+
+    El diario, el registro de tablas modificadas y el autoguardado son
+    propios de PersistenciaCSV: main solo los usa con ese backend.
+    """
+
+    escritura_por_fila: bool
+
+    def cargar_estudiantes(self) -> List[Estudiante]: ...
+    def guardar_estudiantes(self, estudiantes: List[Estudiante]): ...
+    def cargar_cursos(self) -> List[Curso]: ...
+    def guardar_cursos(self, cursos: List[Curso]): ...
+    def cargar_inscripciones(self) -> List[Inscripcion]: ...
+    def guardar_inscripciones(self, inscripciones: List[Inscripcion]): ...
+    def cargar_matriculas(self) -> List[Matricula]: ...
+    def guardar_matriculas(self, matriculas: List[Matricula]): ...
+    def cargar_todo(self, procesos: int = 0) -> CargaTablas: ...
+    def upsert(self, tabla: str, registros: Iterable): ...
+    def eliminar(self, tabla: str, claves: Iterable[str]): ...
+    def registrar_cambios(self, cambios: List[Cambio]): ...
+    def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                      inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str: ...
+    def cerrar(self): ...
+
+
+# Nombre de configuración -> constructor del backend
+BACKENDS: Dict[str, Callable[[], Almacenamiento]] = {
+    'csv': PersistenciaCSV,
+    'sqlite': PersistenciaSQLite,
+    'memoria': PersistenciaMemoria,
+}
+
+
+def crear_almacenamiento(backend: str) -> Almacenamiento:
+    """Instancia el backend configurado; ValueError si no existe"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    return BACKENDS[backend]()
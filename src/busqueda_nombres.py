@@ -0,0 +1,237 @@
+# src/busqueda_nombres.py - Índice de nombres para búsqueda por prefijo y aproximada
+import bisect
+import heapq
+import unicodedata
+from itertools import groupby
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Clave reservada en los nodos del trie para marcar el fin de una palabra
+_FIN = ''
+
+
+def normalizar(texto: str) -> str:
+    """Quita tildes y diacríticos y pasa a minúsculas ("Pérez" -> "perez")"""
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def palabras_normalizadas(texto: str) -> List[str]:
+    """Divide un texto en palabras normalizadas"""
+    return normalizar(texto).split()
+
+
+def trigramas(palabra: str) -> Set[str]:
+    """Trigramas de una palabra con relleno en los extremos"""
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceNombres:
+    """Índice de nombres y apellidos: trie de prefijos + índice de trigramas.
+
+    Ambas estructuras se construyen sobre el vocabulario de palabras
+    normalizadas (mucho menor que el número de estudiantes, porque los
+    nombres se repiten). Cada palabra apunta a la lista de estudiantes que la
+    usan, ordenada por (apellidos, id), que es el desempate del ranking; así
+    la búsqueda recorre los candidatos en orden y se detiene al completar el
+    límite sin materializar grupos grandes.
+    """
+
+    def __init__(self, similitud_minima: float = 0.4):
+        self.similitud_minima = similitud_minima
+        self._trie: dict = {}
+        self._trigramas: Dict[str, Set[str]] = {}
+        self._ids_por_palabra: Dict[str, List[Tuple[str, str]]] = {}
+        self._palabras_por_id: Dict[str, Tuple[str, ...]] = {}
+        self._apellidos_por_id: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._palabras_por_id)
+
+    def agregar(self, estudiante_id: str, nombres: str, apellidos: str):
+        """Registra (o reemplaza) los nombres de un estudiante"""
+        if estudiante_id in self._palabras_por_id:
+            self.quitar(estudiante_id)
+
+        palabras = tuple(dict.fromkeys(palabras_normalizadas(f"{nombres} {apellidos}")))
+        entrada = (normalizar(apellidos), estudiante_id)
+        self._palabras_por_id[estudiante_id] = palabras
+        self._apellidos_por_id[estudiante_id] = entrada[0]
+
+        for palabra in palabras:
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                self._ids_por_palabra[palabra] = [entrada]
+                self._agregar_palabra(palabra)
+            else:
+                bisect.insort(ids, entrada)
+
+    def cargar(self, registros: Iterable[Tuple[str, str, str]]):
+        """Carga masiva de (id, nombres, apellidos); ordena cada lista una sola vez"""
+        for estudiante_id, nombres, apellidos in registros:
+            if estudiante_id in self._palabras_por_id:
+                continue
+            palabras = tuple(dict.fromkeys(palabras_normalizadas(f"{nombres} {apellidos}")))
+            entrada = (normalizar(apellidos), estudiante_id)
+            self._palabras_por_id[estudiante_id] = palabras
+            self._apellidos_por_id[estudiante_id] = entrada[0]
+
+            for palabra in palabras:
+                ids = self._ids_por_palabra.get(palabra)
+                if ids is None:
+                    self._ids_por_palabra[palabra] = [entrada]
+                    self._agregar_palabra(palabra)
+                else:
+                    ids.append(entrada)
+
+        for ids in self._ids_por_palabra.values():
+            ids.sort()
+
+    def quitar(self, estudiante_id: str):
+        """Elimina un estudiante del índice"""
+        palabras = self._palabras_por_id.pop(estudiante_id, ())
+        entrada = (self._apellidos_por_id.pop(estudiante_id, ''), estudiante_id)
+
+        for palabra in palabras:
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                continue
+            posicion = bisect.bisect_left(ids, entrada)
+            if posicion < len(ids) and ids[posicion] == entrada:
+                del ids[posicion]
+            if not ids:
+                del self._ids_por_palabra[palabra]
+                self._quitar_palabra(palabra)
+
+    def buscar(self, texto: str, limite: int = 10) -> List[Tuple[str, float]]:
+        """Retorna hasta `limite` pares (id, puntaje) ordenados por relevancia.
+
+        Cada palabra de la consulta debe coincidir con alguna palabra del
+        estudiante: exacta (1.0), por prefijo (0.75-1.0) o aproximada por
+        trigramas (< 0.7). El puntaje total es la suma por palabra.
+        """
+        consulta = palabras_normalizadas(texto)
+        if not consulta or limite <= 0:
+            return []
+
+        # Puntaje de cada palabra del vocabulario para cada término de la consulta
+        coincidencias = [self._puntuar_vocabulario(termino) for termino in consulta]
+        if not all(coincidencias):
+            return []
+
+        # El término más selectivo genera los candidatos; el resto solo los puntúa
+        orden = sorted(range(len(consulta)),
+                       key=lambda k: sum(len(self._ids_por_palabra[p]) for p in coincidencias[k]))
+        principal = coincidencias[orden[0]]
+        otros = [coincidencias[k] for k in orden[1:]]
+        maximo_otros = sum(max(puntajes.values()) for puntajes in otros)
+
+        # mejores: lista ordenada por (-puntaje, apellidos, id) de a lo sumo `limite`
+        mejores: List[Tuple[float, str, str]] = []
+        vistos: Set[str] = set()
+        palabras_por_puntaje = sorted(principal.items(), key=lambda item: -item[1])
+
+        for puntaje, grupo in groupby(palabras_por_puntaje, key=lambda item: item[1]):
+            # Ningún candidato de este grupo o posteriores supera esta cota
+            cota = puntaje + maximo_otros
+            if len(mejores) == limite and -mejores[-1][0] > cota:
+                break
+
+            listas = [self._ids_por_palabra[palabra] for palabra, _ in grupo]
+            for apellidos, estudiante_id in heapq.merge(*listas):
+                if len(mejores) == limite and mejores[-1] <= (-cota, apellidos, estudiante_id):
+                    # Ni este candidato ni los siguientes del grupo (que llegan en
+                    # orden creciente de apellidos e id) pueden desplazar al último
+                    break
+                if estudiante_id in vistos:
+                    continue
+                vistos.add(estudiante_id)
+
+                total = puntaje
+                for puntajes_termino in otros:
+                    mejor = max((puntajes_termino.get(p, 0.0) for p in self._palabras_por_id[estudiante_id]),
+                                default=0.0)
+                    if mejor == 0.0:
+                        break
+                    total += mejor
+                else:
+                    bisect.insort(mejores, (-total, apellidos, estudiante_id))
+                    if len(mejores) > limite:
+                        mejores.pop()
+
+        return [(estudiante_id, round(-negativo, 3)) for negativo, _, estudiante_id in mejores]
+
+    # ------------------------------------------------------------------
+    # Vocabulario
+    # ------------------------------------------------------------------
+    def _puntuar_vocabulario(self, termino: str) -> Dict[str, float]:
+        puntajes = {}
+        for palabra in self._palabras_con_prefijo(termino):
+            puntajes[palabra] = 1.0 if palabra == termino else 0.75 + 0.25 * len(termino) / len(palabra)
+
+        if len(termino) >= 3:
+            for palabra, similitud in self._palabras_similares(termino):
+                if palabra not in puntajes:
+                    puntajes[palabra] = 0.7 * similitud
+        return puntajes
+
+    def _palabras_con_prefijo(self, prefijo: str) -> Iterable[str]:
+        nodo = self._trie
+        for caracter in prefijo:
+            nodo = nodo.get(caracter)
+            if nodo is None:
+                return
+
+        pendientes = [nodo]
+        while pendientes:
+            nodo = pendientes.pop()
+            for caracter, hijo in nodo.items():
+                if caracter == _FIN:
+                    yield hijo
+                else:
+                    pendientes.append(hijo)
+
+    def _palabras_similares(self, termino: str) -> List[Tuple[str, float]]:
+        trigramas_termino = trigramas(termino)
+        comunes: Dict[str, int] = {}
+        for trigrama in trigramas_termino:
+            for palabra in self._trigramas.get(trigrama, ()):
+                comunes[palabra] = comunes.get(palabra, 0) + 1
+
+        similares = []
+        for palabra, compartidos in comunes.items():
+            # Jaccard: |A ∩ B| / |A ∪ B|
+            similitud = compartidos / (len(trigramas_termino) + len(trigramas(palabra)) - compartidos)
+            if similitud >= self.similitud_minima:
+                similares.append((palabra, similitud))
+        return similares
+
+    def _agregar_palabra(self, palabra: str):
+        nodo = self._trie
+        for caracter in palabra:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[_FIN] = palabra
+
+        for trigrama in trigramas(palabra):
+            self._trigramas.setdefault(trigrama, set()).add(palabra)
+
+    def _quitar_palabra(self, palabra: str):
+        # Recorre el camino y poda los nodos que quedan vacíos
+        camino = [self._trie]
+        for caracter in palabra:
+            siguiente = camino[-1].get(caracter)
+            if siguiente is None:
+                return
+            camino.append(siguiente)
+        camino[-1].pop(_FIN, None)
+        for posicion in range(len(palabra), 0, -1):
+            if camino[posicion]:
+                break
+            del camino[posicion - 1][palabra[posicion - 1]]
+
+        for trigrama in trigramas(palabra):
+            palabras = self._trigramas.get(trigrama)
+            if palabras is not None:
+                palabras.discard(palabra)
+                if not palabras:
+                    del self._trigramas[trigrama]
@@ -0,0 +1,67 @@
+# src/cache.py - Caché LRU de resultados de consultas invalidada por versiones
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class CacheConsultas:
+    """Caché LRU de resultados de consultas.
+
+    Cada entrada guarda, junto al resultado, las versiones de las tablas de
+    las que depende. Una entrada es válida solo si esas versiones no han
+    cambiado; así una modificación invalida únicamente las consultas que leen
+    la tabla modificada.
+    """
+
+    def __init__(self, capacidad: int = 128):
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas: "OrderedDict[Hashable, Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+
+    def obtener(self, clave: Hashable, versiones: Tuple[int, ...], calcular: Callable[[], Any]) -> Any:
+        """Retorna el resultado almacenado o lo calcula y lo almacena"""
+        entrada = self._entradas.get(clave)
+        if entrada is not None and entrada[0] == versiones:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+        self.fallos += 1
+        resultado = calcular()
+        if self.capacidad > 0:
+            self._entradas[clave] = (versiones, resultado)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+        return resultado
+
+    def limpiar(self):
+        """Descarta todas las entradas (los contadores se conservan)"""
+        self._entradas.clear()
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores para ajustar la capacidad"""
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'entradas': len(self._entradas),
+            'capacidad': self.capacidad,
+        }
+
+
+def cacheada(*tablas: str):
+    """Decorador para métodos de consulta que dependen de `tablas`.
+
+    El objeto debe tener `_cache` (CacheConsultas) y `_versiones` (dict de
+    tabla -> contador). La clave es el nombre del método y sus argumentos.
+    El resultado se comparte entre llamadas: no debe modificarse.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            clave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+            versiones = tuple(self._versiones[tabla] for tabla in tablas)
+            return self._cache.obtener(clave, versiones, lambda: metodo(self, *args, **kwargs))
+        return envoltura
+    return decorador
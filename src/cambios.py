@@ -0,0 +1,37 @@
+# src/cambios.py - Registro de cambios que publican las mutaciones
+from typing import Any, NamedTuple
+
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+GUARDAR = 'guardar'
+ELIMINAR = 'eliminar'
+
+# Modelo y campo clave de cada tabla
+MODELOS = {
+    'estudiantes': Estudiante,
+    'cursos': Curso,
+    'inscripciones': Inscripcion,
+    'matriculas': Matricula,
+}
+CLAVES = {
+    'estudiantes': 'id',
+    'cursos': 'codigo',
+    'inscripciones': 'id',
+    'matriculas': 'id',
+}
+
+
+class Cambio(NamedTuple):
+    """Un registro guardado (insertado o modificado) o eliminado de una tabla"""
+    tabla: str
+    operacion: str
+    clave: str
+    registro: Any = None
+
+
+def guardado(tabla: str, registro) -> Cambio:
+    return Cambio(tabla, GUARDAR, getattr(registro, CLAVES[tabla]), registro)
+
+
+def eliminado(tabla: str, clave: str) -> Cambio:
+    return Cambio(tabla, ELIMINAR, clave)
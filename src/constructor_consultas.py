@@ -0,0 +1,230 @@
+# src/constructor_consultas.py - Consultas declarativas con planificador de índices
+import heapq
+from dataclasses import dataclass, field, fields
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from src.cambios import MODELOS
+
+
+@dataclass
+class Filtro:
+    """Condición sobre un registro: igualdad, rango cerrado o predicado libre"""
+    tipo: str
+    campo: Optional[str] = None
+    valor: Any = None
+    minimo: Any = None
+    maximo: Any = None
+    predicado: Optional[Callable[[Any], bool]] = None
+    descripcion: str = ''
+    # Extrae el valor comparable del registro (p. ej. la fecha ya convertida)
+    extraer: Optional[Callable[[Any], Any]] = None
+
+    def cumple(self, registro) -> bool:
+        if self.tipo == 'predicado':
+            return bool(self.predicado(registro))
+
+        valor = self.extraer(registro) if self.extraer is not None else getattr(registro, self.campo)
+        if self.tipo == 'igual':
+            return valor == self.valor
+        if valor is None:
+            return False
+        return ((self.minimo is None or self.minimo <= valor) and
+                (self.maximo is None or valor <= self.maximo))
+
+    def describir(self) -> str:
+        if self.tipo == 'igual':
+            return f"{self.campo} = {self.valor!r}"
+        if self.tipo == 'rango':
+            minimo = '-inf' if self.minimo is None else repr(self.minimo)
+            maximo = '+inf' if self.maximo is None else repr(self.maximo)
+            return f"{minimo} <= {self.campo} <= {maximo}"
+        return self.descripcion or 'predicado'
+
+
+@dataclass
+class Plan:
+    """Ruta de acceso elegida para una consulta"""
+    tabla: str
+    acceso: str                     # 'igualdad', 'rango' o 'recorrido'
+    filas_estimadas: int
+    filtro_indexado: Optional[Filtro] = None
+    residuales: List[Filtro] = field(default_factory=list)
+    orden_por_indice: bool = False
+
+    def describir(self) -> str:
+        if self.acceso == 'recorrido':
+            lineas = [f"Recorrido completo de {self.tabla} (~{self.filas_estimadas} filas)"]
+        else:
+            lineas = [f"Índice de {self.acceso} {self.tabla}.{self.filtro_indexado.campo}: "
+                      f"{self.filtro_indexado.describir()} (~{self.filas_estimadas} filas)"]
+        if self.residuales:
+            lineas.append("Filtros residuales: " + "; ".join(f.describir() for f in self.residuales))
+        if self.orden_por_indice:
+            lineas.append("Orden: entregado por el índice")
+        return "\n".join(lineas)
+
+
+class Consulta:
+    """Consulta declarativa sobre una tabla de ConsultasAcademicas.
+
+    Se arma encadenando filtros, proyección, orden y límite, y se ejecuta al
+    iterarla. El planificador compara las rutas disponibles (índices de
+    igualdad y de rango que ofrece la fuente) con el recorrido completo y
+    elige la de menos filas estimadas; los demás filtros se aplican sobre
+    esas filas. `explicar()` describe el plan sin ejecutarlo.
+
+        consultas.consulta('matriculas').donde(curso_codigo='MAT101') \\
+            .entre('nota', 4.0, 5.0).ordenar_por('nota', descendente=True).limitar(5)
+    """
+
+    def __init__(self, fuente, tabla: str):
+        if tabla not in MODELOS:
+            raise ValueError(f"Tabla desconocida: {tabla}")
+        self._fuente = fuente
+        self._tabla = tabla
+        self._campos = {f.name for f in fields(MODELOS[tabla])}
+        self._filtros: List[Filtro] = []
+        self._proyeccion: Optional[Tuple[str, ...]] = None
+        self._orden: Tuple[str, ...] = ()
+        self._descendente = False
+        self._limite: Optional[int] = None
+
+    def _validar_campo(self, campo: str):
+        if campo not in self._campos:
+            raise ValueError(f"La tabla {self._tabla} no tiene el campo '{campo}'")
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+    def donde(self, **igualdades) -> 'Consulta':
+        """Filtros de igualdad campo=valor"""
+        for campo, valor in igualdades.items():
+            self._validar_campo(campo)
+            self._filtros.append(Filtro('igual', campo, valor=valor))
+        return self
+
+    def entre(self, campo: str, minimo=None, maximo=None) -> 'Consulta':
+        """Filtro de rango cerrado; un extremo None deja el rango abierto.
+        
+        Si el campo tiene índice de rango, los extremos y los valores se
+        comparan en el tipo del índice (las fechas como date).
+        """
+        self._validar_campo(campo)
+        indice = self._fuente.indice_rango(self._tabla, campo)
+        if indice is None:
+            self._filtros.append(Filtro('rango', campo, minimo=minimo, maximo=maximo))
+        else:
+            self._filtros.append(Filtro('rango', campo, minimo=indice.normalizar_limite(minimo),
+                                        maximo=indice.normalizar_limite(maximo),
+                                        extraer=indice.clave_de))
+        return self
+
+    def filtrar(self, predicado: Callable[[Any], bool], descripcion: str = '') -> 'Consulta':
+        """Filtro arbitrario sobre el registro (siempre residual)"""
+        self._filtros.append(Filtro('predicado', predicado=predicado, descripcion=descripcion))
+        return self
+
+    def seleccionar(self, *campos: str) -> 'Consulta':
+        """Proyección: cada resultado es un dict con solo estos campos"""
+        for campo in campos:
+            self._validar_campo(campo)
+        self._proyeccion = campos or None
+        return self
+
+    def ordenar_por(self, *campos: str, descendente: bool = False) -> 'Consulta':
+        """Orden por uno o varios campos (los valores None van al final)"""
+        for campo in campos:
+            self._validar_campo(campo)
+        self._orden = campos
+        self._descendente = descendente
+        return self
+
+    def limitar(self, limite: int) -> 'Consulta':
+        if limite < 0:
+            raise ValueError("El límite debe ser no negativo")
+        self._limite = limite
+        return self
+
+    # ------------------------------------------------------------------
+    # Planificación
+    # ------------------------------------------------------------------
+    def plan(self) -> Plan:
+        """Elige la ruta de acceso con menos filas estimadas"""
+        mejor = Plan(self._tabla, 'recorrido', len(getattr(self._fuente, self._tabla)))
+
+        for filtro in self._filtros:
+            if filtro.tipo == 'igual':
+                filas = self._fuente.registros_por_indice(self._tabla, filtro.campo, filtro.valor)
+                if filas is not None and len(filas) < mejor.filas_estimadas:
+                    mejor = Plan(self._tabla, 'igualdad', len(filas), filtro)
+            elif filtro.tipo == 'rango':
+                indice = self._fuente.indice_rango(self._tabla, filtro.campo)
+                if indice is None:
+                    continue
+                estimadas = indice.contar(filtro.minimo, filtro.maximo)
+                if estimadas < mejor.filas_estimadas or (estimadas == mejor.filas_estimadas and
+                                                         mejor.acceso == 'recorrido'):
+                    mejor = Plan(self._tabla, 'rango', estimadas, filtro)
+
+        mejor.residuales = [f for f in self._filtros if f is not mejor.filtro_indexado]
+        mejor.orden_por_indice = (mejor.acceso == 'rango' and
+                                  self._orden == (mejor.filtro_indexado.campo,))
+        return mejor
+
+    def explicar(self) -> str:
+        """Describe el plan elegido, el orden y el límite sin ejecutar la consulta"""
+        plan = self.plan()
+        lineas = [plan.describir()]
+        if self._orden and not plan.orden_por_indice:
+            sentido = ' desc' if self._descendente else ''
+            lineas.append(f"Orden: {', '.join(self._orden)}{sentido}")
+        if self._limite is not None:
+            lineas.append(f"Límite: {self._limite}")
+        return "\n".join(lineas)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+    def _candidatos(self, plan: Plan) -> Iterator:
+        filtro = plan.filtro_indexado
+        if plan.acceso == 'igualdad':
+            return iter(self._fuente.registros_por_indice(self._tabla, filtro.campo, filtro.valor))
+        if plan.acceso == 'rango':
+            indice = self._fuente.indice_rango(self._tabla, filtro.campo)
+            return indice.rango(filtro.minimo, filtro.maximo,
+                                descendente=plan.orden_por_indice and self._descendente)
+        return iter(getattr(self._fuente, self._tabla))
+
+    def __iter__(self) -> Iterator:
+        plan = self.plan()
+        residuales = plan.residuales
+        registros = (r for r in self._candidatos(plan) if all(f.cumple(r) for f in residuales))
+
+        if self._orden and not plan.orden_por_indice:
+            campos = self._orden
+
+            def clave(registro):
+                valores = [getattr(registro, campo) for campo in campos]
+                return tuple((v is None, v) for v in valores) if not self._descendente \
+                    else tuple((v is not None, v) for v in valores)
+
+            if self._limite is not None:
+                seleccion = heapq.nlargest if self._descendente else heapq.nsmallest
+                registros = iter(seleccion(self._limite, registros, key=clave))
+            else:
+                registros = iter(sorted(registros, key=clave, reverse=self._descendente))
+        elif self._limite is not None:
+            registros = islice(registros, self._limite)
+
+        if self._proyeccion is None:
+            return registros
+        proyeccion = self._proyeccion
+        return ({campo: getattr(r, campo) for campo in proyeccion} for r in registros)
+
+    def ejecutar(self) -> List:
+        """Materializa el resultado en una lista"""
+        return list(self)
+
+    def contar(self) -> int:
+        return sum(1 for _ in self)
@@ -1,154 +1,1062 @@
 # src/consultas.py - Versión actualizada con inscripciones
-from typing import List, Tuple, Optional
+import bisect
+import heapq
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple, Optional, Union
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.validaciones import LIMITE_CREDITOS_ESTUDIANTE
+from src.busqueda_nombres import IndiceNombres, palabras_normalizadas
+from src.cambios import Cambio, eliminado, guardado
+from src.indice_rango import IndiceRango, clave_fecha, convertir_fecha
+from src.constructor_consultas import Consulta
+from src.historial import Historial, construir_historial
+from src.cache import CacheConsultas, cacheada
+from src.paginacion import paginar
+from src.estadisticas import (EstadisticasCohorte, EstadisticasCurso, NOTA_APROBATORIA, PercentilesInstitucion,
+                              PromedioEstudiante, calcular_cohortes, calcular_estadisticas,
+                              calcular_percentiles, calcular_promedios_ponderados,
+                              construir_columnas_notas)
+
+@dataclass
+class ResultadoLote:
+    """Resultado de una búsqueda por lote: claves encontradas y faltantes.
+    
+    Ambas partes conservan el orden de entrada y no repiten claves (los
+    correos que solo difieren en mayúsculas cuentan como una sola clave).
+    """
+    encontrados: Dict[str, Estudiante] = field(default_factory=dict)
+    faltantes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CargaDocente:
+    """Cursos, créditos y estudiantes a cargo de un docente"""
+    docente: str
+    cursos: List[str]
+    creditos: int
+    inscritos: int
+    estudiantes: int
+    calificados: int
+
 
 class ConsultasAcademicas:
     """Clase para realizar consultas y reportes del sistema"""
     
+    TABLAS = ('estudiantes', 'cursos', 'inscripciones', 'matriculas')
+    
+    # Índices de igualdad que puede usar el planificador de consultas:
+    # (tabla, campo) -> (atributo del índice, si la clave es única)
+    INDICES_IGUALDAD = {
+        ('estudiantes', 'id'): ('_estudiantes_por_id', True),
+        ('estudiantes', 'documento'): ('_estudiantes_por_documento', True),
+        ('cursos', 'codigo'): ('_cursos_por_codigo', True),
+        ('inscripciones', 'id'): ('_inscripciones_por_id', True),
+        ('matriculas', 'id'): ('_matriculas_por_id', True),
+        ('inscripciones', 'estudiante_id'): ('_inscripciones_por_estudiante', False),
+        ('inscripciones', 'curso_codigo'): ('_inscripciones_por_curso', False),
+        ('matriculas', 'estudiante_id'): ('_matriculas_por_estudiante', False),
+        ('matriculas', 'curso_codigo'): ('_matriculas_por_curso', False),
+        ('matriculas', 'inscripcion_id'): ('_matriculas_por_inscripcion', False),
+    }
+    
+    # Índice por clave primaria de cada tabla: las altas y los cambios de
+    # clave lo consultan para no repetir claves (ver _verificar_clave_libre)
+    INDICES_CLAVE = {
+        'estudiantes': '_estudiantes_por_id',
+        'cursos': '_cursos_por_codigo',
+        'inscripciones': '_inscripciones_por_id',
+        'matriculas': '_matriculas_por_id',
+    }
+    
+    # Campos de fecha con índice de rango, por tabla (la nota tiene el suyo)
+    CAMPOS_FECHA = {
+        'estudiantes': ('fecha_nacimiento',),
+        'inscripciones': ('fecha_inscripcion',),
+        'matriculas': ('fecha_matricula',),
+    }
+    
     def __init__(self, estudiantes: List[Estudiante], cursos: List[Curso], 
-                 inscripciones: List[Inscripcion], matriculas: List[Matricula]):
+                 inscripciones: List[Inscripcion], matriculas: List[Matricula],
+                 capacidad_cache: int = 128):
         self.estudiantes = estudiantes
         self.cursos = cursos
         self.inscripciones = inscripciones
         self.matriculas = matriculas
+        
+        # Versión de cada tabla: cada mutación la incrementa e invalida las
+        # entradas de la caché que dependen de esa tabla
+        self._versiones = {tabla: 0 for tabla in self.TABLAS}
+        self._cache = CacheConsultas(capacidad_cache)
+        self._suscriptores: List[Callable[[List[Cambio]], None]] = []
+        self.reconstruir_indices()
     
-    def buscar_estudiante_por_documento(self, documento: str) -> Optional[Estudiante]:
-        """Busca estudiante por número de documento"""
+    # ------------------------------------------------------------------
+    # Índices
+    # ------------------------------------------------------------------
+    def reconstruir_indices(self):
+        """Construye desde cero todos los índices sobre las listas actuales"""
+        self._marcar_modificadas(*self.TABLAS)
+        self._estudiantes_por_id = {}
+        self._estudiantes_por_documento = {}
+        self._estudiantes_por_correo = {}
+        self._estudiantes_por_dominio = {}
+        self._cursos_por_codigo = {}
+        self._cursos_por_docente = {}
+        self._inscripciones_por_id = {}
+        self._matriculas_por_id = {}
+        
+        # Índices agrupados por clave foránea: clave -> lista de registros
+        self._inscripciones_por_estudiante = {}
+        self._inscripciones_por_curso = {}
+        self._matriculas_por_estudiante = {}
+        self._matriculas_por_curso = {}
+        self._matriculas_por_inscripcion = {}
+        
+        # Créditos inscritos por estudiante, materializados: _indexar_inscripcion
+        # y las mutaciones de cursos los ajustan de forma incremental
+        self._creditos_por_estudiante = {}
+        
         for estudiante in self.estudiantes:
-            if estudiante.documento == documento:
-                return estudiante
+            self._indexar_estudiante(estudiante)
+        
+        # Índice ordenado de (apellido normalizado, id); se ordena una sola vez
+        # aquí y luego se mantiene con inserciones bisect
+        self._apellidos_ordenados = sorted(
+            (estudiante.apellidos.casefold(), estudiante.id) for estudiante in self.estudiantes
+        )
+        
+        # Trie de prefijos + trigramas para la búsqueda por nombre
+        self._indice_nombres = IndiceNombres()
+        self._indice_nombres.cargar(
+            (estudiante.id, estudiante.nombres, estudiante.apellidos) for estudiante in self.estudiantes
+        )
+        
+        for curso in self.cursos:
+            self._indexar_curso(curso)
+        for inscripcion in self.inscripciones:
+            self._indexar_inscripcion(inscripcion)
+        for matricula in self.matriculas:
+            self._indexar_matricula(matricula)
+        
+        # Tabla de posiciones por curso: lista ordenada de (-nota, estudiante_id,
+        # matricula_id) con las matrículas calificadas; asignar_nota la mantiene
+        self._posiciones_por_curso = {}
+        for codigo, matriculas_curso in self._matriculas_por_curso.items():
+            posiciones = sorted(_entrada_posicion(m) for m in matriculas_curso if m.nota is not None)
+            if posiciones:
+                self._posiciones_por_curso[codigo] = posiciones
+        
+        # Índices de rango: (tabla, campo) -> IndiceRango. Se construyen en la
+        # primera consulta que los usa (ver _indice_rango); desde entonces las
+        # mutaciones los mantienen. Las fechas se convierten a date una sola vez
+        self._indices_rango = {}
+    
+    def _indexar_estudiante(self, estudiante: Estudiante):
+        # setdefault conserva el primer registro ante claves repetidas,
+        # igual que hacía la búsqueda lineal
+        self._estudiantes_por_id.setdefault(estudiante.id, estudiante)
+        self._estudiantes_por_documento.setdefault(estudiante.documento, estudiante)
+        self._estudiantes_por_correo.setdefault(estudiante.correo.casefold(), estudiante)
+        dominio = _dominio_correo(estudiante.correo)
+        if dominio:
+            _agregar_a_grupo(self._estudiantes_por_dominio, dominio, estudiante)
+    
+    def _desindexar_estudiante(self, estudiante: Estudiante):
+        _quitar_de_indice(self._estudiantes_por_id, estudiante.id, estudiante)
+        _quitar_de_indice(self._estudiantes_por_documento, estudiante.documento, estudiante)
+        _quitar_de_indice(self._estudiantes_por_correo, estudiante.correo.casefold(), estudiante)
+        dominio = _dominio_correo(estudiante.correo)
+        if dominio:
+            _quitar_de_grupo(self._estudiantes_por_dominio, dominio, estudiante)
+    
+    def _indexar_nombres(self, estudiante: Estudiante):
+        # Índices que dependen de nombres y apellidos (ordenado por apellido y trie)
+        bisect.insort(self._apellidos_ordenados, (estudiante.apellidos.casefold(), estudiante.id))
+        self._indice_nombres.agregar(estudiante.id, estudiante.nombres, estudiante.apellidos)
+    
+    def _desindexar_nombres(self, estudiante: Estudiante):
+        entrada = (estudiante.apellidos.casefold(), estudiante.id)
+        posicion = bisect.bisect_left(self._apellidos_ordenados, entrada)
+        if posicion < len(self._apellidos_ordenados) and self._apellidos_ordenados[posicion] == entrada:
+            del self._apellidos_ordenados[posicion]
+        self._indice_nombres.quitar(estudiante.id)
+    
+    def _indice_rango(self, tabla: str, campo: str) -> IndiceRango:
+        # Construcción perezosa: solo paga la conversión y el orden quien consulta
+        indice = self._indices_rango.get((tabla, campo))
+        if indice is None:
+            if (tabla, campo) == ('matriculas', 'nota'):
+                indice = IndiceRango(attrgetter('nota'), attrgetter('id'))
+            else:
+                indice = IndiceRango(clave_fecha(campo), attrgetter('id'), convertir_fecha)
+            indice.cargar(getattr(self, tabla))
+            self._indices_rango[(tabla, campo)] = indice
+        return indice
+    
+    def _indexar_fechas(self, tabla: str, registro):
+        for campo in self.CAMPOS_FECHA[tabla]:
+            indice = self._indices_rango.get((tabla, campo))
+            if indice is not None:
+                indice.agregar(registro)
+    
+    def _desindexar_fechas(self, tabla: str, registro):
+        for campo in self.CAMPOS_FECHA[tabla]:
+            indice = self._indices_rango.get((tabla, campo))
+            if indice is not None:
+                indice.quitar(registro)
+    
+    def _indexar_curso(self, curso: Curso):
+        self._cursos_por_codigo.setdefault(curso.codigo, curso)
+        _agregar_a_grupo(self._cursos_por_docente, _clave_docente(curso.docente), curso)
+    
+    def _desindexar_curso(self, curso: Curso):
+        _quitar_de_indice(self._cursos_por_codigo, curso.codigo, curso)
+        _quitar_de_grupo(self._cursos_por_docente, _clave_docente(curso.docente), curso)
+    
+    def _indexar_inscripcion(self, inscripcion: Inscripcion):
+        self._inscripciones_por_id.setdefault(inscripcion.id, inscripcion)
+        _agregar_a_grupo(self._inscripciones_por_estudiante, inscripcion.estudiante_id, inscripcion)
+        _agregar_a_grupo(self._inscripciones_por_curso, inscripcion.curso_codigo, inscripcion)
+        self._sumar_creditos(inscripcion.estudiante_id, self._creditos_de_curso(inscripcion.curso_codigo))
+    
+    def _desindexar_inscripcion(self, inscripcion: Inscripcion):
+        self._desindexar_inscripciones((inscripcion,))
+    
+    def _desindexar_inscripciones(self, inscripciones: List[Inscripcion]):
+        # Cada grupo afectado se filtra una sola vez: borrar un grupo completo
+        # cuesta su tamaño, no su cuadrado
+        for inscripcion in inscripciones:
+            _quitar_de_indice(self._inscripciones_por_id, inscripcion.id, inscripcion)
+            self._sumar_creditos(inscripcion.estudiante_id, -self._creditos_de_curso(inscripcion.curso_codigo))
+        _quitar_de_grupos(self._inscripciones_por_estudiante, inscripciones, attrgetter('estudiante_id'))
+        _quitar_de_grupos(self._inscripciones_por_curso, inscripciones, attrgetter('curso_codigo'))
+    
+    def _creditos_de_curso(self, codigo: str) -> int:
+        # Las inscripciones a cursos inexistentes no suman créditos
+        curso = self._cursos_por_codigo.get(codigo)
+        return curso.creditos if curso else 0
+    
+    def _sumar_creditos(self, estudiante_id: str, creditos: int):
+        if not creditos:
+            return
+        total = self._creditos_por_estudiante.get(estudiante_id, 0) + creditos
+        if total:
+            self._creditos_por_estudiante[estudiante_id] = total
+        else:
+            del self._creditos_por_estudiante[estudiante_id]
+    
+    def _aplicar_creditos_de_cursos(self, codigos, signo: int):
+        # Suma (signo=1) o resta (signo=-1) los créditos vigentes de cada curso a
+        # sus inscritos. Las mutaciones de cursos restan antes de modificar y
+        # suman después: el costo es el tamaño de los grupos afectados
+        for codigo in codigos:
+            creditos = self._creditos_de_curso(codigo)
+            for inscripcion in self._inscripciones_por_curso.get(codigo, ()):
+                self._sumar_creditos(inscripcion.estudiante_id, signo * creditos)
+    
+    def _indexar_matricula(self, matricula: Matricula):
+        self._matriculas_por_id.setdefault(matricula.id, matricula)
+        _agregar_a_grupo(self._matriculas_por_estudiante, matricula.estudiante_id, matricula)
+        _agregar_a_grupo(self._matriculas_por_curso, matricula.curso_codigo, matricula)
+        _agregar_a_grupo(self._matriculas_por_inscripcion, matricula.inscripcion_id, matricula)
+    
+    def _desindexar_matriculas(self, matriculas: List[Matricula]):
+        for matricula in matriculas:
+            _quitar_de_indice(self._matriculas_por_id, matricula.id, matricula)
+        _quitar_de_grupos(self._matriculas_por_estudiante, matriculas, attrgetter('estudiante_id'))
+        _quitar_de_grupos(self._matriculas_por_curso, matriculas, attrgetter('curso_codigo'))
+        _quitar_de_grupos(self._matriculas_por_inscripcion, matriculas, attrgetter('inscripcion_id'))
+    
+    def _indexar_nota(self, matricula: Matricula):
+        if matricula.nota is None:
+            return
+        indice = self._indices_rango.get(('matriculas', 'nota'))
+        if indice is not None:
+            indice.agregar(matricula)
+        posiciones = self._posiciones_por_curso.setdefault(matricula.curso_codigo, [])
+        bisect.insort(posiciones, _entrada_posicion(matricula))
+    
+    def _desindexar_nota(self, matricula: Matricula):
+        indice = self._indices_rango.get(('matriculas', 'nota'))
+        if indice is not None:
+            indice.quitar(matricula)
+        posiciones = self._posiciones_por_curso.get(matricula.curso_codigo)
+        if matricula.nota is None or posiciones is None:
+            return
+        entrada = _entrada_posicion(matricula)
+        posicion = bisect.bisect_left(posiciones, entrada)
+        if posicion < len(posiciones) and posiciones[posicion] == entrada:
+            del posiciones[posicion]
+        if not posiciones:
+            del self._posiciones_por_curso[matricula.curso_codigo]
+    
+    # ------------------------------------------------------------------
+    # Versiones y caché
+    # ------------------------------------------------------------------
+    def _marcar_modificadas(self, *tablas: str):
+        for tabla in tablas:
+            self._versiones[tabla] += 1
+    
+    def version_tabla(self, tabla: str) -> int:
+        """Versión actual de una tabla (cambia con cada modificación)"""
+        return self._versiones[tabla]
+    
+    def estadisticas_cache(self) -> Dict[str, int]:
+        """Aciertos, fallos, entradas y capacidad de la caché de consultas"""
+        return self._cache.estadisticas()
+    
+    # ------------------------------------------------------------------
+    # Publicación de cambios
+    # ------------------------------------------------------------------
+    def suscribir(self, funcion: Callable[[List[Cambio]], None]):
+        """Registra `funcion(cambios)`, llamada al final de cada mutación con
+        los registros guardados o eliminados (una llamada por operación)"""
+        self._suscriptores.append(funcion)
+    
+    def _publicar(self, cambios: List[Cambio]):
+        if cambios:
+            for funcion in self._suscriptores:
+                funcion(cambios)
+    
+    def _publicar_actualizacion(self, tabla: str, clave_anterior: str, registro,
+                                referencias: Iterable[Cambio] = ()):
+        # Las referencias reescritas van en la misma publicación que el registro
+        cambios = [guardado(tabla, registro)]
+        if cambios[0].clave != clave_anterior:
+            cambios.insert(0, eliminado(tabla, clave_anterior))
+        cambios.extend(referencias)
+        self._publicar(cambios)
+    
+    # ------------------------------------------------------------------
+    # Claves primarias
+    # ------------------------------------------------------------------
+    def _verificar_clave_libre(self, tabla: str, clave: str):
+        # Los backends guardan por clave: una clave repetida reemplazaría al
+        # otro registro en disco aunque en memoria convivan los dos
+        if clave in getattr(self, self.INDICES_CLAVE[tabla]):
+            raise ValueError(f"Ya existe un registro en {tabla} con clave {clave}")
+    
+    def siguiente_id(self, tabla: str, prefijo: str, digitos: int = 3) -> str:
+        """ID libre de la forma prefijo + número, mayor que todos los existentes.
+        
+        A diferencia de contar los registros, no repite IDs tras eliminar.
+        """
+        mayor = 0
+        for clave in getattr(self, self.INDICES_CLAVE[tabla]):
+            numero = clave[len(prefijo):]
+            if clave.startswith(prefijo) and numero.isascii() and numero.isdigit():
+                mayor = max(mayor, int(numero))
+        return f"{prefijo}{mayor + 1:0{digitos}d}"
+    
+    # ------------------------------------------------------------------
+    # Mutaciones (mantienen listas, índices y versiones sincronizados).
+    # Modificar las listas directamente deja índices y caché desactualizados.
+    # ------------------------------------------------------------------
+    def agregar_estudiante(self, estudiante: Estudiante):
+        """Agrega un estudiante y lo registra en los índices; ValueError si el ID ya existe"""
+        self._verificar_clave_libre('estudiantes', estudiante.id)
+        self.estudiantes.append(estudiante)
+        self._indexar_estudiante(estudiante)
+        self._indexar_nombres(estudiante)
+        self._indexar_fechas('estudiantes', estudiante)
+        self._marcar_modificadas('estudiantes')
+        self._publicar([guardado('estudiantes', estudiante)])
+    
+    def actualizar_estudiante(self, estudiante: Estudiante, **cambios):
+        """Modifica campos de un estudiante manteniendo los índices al día"""
+        clave_anterior = estudiante.id
+        if cambios.get('id', clave_anterior) != clave_anterior:
+            self._verificar_clave_libre('estudiantes', cambios['id'])
+        self._desindexar_estudiante(estudiante)
+        self._desindexar_nombres(estudiante)
+        self._desindexar_fechas('estudiantes', estudiante)
+        for campo, valor in cambios.items():
+            setattr(estudiante, campo, valor)
+        self._indexar_estudiante(estudiante)
+        self._indexar_nombres(estudiante)
+        self._indexar_fechas('estudiantes', estudiante)
+        self._marcar_modificadas('estudiantes')
+        self._publicar_actualizacion('estudiantes', clave_anterior, estudiante)
+    
+    def eliminar_estudiante(self, estudiante: Estudiante):
+        """Elimina un estudiante (sin cascada) de la lista y los índices"""
+        self.estudiantes.remove(estudiante)
+        self._desindexar_estudiante(estudiante)
+        self._desindexar_nombres(estudiante)
+        self._desindexar_fechas('estudiantes', estudiante)
+        self._marcar_modificadas('estudiantes')
+        self._publicar([eliminado('estudiantes', estudiante.id)])
+    
+    def agregar_curso(self, curso: Curso):
+        """Agrega un curso y lo registra en los índices; ValueError si el código ya existe"""
+        self._verificar_clave_libre('cursos', curso.codigo)
+        self._aplicar_creditos_de_cursos((curso.codigo,), -1)
+        self.cursos.append(curso)
+        self._indexar_curso(curso)
+        self._aplicar_creditos_de_cursos((curso.codigo,), 1)
+        self._marcar_modificadas('cursos')
+        self._publicar([guardado('cursos', curso)])
+    
+    def actualizar_curso(self, curso: Curso, **cambios):
+        """Modifica un curso; si cambia el código actualiza sus referencias"""
+        codigo_anterior = curso.codigo
+        nuevo_codigo = cambios.get('codigo', codigo_anterior)
+        if nuevo_codigo != codigo_anterior:
+            self._verificar_clave_libre('cursos', nuevo_codigo)
+        afectados = ()
+        if nuevo_codigo != codigo_anterior or cambios.get('creditos', curso.creditos) != curso.creditos:
+            afectados = (codigo_anterior, nuevo_codigo) if nuevo_codigo != codigo_anterior else (codigo_anterior,)
+        self._aplicar_creditos_de_cursos(afectados, -1)
+        referencias = []
+        
+        if nuevo_codigo != codigo_anterior:
+            # Solo se recorren los grupos del curso, no las tablas completas
+            for inscripcion in self._inscripciones_por_curso.pop(codigo_anterior, []):
+                inscripcion.curso_codigo = nuevo_codigo
+                _agregar_a_grupo(self._inscripciones_por_curso, nuevo_codigo, inscripcion)
+                referencias.append(guardado('inscripciones', inscripcion))
+            for matricula in self._matriculas_por_curso.pop(codigo_anterior, []):
+                matricula.curso_codigo = nuevo_codigo
+                _agregar_a_grupo(self._matriculas_por_curso, nuevo_codigo, matricula)
+                referencias.append(guardado('matriculas', matricula))
+            posiciones = self._posiciones_por_curso.pop(codigo_anterior, None)
+            if posiciones:
+                posiciones.extend(self._posiciones_por_curso.get(nuevo_codigo, ()))
+                posiciones.sort()
+                self._posiciones_por_curso[nuevo_codigo] = posiciones
+            self._marcar_modificadas('inscripciones', 'matriculas')
+        
+        self._desindexar_curso(curso)
+        for campo, valor in cambios.items():
+            setattr(curso, campo, valor)
+        self._indexar_curso(curso)
+        self._aplicar_creditos_de_cursos(afectados, 1)
+        self._marcar_modificadas('cursos')
+        self._publicar_actualizacion('cursos', codigo_anterior, curso, referencias)
+    
+    def eliminar_curso(self, curso: Curso):
+        """Elimina un curso (sin cascada) de la lista y los índices"""
+        self._aplicar_creditos_de_cursos((curso.codigo,), -1)
+        self.cursos.remove(curso)
+        self._desindexar_curso(curso)
+        self._aplicar_creditos_de_cursos((curso.codigo,), 1)
+        self._marcar_modificadas('cursos')
+        self._publicar([eliminado('cursos', curso.codigo)])
+    
+    def agregar_inscripcion(self, inscripcion: Inscripcion):
+        """Agrega una inscripción y la registra en los índices; ValueError si el ID ya existe"""
+        self._verificar_clave_libre('inscripciones', inscripcion.id)
+        self.inscripciones.append(inscripcion)
+        self._indexar_inscripcion(inscripcion)
+        self._indexar_fechas('inscripciones', inscripcion)
+        self._marcar_modificadas('inscripciones')
+        self._publicar([guardado('inscripciones', inscripcion)])
+    
+    def actualizar_inscripcion(self, inscripcion: Inscripcion, **cambios):
+        """Modifica campos de una inscripción manteniendo los índices al día"""
+        clave_anterior = inscripcion.id
+        if cambios.get('id', clave_anterior) != clave_anterior:
+            self._verificar_clave_libre('inscripciones', cambios['id'])
+        self._desindexar_inscripcion(inscripcion)
+        self._desindexar_fechas('inscripciones', inscripcion)
+        for campo, valor in cambios.items():
+            setattr(inscripcion, campo, valor)
+        self._indexar_inscripcion(inscripcion)
+        self._indexar_fechas('inscripciones', inscripcion)
+        self._marcar_modificadas('inscripciones')
+        self._publicar_actualizacion('inscripciones', clave_anterior, inscripcion)
+    
+    def eliminar_inscripciones(self, inscripciones: List[Inscripcion]):
+        """Elimina varias inscripciones en una sola pasada sobre la lista"""
+        if not inscripciones:
+            return
+        a_eliminar = {id(i) for i in inscripciones}
+        self.inscripciones[:] = [i for i in self.inscripciones if id(i) not in a_eliminar]
+        self._desindexar_inscripciones(inscripciones)
+        for inscripcion in inscripciones:
+            self._desindexar_fechas('inscripciones', inscripcion)
+        self._marcar_modificadas('inscripciones')
+        self._publicar([eliminado('inscripciones', inscripcion.id) for inscripcion in inscripciones])
+    
+    def agregar_matricula(self, matricula: Matricula):
+        """Agrega una matrícula y la registra en los índices; ValueError si el ID ya existe"""
+        self._verificar_clave_libre('matriculas', matricula.id)
+        self.matriculas.append(matricula)
+        self._indexar_matricula(matricula)
+        self._indexar_nota(matricula)
+        self._indexar_fechas('matriculas', matricula)
+        self._marcar_modificadas('matriculas')
+        self._publicar([guardado('matriculas', matricula)])
+    
+    def asignar_nota(self, matricula: Matricula, nota: Optional[float]):
+        """Asigna (o borra) la nota de una matrícula y actualiza la tabla de posiciones"""
+        self._desindexar_nota(matricula)
+        matricula.nota = nota
+        self._indexar_nota(matricula)
+        self._marcar_modificadas('matriculas')
+        self._publicar([guardado('matriculas', matricula)])
+    
+    def eliminar_matriculas(self, matriculas: List[Matricula]):
+        """Elimina varias matrículas en una sola pasada sobre la lista"""
+        if not matriculas:
+            return
+        a_eliminar = {id(m) for m in matriculas}
+        self.matriculas[:] = [m for m in self.matriculas if id(m) not in a_eliminar]
+        self._desindexar_matriculas(matriculas)
+        for matricula in matriculas:
+            self._desindexar_nota(matricula)
+            self._desindexar_fechas('matriculas', matricula)
+        self._marcar_modificadas('matriculas')
+        self._publicar([eliminado('matriculas', matricula.id) for matricula in matriculas])
+    
+    # ------------------------------------------------------------------
+    # Consultas declarativas
+    # ------------------------------------------------------------------
+    def consulta(self, tabla: str) -> Consulta:
+        """Inicia una consulta declarativa sobre una tabla (ver src/constructor_consultas.py)"""
+        return Consulta(self, tabla)
+    
+    def registros_por_indice(self, tabla: str, campo: str, valor) -> Optional[List]:
+        """Registros con campo == valor leídos del índice, o None si no hay índice"""
+        indice = self.INDICES_IGUALDAD.get((tabla, campo))
+        if indice is None:
+            return None
+        atributo, unico = indice
+        encontrado = getattr(self, atributo).get(valor)
+        if unico:
+            return [] if encontrado is None else [encontrado]
+        return encontrado or []
+    
+    def indice_rango(self, tabla: str, campo: str) -> Optional[IndiceRango]:
+        """Índice de rango sobre tabla.campo, o None si no existe"""
+        if (tabla, campo) != ('matriculas', 'nota') and campo not in self.CAMPOS_FECHA.get(tabla, ()):
+            return None
+        return self._indice_rango(tabla, campo)
+    
+    # ------------------------------------------------------------------
+    # Accesos por clave foránea (costo proporcional al tamaño del grupo)
+    # ------------------------------------------------------------------
+    def obtener_inscripciones_de_estudiante(self, estudiante_id: str) -> List[Inscripcion]:
+        """Inscripciones de un estudiante"""
+        return list(self._inscripciones_por_estudiante.get(estudiante_id, ()))
+    
+    def obtener_inscripciones_de_curso(self, codigo_curso: str) -> List[Inscripcion]:
+        """Inscripciones de un curso"""
+        return list(self._inscripciones_por_curso.get(codigo_curso, ()))
+    
+    def obtener_matriculas_de_estudiante(self, estudiante_id: str) -> List[Matricula]:
+        """Matrículas de un estudiante"""
+        return list(self._matriculas_por_estudiante.get(estudiante_id, ()))
+    
+    def obtener_matriculas_de_curso(self, codigo_curso: str) -> List[Matricula]:
+        """Matrículas de un curso"""
+        return list(self._matriculas_por_curso.get(codigo_curso, ()))
+    
+    def obtener_matriculas_de_inscripcion(self, inscripcion_id: str) -> List[Matricula]:
+        """Matrículas generadas a partir de una inscripción"""
+        return list(self._matriculas_por_inscripcion.get(inscripcion_id, ()))
+    
+    def inscripcion_tiene_matricula(self, inscripcion_id: str) -> bool:
+        """Indica si la inscripción ya fue convertida en matrícula"""
+        return inscripcion_id in self._matriculas_por_inscripcion
+    
+    def buscar_inscripcion_de_estudiante_en_curso(self, estudiante_id: str,
+                                                  codigo_curso: str) -> Optional[Inscripcion]:
+        """Busca la inscripción de un estudiante en un curso concreto"""
+        for inscripcion in self._inscripciones_por_estudiante.get(estudiante_id, ()):
+            if inscripcion.curso_codigo == codigo_curso:
+                return inscripcion
         return None
     
+    # ------------------------------------------------------------------
+    # Consultas por rango (extremos inclusivos; None deja el rango abierto).
+    # Las fechas se aceptan como texto 'YYYY-MM-DD' o como date.
+    # ------------------------------------------------------------------
+    def obtener_inscripciones_por_fecha(self, desde=None, hasta=None) -> List[Inscripcion]:
+        """Inscripciones con fecha_inscripcion entre desde y hasta, por fecha"""
+        return list(self._indice_rango('inscripciones', 'fecha_inscripcion').rango(desde, hasta))
+    
+    def obtener_matriculas_por_fecha(self, desde=None, hasta=None) -> List[Matricula]:
+        """Matrículas con fecha_matricula entre desde y hasta, por fecha"""
+        return list(self._indice_rango('matriculas', 'fecha_matricula').rango(desde, hasta))
+    
+    def obtener_estudiantes_por_fecha_nacimiento(self, desde=None, hasta=None) -> List[Estudiante]:
+        """Estudiantes nacidos entre desde y hasta, del mayor al menor"""
+        return list(self._indice_rango('estudiantes', 'fecha_nacimiento').rango(desde, hasta))
+    
+    def obtener_matriculas_por_nota(self, minimo: Optional[float] = None,
+                                    maximo: Optional[float] = None) -> List[Matricula]:
+        """Matrículas calificadas con nota entre minimo y maximo, de menor a mayor"""
+        return list(self._indice_rango('matriculas', 'nota').rango(minimo, maximo))
+    
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def buscar_estudiante_por_documento(self, documento: str) -> Optional[Estudiante]:
+        """Busca estudiante por número de documento"""
+        return self._estudiantes_por_documento.get(documento)
+    
     def buscar_estudiante_por_correo(self, correo: str) -> Optional[Estudiante]:
-        """Busca estudiante por correo electrónico"""
-        for estudiante in self.estudiantes:
-            if estudiante.correo.lower() == correo.lower():
-                return estudiante
-        return None
+        """Busca estudiante por correo electrónico (sin distinguir mayúsculas)"""
+        return self._estudiantes_por_correo.get(correo.casefold())
     
+    @cacheada('estudiantes')
     def listar_estudiantes_ordenados_por_apellido(self) -> List[Estudiante]:
-        """Retorna lista de estudiantes ordenados por apellido"""
-        return sorted(self.estudiantes, key=lambda e: e.apellidos.lower())
+        """Retorna lista de estudiantes ordenados por apellido (lee el índice ordenado)"""
+        return list(self.iterar_estudiantes_ordenados_por_apellido())
+    
+    def iterar_estudiantes_ordenados_por_apellido(self, despues_de: Optional[Tuple[str, str]] = None,
+                                                  offset: int = 0,
+                                                  limite: Optional[int] = None) -> Iterator[Estudiante]:
+        """Recorre los estudiantes por apellido sin construir la lista completa.
+        
+        `despues_de` es un cursor (ver `cursor_apellido`): la iteración empieza en
+        el primer estudiante posterior a él, aunque la tabla haya cambiado entre
+        páginas. `offset` y `limite` recortan el resultado a partir de ese punto.
+        """
+        inicio = 0
+        if despues_de is not None:
+            inicio = bisect.bisect_right(self._apellidos_ordenados, tuple(despues_de))
+        
+        estudiantes = (self._estudiantes_por_id[estudiante_id]
+                       for _, estudiante_id in _desde(self._apellidos_ordenados, inicio))
+        return paginar(estudiantes, offset, limite)
+    
+    @staticmethod
+    def cursor_apellido(estudiante: Estudiante) -> Tuple[str, str]:
+        """Cursor para continuar el listado por apellido después de `estudiante`"""
+        return (estudiante.apellidos.casefold(), estudiante.id)
     
     def obtener_top_promedios_por_curso(self, codigo_curso: str, top: int = 3) -> List[Tuple[Estudiante, float]]:
-        """Obtiene los mejores promedios de un curso específico"""
-        matriculas_curso = [m for m in self.matriculas 
-                           if m.curso_codigo == codigo_curso and m.nota is not None]
+        """Obtiene los mejores promedios de un curso específico.
         
-        # Crear lista de estudiante-nota
+        Lee la tabla de posiciones del curso, que ya está ordenada por nota
+        descendente: el costo es O(top) y no depende de los demás cursos.
+        """
         estudiantes_notas = []
-        for matricula in matriculas_curso:
-            estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
+        if top <= 0:
+            return estudiantes_notas
+        
+        for nota_negativa, estudiante_id, _ in self._posiciones_por_curso.get(codigo_curso, ()):
+            estudiante = self.buscar_estudiante_por_id(estudiante_id)
             if estudiante:
-                estudiantes_notas.append((estudiante, matricula.nota))
+                estudiantes_notas.append((estudiante, -nota_negativa))
+                if len(estudiantes_notas) == top:
+                    break
+        
+        return estudiantes_notas
+    
+    @cacheada('matriculas')
+    def obtener_estadisticas_cursos(self, nota_minima: float = NOTA_APROBATORIA) -> Dict[str, EstadisticasCurso]:
+        """Promedio, mediana, desviación, tasa de aprobación e histograma de cada curso.
         
-        # Ordenar por nota descendente y tomar el top
-        estudiantes_notas.sort(key=lambda x: x[1], reverse=True)
-        return estudiantes_notas[:top]
+        Las notas se agrupan en vectores por curso en una sola pasada sobre las
+        matrículas y luego se resumen de forma vectorizada (ver src/estadisticas.py).
+        """
+        return calcular_estadisticas(construir_columnas_notas(self.matriculas), nota_minima)
     
+    def obtener_estadisticas_curso(self, codigo_curso: str,
+                                   nota_minima: float = NOTA_APROBATORIA) -> Optional[EstadisticasCurso]:
+        """Estadísticas de un solo curso (recorre solo sus matrículas)"""
+        columnas = construir_columnas_notas(self._matriculas_por_curso.get(codigo_curso, ()))
+        return calcular_estadisticas(columnas, nota_minima).get(codigo_curso)
+    
+    @cacheada('cursos', 'matriculas')
+    def obtener_promedios_ponderados(self, nota_minima: float = NOTA_APROBATORIA) -> List[PromedioEstudiante]:
+        """Ranking de todos los estudiantes por promedio ponderado por créditos.
+        
+        Incluye créditos cursados (matrículas calificadas) y aprobados de cada uno.
+        """
+        creditos_por_curso = {codigo: curso.creditos for codigo, curso in self._cursos_por_codigo.items()}
+        return calcular_promedios_ponderados(self._matriculas_por_estudiante, creditos_por_curso, nota_minima)
+    
+    @cacheada('cursos', 'matriculas')
+    def obtener_percentiles(self) -> PercentilesInstitucion:
+        """Puesto y percentil de cada estudiante en cada curso y en la institución.
+        
+        Las notas de cada curso se leen de su tabla de posiciones, que ya está
+        ordenada, y el general usa el ranking por promedio ponderado: no hay
+        ordenamientos adicionales y los vectores son array('d'/'l').
+        """
+        por_curso = {}
+        for codigo in sorted(self._posiciones_por_curso):
+            posiciones = self._posiciones_por_curso[codigo]
+            por_curso[codigo] = calcular_percentiles([estudiante_id for _, estudiante_id, _ in posiciones],
+                                                     (-nota_negativa for nota_negativa, _, _ in posiciones))
+        
+        ranking = self.obtener_promedios_ponderados()
+        general = calcular_percentiles([p.estudiante_id for p in ranking], (p.promedio for p in ranking))
+        return PercentilesInstitucion(por_curso, general)
+    
+    def obtener_percentiles_de_estudiante(self, estudiante_id: str
+                                          ) -> Tuple[Dict[str, Tuple[float, int, float]],
+                                                     Optional[Tuple[float, int, float]]]:
+        """(valor, puesto, percentil) del estudiante en cada uno de sus cursos y en general"""
+        percentiles = self.obtener_percentiles()
+        por_curso = {}
+        for matricula in self._matriculas_por_estudiante.get(estudiante_id, ()):
+            tabla = percentiles.por_curso.get(matricula.curso_codigo)
+            if tabla is not None and matricula.curso_codigo not in por_curso:
+                resultado = tabla.de_estudiante(estudiante_id)
+                if resultado is not None:
+                    por_curso[matricula.curso_codigo] = resultado
+        return por_curso, percentiles.general.de_estudiante(estudiante_id)
+    
+    @cacheada('estudiantes', 'cursos', 'matriculas')
     def obtener_reprobados(self, nota_minima: float = 3.0) -> List[Tuple[Estudiante, Curso, float]]:
         """Obtiene estudiantes reprobados (nota < nota_minima)"""
-        reprobados = []
+        return list(self.iterar_reprobados(nota_minima))
+    
+    def iterar_reprobados(self, nota_minima: float = 3.0, offset: int = 0,
+                          limite: Optional[int] = None) -> Iterator[Tuple[Estudiante, Curso, float]]:
+        """Versión perezosa de obtener_reprobados con offset y límite.
         
-        for matricula in self.matriculas:
-            if matricula.nota is not None and matricula.nota < nota_minima:
-                estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
-                curso = self.buscar_curso_por_codigo(matricula.curso_codigo)
-                
-                if estudiante and curso:
-                    reprobados.append((estudiante, curso, matricula.nota))
+        Consulta de rango sobre el índice de notas (nota < nota_minima): solo
+        se recorren las matrículas reprobadas, de la nota más baja a la más alta.
+        """
+        filas = ((m,) for m in self._indice_rango('matriculas', 'nota').rango(None, nota_minima, incluir_maximo=False))
+        filas = unir_hash(filas, lambda f: f[0].estudiante_id, self._estudiantes_por_id)
+        filas = unir_hash(filas, lambda f: f[0].curso_codigo, self._cursos_por_codigo)
         
-        return reprobados
+        return paginar(((estudiante, curso, matricula.nota) for matricula, estudiante, curso in filas),
+                       offset, limite)
     
-    def obtener_creditos_inscritos_por_estudiante(self, estudiante_id: str) -> int:
-        """Calcula total de créditos inscritos por un estudiante (basado en inscripciones)"""
-        creditos_total = 0
+    @cacheada('inscripciones', 'matriculas')
+    def obtener_cohortes(self, periodo: str = 'mes',
+                         nota_minima: float = NOTA_APROBATORIA) -> Dict[str, Dict[str, EstadisticasCohorte]]:
+        """Matriz curso x periodo de inscripción ('mes' o 'semestre') con conteos,
+        tasa de aprobación y promedio.
+        
+        Hash join matrículas -> inscripciones y una pasada de agrupación sobre
+        las fechas ya convertidas del índice de rango de fecha_inscripcion,
+        pasadas a entero AAAAMMDD (ver calcular_cohortes).
+        """
+        fechas = {id(inscripcion): fecha.year * 10000 + fecha.month * 100 + fecha.day
+                  for fecha, inscripcion in self._indice_rango('inscripciones', 'fecha_inscripcion').elementos()}
+        filas = unir_hash(((m,) for m in self.matriculas), lambda f: f[0].inscripcion_id,
+                          self._inscripciones_por_id)
+        return calcular_cohortes(((matricula.curso_codigo, fechas[id(inscripcion)], matricula.nota)
+                                  for matricula, inscripcion in filas if id(inscripcion) in fechas),
+                                 periodo, nota_minima)
+    
+    @cacheada('cursos', 'inscripciones', 'matriculas')
+    def obtener_carga_docentes(self) -> List[CargaDocente]:
+        """Carga de cada docente ordenada de mayor a menor (créditos, luego inscritos).
         
-        inscripciones_estudiante = [i for i in self.inscripciones if i.estudiante_id == estudiante_id]
+        Recorre el índice de docentes y, por cada curso, sus grupos de
+        inscripciones y matrículas: en total O(cursos + inscripciones +
+        matrículas). Los nombres se agrupan sin distinguir tildes, mayúsculas
+        ni espacios repetidos; se muestra el primero registrado.
+        """
+        cargas = []
+        for cursos in self._cursos_por_docente.values():
+            codigos = []
+            creditos = inscritos = calificados = 0
+            estudiantes = set()
+            for curso in cursos:
+                codigos.append(curso.codigo)
+                creditos += curso.creditos
+                inscripciones = self._inscripciones_por_curso.get(curso.codigo, ())
+                inscritos += len(inscripciones)
+                estudiantes.update(inscripcion.estudiante_id for inscripcion in inscripciones)
+                calificados += sum(1 for m in self._matriculas_por_curso.get(curso.codigo, ())
+                                   if m.nota is not None)
+            cargas.append(CargaDocente(cursos[0].docente, sorted(codigos), creditos,
+                                       inscritos, len(estudiantes), calificados))
         
-        for inscripcion in inscripciones_estudiante:
-            curso = self.buscar_curso_por_codigo(inscripcion.curso_codigo)
-            if curso:
-                creditos_total += curso.creditos
+        cargas.sort(key=lambda carga: (-carga.creditos, -carga.inscritos, carga.docente))
+        return cargas
+    
+    def transcript(self, estudiante_id: str, nota_minima: float = NOTA_APROBATORIA) -> Optional[Historial]:
+        """Historial académico del estudiante: inscripciones, matrículas, curso,
+        créditos, nota, estado y totales acumulados.
+        
+        Solo usa índices (grupos del estudiante y de cada inscripción y el
+        índice de cursos): el costo es proporcional a los registros del
+        estudiante, no al tamaño de las tablas.
+        """
+        estudiante = self._estudiantes_por_id.get(estudiante_id)
+        if estudiante is None:
+            return None
         
-        return creditos_total
+        inscripciones = self._inscripciones_por_estudiante.get(estudiante_id, ())
+        propias = {inscripcion.id for inscripcion in inscripciones}
+        sin_inscripcion = [m for m in self._matriculas_por_estudiante.get(estudiante_id, ())
+                           if m.inscripcion_id not in propias]
+        return construir_historial(estudiante, inscripciones,
+                                   lambda inscripcion_id: self._matriculas_por_inscripcion.get(inscripcion_id, ()),
+                                   sin_inscripcion, self._cursos_por_codigo.get, nota_minima)
+    
+    def iterar_transcripts(self, nota_minima: float = NOTA_APROBATORIA) -> Iterator[Historial]:
+        """Genera el historial de cada estudiante, uno a la vez"""
+        for estudiante in self.estudiantes:
+            historial = self.transcript(estudiante.id, nota_minima)
+            if historial is not None:
+                yield historial
+    
+    def obtener_creditos_inscritos_por_estudiante(self, estudiante_id: str) -> int:
+        """Total de créditos inscritos por un estudiante (lee el contador materializado)"""
+        return self._creditos_por_estudiante.get(estudiante_id, 0)
+    
+    def supera_limite_creditos(self, estudiante_id: str, codigo_curso: str,
+                               reemplaza: Optional[Inscripcion] = None,
+                               limite: int = LIMITE_CREDITOS_ESTUDIANTE) -> bool:
+        """Indica si inscribir al estudiante en el curso superaría el límite de créditos.
+        
+        `reemplaza` es la inscripción que se está editando: sus créditos se
+        descuentan si pertenece al mismo estudiante. Costo O(1).
+        """
+        creditos = self.obtener_creditos_inscritos_por_estudiante(estudiante_id)
+        if reemplaza is not None and reemplaza.estudiante_id == estudiante_id:
+            creditos -= self._creditos_de_curso(reemplaza.curso_codigo)
+        return creditos + self._creditos_de_curso(codigo_curso) > limite
     
     def buscar_estudiante_por_id(self, estudiante_id: str) -> Optional[Estudiante]:
         """Busca estudiante por ID"""
-        for estudiante in self.estudiantes:
-            if estudiante.id == estudiante_id:
-                return estudiante
-        return None
+        return self._estudiantes_por_id.get(estudiante_id)
     
     def buscar_curso_por_codigo(self, codigo: str) -> Optional[Curso]:
         """Busca curso por código"""
-        for curso in self.cursos:
-            if curso.codigo == codigo:
-                return curso
-        return None
+        return self._cursos_por_codigo.get(codigo)
     
     def buscar_inscripcion_por_id(self, inscripcion_id: str) -> Optional[Inscripcion]:
         """Busca inscripción por ID"""
-        for inscripcion in self.inscripciones:
-            if inscripcion.id == inscripcion_id:
-                return inscripcion
-        return None
+        return self._inscripciones_por_id.get(inscripcion_id)
+    
+    def buscar_estudiantes_por_documentos(self, documentos: Iterable[str]) -> ResultadoLote:
+        """Resuelve un lote de documentos en una pasada (O(1) por clave)"""
+        return _resolver_lote(documentos, self._estudiantes_por_documento)
     
+    def buscar_estudiantes_por_correos(self, correos: Iterable[str]) -> ResultadoLote:
+        """Resuelve un lote de correos sin distinguir mayúsculas"""
+        return _resolver_lote(correos, self._estudiantes_por_correo, str.casefold)
+    
+    def buscar_estudiantes_por_ids(self, estudiante_ids: Iterable[str]) -> ResultadoLote:
+        """Resuelve un lote de IDs de estudiante en una pasada"""
+        return _resolver_lote(estudiante_ids, self._estudiantes_por_id)
+    
+    @cacheada('estudiantes')
     def obtener_dominios_correo_unicos(self) -> List[str]:
-        """Obtiene lista de dominios de correo únicos"""
-        dominios = set()
-        for estudiante in self.estudiantes:
-            if '@' in estudiante.correo:
-                dominio = estudiante.correo.split('@')[1]
-                dominios.add(dominio)
-        
-        return sorted(list(dominios))
-    
-    def buscar_binario_estudiante(self, apellido_buscar: str) -> Optional[Estudiante]:
-        """Implementa búsqueda binaria por apellido (requiere lista ordenada)"""
-        estudiantes_ordenados = self.listar_estudiantes_ordenados_por_apellido()
-        
-        izq, der = 0, len(estudiantes_ordenados) - 1
-        
-        while izq <= der:
-            medio = (izq + der) // 2
-            apellido_medio = estudiantes_ordenados[medio].apellidos.lower()
-            apellido_buscar_lower = apellido_buscar.lower()
-            
-            if apellido_medio == apellido_buscar_lower:
-                return estudiantes_ordenados[medio]
-            elif apellido_medio < apellido_buscar_lower:
-                izq = medio + 1
-            else:
-                der = medio - 1
+        """Obtiene lista de dominios de correo únicos (en minúsculas, lee el índice)"""
+        return sorted(self._estudiantes_por_dominio)
+    
+    @cacheada('estudiantes')
+    def obtener_conteo_dominios(self) -> List[Tuple[str, int]]:
+        """Pares (dominio, cantidad de estudiantes) ordenados por dominio"""
+        return [(dominio, len(self._estudiantes_por_dominio[dominio]))
+                for dominio in self.obtener_dominios_correo_unicos()]
+    
+    def obtener_top_dominios(self, top: int = 5) -> List[Tuple[str, int]]:
+        """Los `top` dominios con más estudiantes (empates por nombre de dominio)"""
+        return heapq.nsmallest(top, ((dominio, len(estudiantes))
+                                     for dominio, estudiantes in self._estudiantes_por_dominio.items()),
+                               key=lambda par: (-par[1], par[0]))
+    
+    def obtener_estudiantes_de_dominio(self, dominio: str) -> List[Estudiante]:
+        """Estudiantes cuyo correo pertenece al dominio (sin distinguir mayúsculas)"""
+        return list(self._estudiantes_por_dominio.get(dominio.casefold(), ()))
+    
+    def buscar_binario_estudiante(self, apellido_buscar: str) -> List[Estudiante]:
+        """Búsqueda binaria por apellido sobre el índice ordenado.
         
-        return None
+        Retorna todos los estudiantes que comparten el apellido (O(log N + k)).
+        """
+        clave = apellido_buscar.casefold()
+        # (clave,) precede a cualquier (clave, id) y (clave + '\0',) sigue a todos ellos
+        inicio = bisect.bisect_left(self._apellidos_ordenados, (clave,))
+        fin = bisect.bisect_left(self._apellidos_ordenados, (clave + '\0',), inicio)
+        
+        return [self._estudiantes_por_id[estudiante_id]
+                for _, estudiante_id in self._apellidos_ordenados[inicio:fin]]
     
+    def buscar_estudiantes_por_nombre(self, texto: str, limite: int = 10) -> List[Tuple[Estudiante, float]]:
+        """Búsqueda por prefijo y aproximada sobre nombres y apellidos.
+        
+        Ignora tildes y mayúsculas ("perez" encuentra "Pérez", "Ruiz M" encuentra
+        "Carlos Ruiz Mendoza") y tolera errores de escritura mediante trigramas.
+        Retorna pares (estudiante, puntaje) ordenados de mayor a menor relevancia.
+        """
+        return [(self._estudiantes_por_id[estudiante_id], puntaje)
+                for estudiante_id, puntaje in self._indice_nombres.buscar(texto, limite)]
+    
+    @cacheada('estudiantes', 'cursos', 'inscripciones', 'matriculas')
     def obtener_inscripciones_sin_matricular(self) -> List[Tuple[Inscripcion, Estudiante, Curso]]:
         """Obtiene inscripciones que aún no se han convertido en matrículas"""
-        inscripciones_ids = {m.inscripcion_id for m in self.matriculas}
-        inscripciones_pendientes = []
-        
-        for inscripcion in self.inscripciones:
-            if inscripcion.id not in inscripciones_ids:
-                estudiante = self.buscar_estudiante_por_id(inscripcion.estudiante_id)
-                curso = self.buscar_curso_por_codigo(inscripcion.curso_codigo)
-                
-                if estudiante and curso:
-                    inscripciones_pendientes.append((inscripcion, estudiante, curso))
+        return list(self.iterar_inscripciones_sin_matricular())
+    
+    def iterar_inscripciones_sin_matricular(self, offset: int = 0, limite: Optional[int] = None
+                                            ) -> Iterator[Tuple[Inscripcion, Estudiante, Curso]]:
+        """Versión perezosa de obtener_inscripciones_sin_matricular con offset y límite"""
+        # Anti-join: left join contra el índice de matrículas y quedarse sin pareja
+        filas = unir_hash(((i,) for i in self.inscripciones), lambda f: f[0].id,
+                          self._matriculas_por_inscripcion, tipo='left')
+        filas = ((inscripcion,) for inscripcion, matriculas in filas if matriculas is None)
+        filas = unir_hash(filas, lambda f: f[0].estudiante_id, self._estudiantes_por_id)
+        filas = unir_hash(filas, lambda f: f[0].curso_codigo, self._cursos_por_codigo)
         
-        return inscripciones_pendientes
+        return paginar(filas, offset, limite)
     
+    @cacheada('estudiantes', 'cursos', 'inscripciones', 'matriculas')
     def obtener_matriculas_con_inscripcion(self) -> List[Tuple[Matricula, Inscripcion, Estudiante, Curso]]:
         """Obtiene matrículas con información completa de inscripción, estudiante y curso"""
-        matriculas_completas = []
+        return list(self.iterar_matriculas_con_inscripcion())
+    
+    def iterar_matriculas_con_inscripcion(self, offset: int = 0, limite: Optional[int] = None
+                                          ) -> Iterator[Tuple[Matricula, Inscripcion, Estudiante, Curso]]:
+        """Versión perezosa de obtener_matriculas_con_inscripcion con offset y límite.
         
-        for matricula in self.matriculas:
-            inscripcion = self.buscar_inscripcion_por_id(matricula.inscripcion_id)
-            estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
-            curso = self.buscar_curso_por_codigo(matricula.curso_codigo)
-            
-            if inscripcion and estudiante and curso:
-                matriculas_completas.append((matricula, inscripcion, estudiante, curso))
-        
-        return matriculas_completas
\ No newline at end of file
+        Tres hash joins encadenados contra los índices ya mantenidos (no hay fase
+        de construcción): O(M) para M matrículas, en vez de O(M·(I + E + C)).
+        """
+        filas = unir_hash(((m,) for m in self.matriculas), lambda f: f[0].inscripcion_id,
+                          self._inscripciones_por_id)
+        filas = unir_hash(filas, lambda f: f[0].estudiante_id, self._estudiantes_por_id)
+        filas = unir_hash(filas, lambda f: f[0].curso_codigo, self._cursos_por_codigo)
+        
+        return paginar(filas, offset, limite)
+
+def construir_tabla_hash(filas: Iterable, clave: Callable[[Any], Any]) -> Dict[Any, List[Any]]:
+    """Fase de construcción de un hash join: clave -> filas con esa clave, en orden"""
+    tabla = {}
+    for fila in filas:
+        _agregar_a_grupo(tabla, clave(fila), fila)
+    return tabla
+
+
+def unir_hash(filas: Iterable[tuple], clave: Callable[[tuple], Any],
+              construccion: Union[Mapping, Iterable], clave_construccion: Callable[[Any], Any] = None,
+              tipo: str = 'inner') -> Iterator[tuple]:
+    """Operador hash join.
+    
+    `filas` es el lado de sondeo (tuplas, recorrido en streaming) y
+    `construccion` el lado de construcción: un Mapping ya indexado (por
+    ejemplo un índice de ConsultasAcademicas), cuyo valor es la pareja, o un
+    iterable que se indexa una sola vez con `clave_construccion`, donde cada
+    fila con la misma clave es una pareja distinta. Cada pareja produce
+    `fila + (pareja,)`. Con tipo 'inner' se descartan las filas sin pareja;
+    con 'left' se conservan con pareja None.
+    
+    Los argumentos se validan al llamar, no al recorrer el resultado.
+    Costo: O(|sondeo| + |construcción| + |resultado|), y O(|sondeo|) si se
+    pasa un índice.
+    """
+    if tipo not in ('inner', 'left'):
+        raise ValueError(f"Tipo de join no soportado: {tipo}")
+    conservar_sin_pareja = tipo == 'left'
+    if isinstance(construccion, Mapping):
+        return _sondear_indice(filas, clave, construccion, conservar_sin_pareja)
+    if clave_construccion is None:
+        raise ValueError("Se requiere clave_construccion para indexar el lado de construcción")
+    tabla = construir_tabla_hash(construccion, clave_construccion)
+    return _sondear_tabla_hash(filas, clave, tabla, conservar_sin_pareja)
+
+
+def _sondear_indice(filas: Iterable[tuple], clave: Callable[[tuple], Any], indice: Mapping,
+                    conservar_sin_pareja: bool) -> Iterator[tuple]:
+    buscar = indice.get
+    for fila in filas:
+        pareja = buscar(clave(fila))
+        if pareja is not None or conservar_sin_pareja:
+            yield fila + (pareja,)
+
+
+def _sondear_tabla_hash(filas: Iterable[tuple], clave: Callable[[tuple], Any], tabla: Dict[Any, List[Any]],
+                        conservar_sin_pareja: bool) -> Iterator[tuple]:
+    buscar = tabla.get
+    for fila in filas:
+        parejas = buscar(clave(fila))
+        if parejas:
+            for pareja in parejas:
+                yield fila + (pareja,)
+        elif conservar_sin_pareja:
+            yield fila + (None,)
+
+
+def _resolver_lote(claves: Iterable[str], indice: dict,
+                   normalizar: Optional[Callable[[str], str]] = None) -> ResultadoLote:
+    # Se deduplica por la clave ya normalizada: del grupo de variantes
+    # (p. ej. mayúsculas en un correo) se reporta la primera que aparece
+    resultado = ResultadoLote()
+    vistas = set()
+    for clave in claves:
+        normalizada = normalizar(clave) if normalizar else clave
+        if normalizada in vistas:
+            continue
+        vistas.add(normalizada)
+        encontrado = indice.get(normalizada)
+        if encontrado is None:
+            resultado.faltantes.append(clave)
+        else:
+            resultado.encontrados[clave] = encontrado
+    return resultado
+
+
+def _clave_docente(docente: str) -> str:
+    """Nombre de docente normalizado: sin tildes, en minúsculas y con espacios simples"""
+    return ' '.join(palabras_normalizadas(docente))
+
+
+def _dominio_correo(correo: str) -> str:
+    """Dominio normalizado de un correo ('' si no tiene @)"""
+    _, arroba, dominio = correo.rpartition('@')
+    return dominio.casefold() if arroba else ''
+
+
+def _quitar_de_indice(indice: dict, clave, objeto):
+    """Quita la entrada solo si apunta a este objeto (puede haber duplicados)"""
+    if indice.get(clave) is objeto:
+        del indice[clave]
+
+
+def _desde(lista: list, inicio: int):
+    """Recorre `lista` desde la posición `inicio` sin copiarla"""
+    posicion = inicio
+    while posicion < len(lista):
+        yield lista[posicion]
+        posicion += 1
+
+
+def _entrada_posicion(matricula: Matricula) -> Tuple[float, str, str]:
+    """Clave de una matrícula calificada en la tabla de posiciones de su curso"""
+    return (-matricula.nota, matricula.estudiante_id, matricula.id)
+
+
+def _agregar_a_grupo(indice: dict, clave, objeto):
+    """Agrega un registro al grupo de su clave en un índice agrupado"""
+    grupo = indice.get(clave)
+    if grupo is None:
+        indice[clave] = [objeto]
+    else:
+        grupo.append(objeto)
+
+
+def _quitar_de_grupo(indice: dict, clave, objeto):
+    """Quita un registro (por identidad) de su grupo; borra grupos vacíos"""
+    grupo = indice.get(clave)
+    if grupo is None:
+        return
+    for posicion, existente in enumerate(grupo):
+        if existente is objeto:
+            del grupo[posicion]
+            break
+    if not grupo:
+        del indice[clave]
+
+
+def _quitar_de_grupos(indice: dict, objetos: Iterable, clave: Callable[[Any], Any]):
+    """Quita varios registros (por identidad) de un índice agrupado.
+    
+    Reúne los registros por clave y filtra cada grupo una sola vez, en vez
+    de una búsqueda lineal por registro; borra los grupos que quedan vacíos.
+    """
+    por_clave = {}
+    for objeto in objetos:
+        por_clave.setdefault(clave(objeto), set()).add(id(objeto))
+    for valor, quitar in por_clave.items():
+        grupo = indice.get(valor)
+        if grupo is None:
+            continue
+        grupo[:] = [existente for existente in grupo if id(existente) not in quitar]
+        if not grupo:
+            del indice[valor]
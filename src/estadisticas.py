@@ -0,0 +1,308 @@
+# src/estadisticas.py - Estadísticas de notas por curso en forma columnar
+import csv
+import statistics
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.modelos import Matricula
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: se usa array('d') + statistics
+    np = None
+
+NOTA_APROBATORIA = 3.0
+
+# Bordes del histograma: [0,1), [1,2), [2,3), [3,4), [4,5]
+BORDES_HISTOGRAMA = (0.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+
+
+@dataclass
+class EstadisticasCurso:
+    """Resumen estadístico de las notas de un curso"""
+    curso_codigo: str
+    cantidad: int
+    promedio: float
+    mediana: float
+    desviacion: float
+    tasa_aprobacion: float
+    histograma: List[int]
+
+
+def construir_columnas_notas(matriculas: Iterable[Matricula]) -> Dict[str, array]:
+    """Agrupa en una sola pasada las notas registradas en un vector por curso"""
+    columnas: Dict[str, array] = {}
+    for matricula in matriculas:
+        if matricula.nota is None:
+            continue
+        columna = columnas.get(matricula.curso_codigo)
+        if columna is None:
+            columna = columnas[matricula.curso_codigo] = array('d')
+        columna.append(matricula.nota)
+    return columnas
+
+
+def calcular_estadisticas(columnas: Dict[str, array],
+                          nota_minima: float = NOTA_APROBATORIA) -> Dict[str, EstadisticasCurso]:
+    """Calcula las estadísticas de cada curso a partir de sus vectores de notas.
+
+    Con NumPy los vectores se envuelven sin copia (np.frombuffer) y cada
+    estadística es una operación vectorizada; sin NumPy se usa el módulo
+    statistics sobre el mismo array('d').
+    """
+    calcular = _calcular_numpy if np is not None else _calcular_python
+    return {codigo: calcular(codigo, notas, nota_minima)
+            for codigo, notas in sorted(columnas.items()) if len(notas) > 0}
+
+
+def _calcular_numpy(codigo: str, notas: array, nota_minima: float) -> EstadisticasCurso:
+    vector = np.frombuffer(notas, dtype=np.float64)
+    histograma, _ = np.histogram(vector, bins=BORDES_HISTOGRAMA)
+    return EstadisticasCurso(
+        curso_codigo=codigo,
+        cantidad=int(vector.size),
+        promedio=float(vector.mean()),
+        mediana=float(np.median(vector)),
+        desviacion=float(vector.std()),
+        tasa_aprobacion=float(np.count_nonzero(vector >= nota_minima)) / vector.size,
+        histograma=[int(c) for c in histograma]
+    )
+
+
+def _calcular_python(codigo: str, notas: array, nota_minima: float) -> EstadisticasCurso:
+    ultimo = len(BORDES_HISTOGRAMA) - 2
+    histograma = [0] * (ultimo + 1)
+    aprobados = 0
+    for nota in notas:
+        # Cubos de ancho 1; el último incluye la nota máxima (5.0)
+        histograma[min(max(int(nota - BORDES_HISTOGRAMA[0]), 0), ultimo)] += 1
+        if nota >= nota_minima:
+            aprobados += 1
+
+    return EstadisticasCurso(
+        curso_codigo=codigo,
+        cantidad=len(notas),
+        promedio=statistics.fmean(notas),
+        mediana=statistics.median(notas),
+        desviacion=statistics.pstdev(notas),
+        tasa_aprobacion=aprobados / len(notas),
+        histograma=histograma
+    )
+
+
+@dataclass
+class PromedioEstudiante:
+    """Promedio ponderado por créditos de un estudiante y su puesto"""
+    estudiante_id: str
+    promedio: float
+    creditos_cursados: int
+    creditos_aprobados: int
+    puesto: int = 0
+
+
+def calcular_promedios_ponderados(matriculas_por_estudiante: Dict[str, Iterable[Matricula]],
+                                  creditos_por_curso: Dict[str, int],
+                                  nota_minima: float = NOTA_APROBATORIA) -> List[PromedioEstudiante]:
+    """Promedio ponderado por créditos de todos los estudiantes en una pasada.
+
+    Recorre una vez las matrículas agrupadas por estudiante, hace el hash join
+    de cada una contra `creditos_por_curso` y guarda los totales en vectores
+    compactos (array). Agrupar primero evita buscar el estudiante fila a fila.
+    Retorna la lista ordenada por promedio descendente con el puesto de cada
+    uno (los empates comparten puesto).
+    """
+    estudiantes: List[str] = []
+    promedios = array('d')
+    creditos_cursados = array('l')
+    creditos_aprobados = array('l')
+    obtener_creditos = creditos_por_curso.get
+
+    for estudiante_id, matriculas in matriculas_por_estudiante.items():
+        suma_ponderada = 0.0
+        cursados = 0
+        aprobados = 0
+        for matricula in matriculas:
+            nota = matricula.nota
+            if nota is None:
+                continue
+            creditos = obtener_creditos(matricula.curso_codigo)
+            if creditos is None:
+                continue
+            suma_ponderada += nota * creditos
+            cursados += creditos
+            if nota >= nota_minima:
+                aprobados += creditos
+
+        if cursados:
+            estudiantes.append(estudiante_id)
+            promedios.append(suma_ponderada / cursados)
+            creditos_cursados.append(cursados)
+            creditos_aprobados.append(aprobados)
+
+    orden = sorted(range(len(estudiantes)), key=lambda k: (-promedios[k], estudiantes[k]))
+
+    ranking: List[PromedioEstudiante] = []
+    for indice, k in enumerate(orden):
+        if indice > 0 and promedios[k] == ranking[-1].promedio:
+            puesto = ranking[-1].puesto
+        else:
+            puesto = indice + 1
+        ranking.append(PromedioEstudiante(
+            estudiante_id=estudiantes[k],
+            promedio=promedios[k],
+            creditos_cursados=creditos_cursados[k],
+            creditos_aprobados=creditos_aprobados[k],
+            puesto=puesto
+        ))
+    return ranking
+
+
+@dataclass
+class EstadisticasCohorte:
+    """Resultados de las matrículas de un curso inscritas en un mismo periodo"""
+    curso_codigo: str
+    periodo: str
+    cantidad: int
+    calificadas: int
+    aprobadas: int
+    tasa_aprobacion: float
+    promedio: float
+
+
+PERIODOS = ('mes', 'semestre')
+
+
+def fecha_entera(fecha: str) -> Optional[int]:
+    """'YYYY-MM-DD' -> AAAAMMDD como entero (None si el formato no es válido)"""
+    if len(fecha) != 10 or fecha[4] != '-' or fecha[7] != '-':
+        return None
+    try:
+        return int(fecha[0:4]) * 10000 + int(fecha[5:7]) * 100 + int(fecha[8:10])
+    except ValueError:
+        return None
+
+
+def calcular_cohortes(filas: Iterable[Tuple[str, int, Optional[float]]], periodo: str = 'mes',
+                      nota_minima: float = NOTA_APROBATORIA) -> Dict[str, Dict[str, EstadisticasCohorte]]:
+    """Matriz curso x periodo a partir de filas (curso, fecha AAAAMMDD, nota).
+
+    Una sola pasada acumula conteos y sumas por celda con aritmética entera
+    sobre la fecha (mes = AAAAMM, semestre = AAAA*10 + 1|2); las etiquetas
+    ('2025-08', '2025-2') se arman solo al final, una vez por celda. La
+    tasa de aprobación y el promedio se calculan sobre las matrículas
+    calificadas.
+    """
+    if periodo not in PERIODOS:
+        raise ValueError(f"Periodo no soportado: {periodo}")
+    por_mes = periodo == 'mes'
+
+    celdas: Dict[Tuple[str, int], List] = {}
+    for curso_codigo, fecha, nota in filas:
+        mes = fecha // 100
+        clave = (curso_codigo, mes if por_mes else (mes // 100) * 10 + (1 if mes % 100 <= 6 else 2))
+        celda = celdas.get(clave)
+        if celda is None:
+            # [cantidad, calificadas, aprobadas, suma de notas]
+            celda = celdas[clave] = [0, 0, 0, 0.0]
+        celda[0] += 1
+        if nota is not None:
+            celda[1] += 1
+            celda[3] += nota
+            if nota >= nota_minima:
+                celda[2] += 1
+
+    matriz: Dict[str, Dict[str, EstadisticasCohorte]] = {}
+    for (curso_codigo, valor), (cantidad, calificadas, aprobadas, suma) in sorted(celdas.items()):
+        etiqueta = f"{valor // 100}-{valor % 100:02d}" if por_mes else f"{valor // 10}-{valor % 10}"
+        matriz.setdefault(curso_codigo, {})[etiqueta] = EstadisticasCohorte(
+            curso_codigo=curso_codigo,
+            periodo=etiqueta,
+            cantidad=cantidad,
+            calificadas=calificadas,
+            aprobadas=aprobadas,
+            tasa_aprobacion=aprobadas / calificadas if calificadas else 0.0,
+            promedio=suma / calificadas if calificadas else 0.0
+        )
+    return matriz
+
+
+def exportar_cohortes_csv(matriz: Dict[str, Dict[str, EstadisticasCohorte]], ruta: str):
+    """Escribe la matriz en CSV (una fila por celda curso/periodo)"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(['curso_codigo', 'periodo', 'cantidad', 'calificadas', 'aprobadas',
+                         'tasa_aprobacion', 'promedio'])
+        for periodos in matriz.values():
+            for cohorte in periodos.values():
+                writer.writerow([cohorte.curso_codigo, cohorte.periodo, cohorte.cantidad, cohorte.calificadas,
+                                 cohorte.aprobadas, f"{cohorte.tasa_aprobacion:.4f}", f"{cohorte.promedio:.4f}"])
+
+
+@dataclass
+class TablaPercentiles:
+    """Puesto y percentil de cada valor de un grupo, en vectores compactos.
+
+    Los vectores están alineados y ordenados por valor descendente. Los
+    empates comparten puesto (el del primero) y percentil. La posición de
+    cada estudiante se indexa al crear la tabla.
+    """
+    estudiante_ids: List[str]
+    valores: array
+    puestos: array
+    percentiles: array
+    _posiciones: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._posiciones = {}
+        for k, estudiante_id in enumerate(self.estudiante_ids):
+            # La primera aparición es la de mayor valor
+            self._posiciones.setdefault(estudiante_id, k)
+
+    def __len__(self) -> int:
+        return len(self.estudiante_ids)
+
+    def filas(self) -> Iterator[Tuple[str, float, int, float]]:
+        """Recorre (estudiante_id, valor, puesto, percentil) en orden"""
+        return zip(self.estudiante_ids, self.valores, self.puestos, self.percentiles)
+
+    def de_estudiante(self, estudiante_id: str) -> Optional[Tuple[float, int, float]]:
+        """(valor, puesto, percentil) del mejor registro del estudiante, o None"""
+        k = self._posiciones.get(estudiante_id)
+        if k is None:
+            return None
+        return self.valores[k], self.puestos[k], self.percentiles[k]
+
+
+@dataclass
+class PercentilesInstitucion:
+    """Percentiles por curso (notas) y generales (promedio ponderado)"""
+    por_curso: Dict[str, TablaPercentiles]
+    general: TablaPercentiles
+
+
+def calcular_percentiles(estudiante_ids: List[str], valores_descendentes: Iterable[float]) -> TablaPercentiles:
+    """Asigna puesto y percentil a valores ya ordenados de mayor a menor.
+
+    Una pasada por grupos de empate: el percentil es el porcentaje de
+    valores por debajo más la mitad de los empatados,
+    100 * (menores + iguales / 2) / n, así que los empates reciben el mismo
+    percentil.
+    """
+    valores = array('d', valores_descendentes)
+    n = len(valores)
+    puestos = array('l', bytes(array('l').itemsize * n))
+    percentiles = array('d', bytes(array('d').itemsize * n))
+
+    inicio = 0
+    while inicio < n:
+        fin = inicio + 1
+        while fin < n and valores[fin] == valores[inicio]:
+            fin += 1
+        percentil = 100.0 * ((n - fin) + (fin - inicio) / 2) / n
+        for k in range(inicio, fin):
+            puestos[k] = inicio + 1
+            percentiles[k] = percentil
+        inicio = fin
+
+    return TablaPercentiles(estudiante_ids, valores, puestos, percentiles)
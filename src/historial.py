@@ -0,0 +1,116 @@
+# src/historial.py - Historial académico (transcript) de un estudiante
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+from src.estadisticas import NOTA_APROBATORIA
+from src.modelos import Curso, Estudiante, Inscripcion, Matricula
+
+ESTADO_INSCRITO = "Inscrito"
+ESTADO_MATRICULADO = "Matriculado"
+ESTADO_APROBADO = "Aprobado"
+ESTADO_REPROBADO = "Reprobado"
+
+
+@dataclass
+class LineaHistorial:
+    """Un curso del historial con los totales acumulados hasta esa línea"""
+    curso_codigo: str
+    curso_nombre: str
+    creditos: int
+    inscripcion_id: Optional[str]
+    fecha_inscripcion: Optional[str]
+    matricula_id: Optional[str]
+    fecha_matricula: Optional[str]
+    nota: Optional[float]
+    estado: str
+    creditos_inscritos: int
+    creditos_cursados: int
+    creditos_aprobados: int
+    promedio: Optional[float]
+
+
+@dataclass
+class Historial:
+    """Historial académico completo de un estudiante"""
+    estudiante: Estudiante
+    lineas: List[LineaHistorial] = field(default_factory=list)
+
+    @property
+    def creditos_inscritos(self) -> int:
+        return self.lineas[-1].creditos_inscritos if self.lineas else 0
+
+    @property
+    def creditos_aprobados(self) -> int:
+        return self.lineas[-1].creditos_aprobados if self.lineas else 0
+
+    @property
+    def promedio(self) -> Optional[float]:
+        return self.lineas[-1].promedio if self.lineas else None
+
+
+def construir_historial(estudiante: Estudiante, inscripciones: Iterable[Inscripcion],
+                        matriculas_de_inscripcion: Callable[[str], Iterable[Matricula]],
+                        sin_inscripcion: Iterable[Matricula],
+                        buscar_curso: Callable[[str], Optional[Curso]],
+                        nota_minima: float = NOTA_APROBATORIA) -> Historial:
+    """Arma el historial recorriendo una vez las inscripciones del estudiante.
+
+    Cada inscripción aporta una línea por matrícula (o una sola si aún no
+    tiene matrícula); `sin_inscripcion` son matrículas cuya inscripción ya
+    no existe. Las líneas van por fecha de inscripción (o de matrícula) y
+    llevan créditos inscritos, cursados y aprobados y el promedio ponderado
+    acumulados. Los cursos se resuelven con `buscar_curso`, sin búsquedas
+    lineales.
+    """
+    filas = []
+    for inscripcion in inscripciones:
+        matriculas = list(matriculas_de_inscripcion(inscripcion.id)) or [None]
+        for matricula in matriculas:
+            filas.append((inscripcion.fecha_inscripcion, inscripcion.id, inscripcion, matricula))
+    for matricula in sin_inscripcion:
+        filas.append((matricula.fecha_matricula, matricula.inscripcion_id, None, matricula))
+    filas.sort(key=lambda fila: (fila[0], fila[1], fila[3].id if fila[3] else ''))
+
+    historial = Historial(estudiante)
+    inscritos = cursados = aprobados = 0
+    contadas = set()  # inscripciones cuyos créditos ya se sumaron a inscritos
+    suma_ponderada = 0.0
+    for _, _, inscripcion, matricula in filas:
+        codigo = inscripcion.curso_codigo if inscripcion else matricula.curso_codigo
+        curso = buscar_curso(codigo)
+        creditos = curso.creditos if curso else 0
+        nota = matricula.nota if matricula else None
+
+        if inscripcion and inscripcion.id not in contadas:
+            # Una inscripción con varias matrículas aporta sus créditos una vez
+            contadas.add(inscripcion.id)
+            inscritos += creditos
+        if matricula is None:
+            estado = ESTADO_INSCRITO
+        elif nota is None:
+            estado = ESTADO_MATRICULADO
+        else:
+            cursados += creditos
+            suma_ponderada += nota * creditos
+            if nota >= nota_minima:
+                aprobados += creditos
+                estado = ESTADO_APROBADO
+            else:
+                estado = ESTADO_REPROBADO
+
+        historial.lineas.append(LineaHistorial(
+            curso_codigo=codigo,
+            curso_nombre=curso.nombre if curso else "N/A",
+            creditos=creditos,
+            inscripcion_id=inscripcion.id if inscripcion else None,
+            fecha_inscripcion=inscripcion.fecha_inscripcion if inscripcion else None,
+            matricula_id=matricula.id if matricula else None,
+            fecha_matricula=matricula.fecha_matricula if matricula else None,
+            nota=nota,
+            estado=estado,
+            creditos_inscritos=inscritos,
+            creditos_cursados=cursados,
+            creditos_aprobados=aprobados,
+            promedio=suma_ponderada / cursados if cursados else None
+        ))
+    return historial
@@ -0,0 +1,138 @@
+# src/indice_rango.py - Índice ordenado para consultas por rango con bisect
+import bisect
+from datetime import date
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+def convertir_fecha(valor) -> date:
+    """'YYYY-MM-DD' (o un date) -> date; ValueError si no es una fecha válida"""
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(valor)
+
+
+def clave_fecha(campo: str) -> Callable[[Any], Optional[date]]:
+    """Función clave que convierte el texto de `campo` en date al indexar.
+
+    La conversión se hace una vez por registro; las fechas vacías o inválidas
+    dan None y el registro queda fuera del índice.
+    """
+    def clave(objeto) -> Optional[date]:
+        try:
+            return convertir_fecha(getattr(objeto, campo))
+        except (TypeError, ValueError):
+            return None
+    return clave
+
+
+class IndiceRango:
+    """Índice ordenado de registros por el valor de `clave`.
+
+    Mantiene las claves en una lista ordenada y, alineada con ella, la de
+    entradas (clave, identificador, id(objeto)) que desempata los valores
+    repetidos. Las consultas por rango son dos bisect más el recorrido del
+    resultado; insertar y quitar cuestan O(log n) de búsqueda más el
+    desplazamiento de la lista. Los registros cuya clave es None no se indexan.
+
+    `convertir` normaliza los extremos de las consultas al tipo de la clave
+    (por ejemplo texto -> date); por defecto se usan tal cual.
+    """
+
+    def __init__(self, clave: Callable[[Any], Any], identificador: Callable[[Any], Any],
+                 convertir: Optional[Callable[[Any], Any]] = None):
+        self._clave = clave
+        self._identificador = identificador
+        self._convertir = convertir
+        self._claves: List[Any] = []
+        self._entradas: List[Tuple[Any, Any, int]] = []
+        self._objetos = {}
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def clave_de(self, objeto):
+        """Valor indexado de un registro (None si no se indexa)"""
+        return self._clave(objeto)
+
+    def normalizar_limite(self, valor):
+        """Convierte un extremo de consulta al tipo de la clave"""
+        if valor is None or self._convertir is None:
+            return valor
+        return self._convertir(valor)
+
+    def _entrada(self, objeto) -> Optional[Tuple[Any, Any, int]]:
+        valor = self._clave(objeto)
+        if valor is None:
+            return None
+        return (valor, self._identificador(objeto), id(objeto))
+
+    def cargar(self, objetos: Iterable):
+        """Carga masiva: ordena una sola vez en lugar de insertar uno a uno"""
+        for objeto in objetos:
+            entrada = self._entrada(objeto)
+            if entrada is not None:
+                self._entradas.append(entrada)
+                self._objetos[entrada[2]] = objeto
+        self._entradas.sort()
+        self._claves = [entrada[0] for entrada in self._entradas]
+
+    def agregar(self, objeto):
+        """Inserta un registro en su posición"""
+        entrada = self._entrada(objeto)
+        if entrada is None:
+            return
+        posicion = bisect.bisect_left(self._entradas, entrada)
+        self._entradas.insert(posicion, entrada)
+        self._claves.insert(posicion, entrada[0])
+        self._objetos[entrada[2]] = objeto
+
+    def quitar(self, objeto):
+        """Quita un registro; debe llamarse antes de modificar su clave"""
+        entrada = self._entrada(objeto)
+        if entrada is None:
+            return
+        posicion = bisect.bisect_left(self._entradas, entrada)
+        if posicion < len(self._entradas) and self._entradas[posicion] == entrada:
+            del self._entradas[posicion]
+            del self._claves[posicion]
+            self._objetos.pop(entrada[2], None)
+
+    def _limites(self, minimo, maximo, incluir_minimo: bool, incluir_maximo: bool) -> Tuple[int, int]:
+        minimo = self.normalizar_limite(minimo)
+        maximo = self.normalizar_limite(maximo)
+        if minimo is None:
+            inicio = 0
+        elif incluir_minimo:
+            inicio = bisect.bisect_left(self._claves, minimo)
+        else:
+            inicio = bisect.bisect_right(self._claves, minimo)
+
+        if maximo is None:
+            fin = len(self._claves)
+        elif incluir_maximo:
+            fin = bisect.bisect_right(self._claves, maximo)
+        else:
+            fin = bisect.bisect_left(self._claves, maximo)
+        return inicio, max(inicio, fin)
+
+    def contar(self, minimo=None, maximo=None, incluir_minimo: bool = True,
+               incluir_maximo: bool = True) -> int:
+        """Cantidad de registros en el rango, en O(log n)"""
+        inicio, fin = self._limites(minimo, maximo, incluir_minimo, incluir_maximo)
+        return fin - inicio
+
+    def rango(self, minimo=None, maximo=None, incluir_minimo: bool = True,
+              incluir_maximo: bool = True, descendente: bool = False) -> Iterator:
+        """Recorre en orden de clave los registros con minimo <= clave <= maximo.
+
+        Un extremo None deja el rango abierto por ese lado.
+        """
+        inicio, fin = self._limites(minimo, maximo, incluir_minimo, incluir_maximo)
+        posiciones = range(fin - 1, inicio - 1, -1) if descendente else range(inicio, fin)
+        for posicion in posiciones:
+            yield self._objetos[self._entradas[posicion][2]]
+
+    def elementos(self) -> Iterator[Tuple[Any, Any]]:
+        """Recorre (clave, registro) en orden de clave"""
+        for clave, _, identidad in self._entradas:
+            yield clave, self._objetos[identidad]
@@ -1,27 +1,155 @@
 # src/main.py - Versión actualizada con todas las funcionalidades
+import argparse
+import sqlite3
+from typing import List
+
+from src.almacenamiento import BACKENDS, Almacenamiento, crear_almacenamiento
+from src.consultas import ConsultasAcademicas
 from src.persistencia import PersistenciaCSV
+from src.persistencia_sqlite import PersistenciaSQLite, importar_csv
 from src.ui import InterfazUsuario
 
-def main():
+# Almacenamiento por defecto: 'csv' (archivos en datos/), 'sqlite' (datos/minisiga.db)
+# o 'memoria' (sin disco: nada se conserva al salir)
+BACKEND = 'csv'
+# Procesos para parsear los CSV al iniciar (0 = solo hilos; conviene con archivos
+# grandes). Cada tabla va en un proceso: más de 4 no se aprovechan
+PROCESOS_CARGA = 0
+# Entradas de diario por tabla a partir de las cuales se compacta al iniciar o salir
+UMBRAL_COMPACTACION = 1000
+# Segundos entre autoguardados de las tablas modificadas (0 = solo al salir)
+INTERVALO_AUTOGUARDADO = 300
+
+def leer_claves(ruta: str) -> List[str]:
+    """Lee una clave por línea, ignorando líneas vacías y comentarios (#)"""
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        return [linea.strip() for linea in archivo if linea.strip() and not linea.lstrip().startswith('#')]
+
+def buscar_por_lote(tipo: str, ruta: str, persistencia: Almacenamiento):
+    """Modo de línea de comandos: resuelve un archivo de claves y termina"""
+    try:
+        claves = leer_claves(ruta)
+    except OSError as e:
+        print(f"❌ Error: No se pudo leer el archivo de claves {ruta}: {e.strerror or e}")
+        return
+    
+    consultas = ConsultasAcademicas(*persistencia.cargar_todo().tablas())
+    buscar = {
+        'documentos': consultas.buscar_estudiantes_por_documentos,
+        'correos': consultas.buscar_estudiantes_por_correos,
+        'ids': consultas.buscar_estudiantes_por_ids,
+    }[tipo]
+    resultado = buscar(claves)
+    
+    print(f"Encontrados ({len(resultado.encontrados)}):")
+    for clave, estudiante in resultado.encontrados.items():
+        print(f"  {clave}\t{estudiante.id}\t{estudiante.nombre_completo()}")
+    print(f"Faltantes ({len(resultado.faltantes)}):")
+    for clave in resultado.faltantes:
+        print(f"  {clave}")
+
+def guardar_datos(persistencia: Almacenamiento, estudiantes, cursos, inscripciones, matriculas,
+                  diario: bool):
+    """Guarda al salir: con escritura por fila cada cambio ya se guardó; con
+    CSV en modo diario los cambios ya están en disco y solo se compactan las
+    tablas con diario grande, y sin diario se reescriben las tablas
+    modificadas; cualquier otro backend sin escritura por fila reescribe las
+    cuatro tablas (y no se suscribe a los cambios durante la sesión)"""
+    if isinstance(persistencia, PersistenciaCSV):
+        if diario:
+            persistencia.compactar(estudiantes, cursos, inscripciones, matriculas, UMBRAL_COMPACTACION)
+        else:
+            persistencia.guardar_modificadas(estudiantes, cursos, inscripciones, matriculas)
+    elif not persistencia.escritura_por_fila:
+        # Solo lo que garantiza el protocolo Almacenamiento
+        persistencia.guardar_estudiantes(estudiantes)
+        persistencia.guardar_cursos(cursos)
+        persistencia.guardar_inscripciones(inscripciones)
+        persistencia.guardar_matriculas(matriculas)
+    persistencia.cerrar()
+
+def main(argv=None):
     """Función principal del sistema MiniSIGA"""
     
-    print("Iniciando MiniSIGA...")
+    parser = argparse.ArgumentParser(description="MiniSIGA - gestión académica")
+    lote = parser.add_mutually_exclusive_group()
+    lote.add_argument('--buscar-documentos', metavar='ARCHIVO',
+                      help="Busca los documentos listados en ARCHIVO (uno por línea) y termina")
+    lote.add_argument('--buscar-correos', metavar='ARCHIVO',
+                      help="Busca los correos listados en ARCHIVO (uno por línea) y termina")
+    lote.add_argument('--buscar-ids', metavar='ARCHIVO',
+                      help="Busca los IDs de estudiante listados en ARCHIVO (uno por línea) y termina")
+    lote.add_argument('--importar-csv', action='store_true',
+                      help="Copia los CSV de datos/ a la base SQLite y termina")
+    parser.add_argument('--backend', choices=tuple(BACKENDS), default=BACKEND,
+                        help=f"Almacenamiento de los datos (por defecto: {BACKEND})")
+    parser.add_argument('--procesos-carga', metavar='N', type=int, default=PROCESOS_CARGA,
+                        help="Procesos para parsear los CSV al iniciar (0 = solo hilos; uno por "
+                             "tabla, así que más de 4 no acelera la carga)")
+    parser.add_argument('--diario', action='store_true',
+                        help="Registra cada cambio en un diario en disco en lugar de reescribir los CSV al salir")
+    parser.add_argument('--autoguardado', metavar='SEGUNDOS', type=float, default=None,
+                        help="Guarda las tablas modificadas tras una operación si pasaron SEGUNDOS "
+                             f"desde el último guardado (0 = solo al salir; por defecto: {INTERVALO_AUTOGUARDADO})")
+    argumentos = parser.parse_args(argv)
+    
+    # El diario y el autoguardado son propios del backend CSV
+    if argumentos.backend != 'csv':
+        if argumentos.diario:
+            parser.error("--diario solo aplica con --backend csv")
+        if argumentos.autoguardado is not None:
+            parser.error("--autoguardado solo aplica con --backend csv")
+    if argumentos.autoguardado is None:
+        argumentos.autoguardado = INTERVALO_AUTOGUARDADO
+    
+    if argumentos.importar_csv:
+        base = PersistenciaSQLite()
+        try:
+            filas = importar_csv(base)
+        except (ValueError, sqlite3.Error) as e:
+            print(f"❌ Error al importar: {e}")
+            return
+        finally:
+            base.cerrar()
+        print(f"Importado a {base.ruta}: " + ", ".join(f"{n} {tabla}" for tabla, n in filas.items()))
+        return
     
     # Inicializar persistencia
-    persistencia = PersistenciaCSV()
+    persistencia = crear_almacenamiento(argumentos.backend)
+    
+    for tipo in ('documentos', 'correos', 'ids'):
+        ruta = getattr(argumentos, f"buscar_{tipo}")
+        if ruta:
+            buscar_por_lote(tipo, ruta, persistencia)
+            return
     
-    # Cargar datos desde archivos CSV
+    print("Iniciando MiniSIGA...")
+    
+    # Cargar datos desde el almacenamiento
     print("Cargando datos...")
-    estudiantes = persistencia.cargar_estudiantes()
-    cursos = persistencia.cargar_cursos()
-    inscripciones = persistencia.cargar_inscripciones()
-    matriculas = persistencia.cargar_matriculas()
+    carga = persistencia.cargar_todo(argumentos.procesos_carga)
+    estudiantes, cursos, inscripciones, matriculas = carga.tablas()
     
-    print(f"Datos cargados: {len(estudiantes)} estudiantes, {len(cursos)} cursos, {len(inscripciones)} inscripciones, {len(matriculas)} matrículas")
+    print(f"Datos cargados: {carga.resumen()}")
     
     # Inicializar interfaz de usuario
     ui = InterfazUsuario(estudiantes, cursos, inscripciones, matriculas)
     
+    if persistencia.escritura_por_fila:
+        # Cada operación se guarda (en SQLite, en su propia transacción) al ocurrir
+        ui.consultas.suscribir(persistencia.registrar_cambios)
+    elif argumentos.diario:
+        compactadas = persistencia.compactar(estudiantes, cursos, inscripciones, matriculas, UMBRAL_COMPACTACION)
+        if compactadas:
+            print(f"Diario compactado: {', '.join(compactadas)}")
+        ui.consultas.suscribir(persistencia.registrar_cambios)
+    else:
+        ui.consultas.suscribir(persistencia.marcar_cambios)
+        if argumentos.autoguardado > 0:
+            # Se guarda entre operaciones, nunca a mitad de una mutación
+            ui.consultas.suscribir(lambda cambios: persistencia.autoguardar(
+                estudiantes, cursos, inscripciones, matriculas, argumentos.autoguardado))
+    
     # Loop principal del programa
     while True:
         try:
@@ -31,10 +159,7 @@ def main():
             if opcion == "0":
                 # Guardar datos antes de salir
                 print("Guardando datos...")
-                persistencia.guardar_estudiantes(estudiantes)
-                persistencia.guardar_cursos(cursos)
-                persistencia.guardar_inscripciones(inscripciones)
-                persistencia.guardar_matriculas(matriculas)
+                guardar_datos(persistencia, estudiantes, cursos, inscripciones, matriculas, argumentos.diario)
                 print("¡Datos guardados exitosamente!")
                 print("¡Gracias por usar MiniSIGA!")
                 break
@@ -141,6 +266,24 @@ def main():
                         ui.ejecutar_consulta_dominios_correo()
                     elif sub_opcion == "8":
                         ui.ejecutar_busqueda_binaria_apellido()
+                    elif sub_opcion == "9":
+                        ui.ejecutar_consulta_buscar_nombre()
+                    elif sub_opcion == "10":
+                        ui.ejecutar_consulta_estadisticas_cursos()
+                    elif sub_opcion == "11":
+                        ui.ejecutar_consulta_ranking_promedios()
+                    elif sub_opcion == "12":
+                        ui.ejecutar_reportes_por_curso()
+                    elif sub_opcion == "13":
+                        ui.ejecutar_consulta_cohortes()
+                    elif sub_opcion == "14":
+                        ui.ejecutar_consulta_percentiles()
+                    elif sub_opcion == "15":
+                        ui.ejecutar_consulta_transcript()
+                    elif sub_opcion == "16":
+                        ui.ejecutar_exportar_transcripts()
+                    elif sub_opcion == "17":
+                        ui.ejecutar_consulta_carga_docentes()
                     else:
                         print("❌ Opción no válida")
             
@@ -159,10 +302,7 @@ def main():
             print("\n\nInterrumpido por el usuario.")
             # Guardar datos antes de salir
             print("Guardando datos...")
-            persistencia.guardar_estudiantes(estudiantes)
-            persistencia.guardar_cursos(cursos)
-            persistencia.guardar_inscripciones(inscripciones)
-            persistencia.guardar_matriculas(matriculas)
+            guardar_datos(persistencia, estudiantes, cursos, inscripciones, matriculas, argumentos.diario)
             print("¡Datos guardados exitosamente!")
             break
         except Exception as e:
@@ -0,0 +1,44 @@
+# src/paginacion.py - Utilidades para recorrer resultados por páginas sin materializarlos
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+_SIN_ELEMENTO = object()
+
+
+def paginar(iterable: Iterable, offset: int = 0, limite: Optional[int] = None) -> Iterator:
+    """Recorta un iterable a [offset, offset + limite) sin materializarlo"""
+    if offset < 0 or (limite is not None and limite < 0):
+        raise ValueError("offset y limite deben ser no negativos")
+    fin = None if limite is None else offset + limite
+    return islice(iterable, offset, fin)
+
+
+class Paginador:
+    """Cursor sobre un iterable que entrega páginas de tamaño fijo bajo demanda.
+
+    Mantiene un elemento de anticipación para saber si quedan más páginas
+    sin consumir la siguiente.
+    """
+
+    def __init__(self, iterable: Iterable, tamano_pagina: int = 20):
+        if tamano_pagina <= 0:
+            raise ValueError("El tamaño de página debe ser positivo")
+        self.tamano_pagina = tamano_pagina
+        self.entregados = 0
+        self._iterador = iter(iterable)
+        self._siguiente = next(self._iterador, _SIN_ELEMENTO)
+
+    @property
+    def hay_mas(self) -> bool:
+        """Indica si quedan elementos por entregar"""
+        return self._siguiente is not _SIN_ELEMENTO
+
+    def siguiente_pagina(self) -> List:
+        """Retorna la siguiente página (lista vacía si ya no hay elementos)"""
+        if not self.hay_mas:
+            return []
+        pagina = [self._siguiente]
+        pagina.extend(islice(self._iterador, self.tamano_pagina - 1))
+        self._siguiente = next(self._iterador, _SIN_ELEMENTO) if len(pagina) == self.tamano_pagina else _SIN_ELEMENTO
+        self.entregados += len(pagina)
+        return pagina
@@ -2,14 +2,41 @@
 import csv
 import json
 import os
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
+from functools import partial
+from typing import Dict, List, Set, Tuple
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.cambios import CLAVES, GUARDAR, MODELOS, Cambio, eliminado, guardado
+from src.carga import TABLAS, CargaTablas, cargar_concurrente
 
 class PersistenciaCSV:
-    """Maneja la persistencia de datos en archivos CSV"""
+    """Maneja la persistencia de datos en archivos CSV.
+    
+    Modo diario: suscribiendo `registrar_cambios` a ConsultasAcademicas, cada
+    cambio se agrega al diario de su tabla (`<tabla>.diario`, una línea JSON
+    por registro guardado o eliminado) y se confirma con fsync, así una caída
+    no pierde la sesión. Al cargar, el diario se reproduce sobre el CSV;
+    `compactar` (o cualquier guardar_*) vuelca la tabla al CSV y vacía su diario.
+    
+    Sin diario, suscribiendo `marcar_cambios` se registran las tablas
+    modificadas desde la última carga o guardado, y `guardar_modificadas`
+    reescribe solo esas. Cada CSV se escribe en un temporal que reemplaza al
+    original con os.replace, así un guardado interrumpido no lo trunca.
+    """
+    
+    # Los cambios por fila van al diario; el CSV se reescribe al guardar o compactar
+    escritura_por_fila = False
     
     def __init__(self, base_path: str = "datos"):
         self.base_path = base_path
+        self._diarios = {}
+        # Entradas pendientes de compactar en el diario de cada tabla
+        self.entradas_diario: Dict[str, int] = {tabla: 0 for tabla in MODELOS}
+        self.tablas_modificadas: Set[str] = set()
+        self._ultimo_guardado = time.monotonic()
         self.crear_directorio()
     
     def crear_directorio(self):
@@ -17,13 +44,29 @@ class PersistenciaCSV:
         if not os.path.exists(self.base_path):
             os.makedirs(self.base_path)
     
+    @contextmanager
+    def _escribir_atomico(self, archivo: str):
+        """Escribe en un temporal junto a `archivo` y lo reemplaza al terminar;
+        si la escritura falla, el archivo anterior queda intacto"""
+        temporal = archivo + ".tmp"
+        try:
+            with open(temporal, 'w', newline='', encoding='utf-8') as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, archivo)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+    
     def cargar_estudiantes(self) -> List[Estudiante]:
         """Carga estudiantes desde CSV"""
         archivo = os.path.join(self.base_path, "estudiantes.csv")
         estudiantes = []
         
         if not os.path.exists(archivo):
-            return estudiantes
+            # Sin CSV todavía: el diario se aplica sobre una tabla vacía
+            return self._cargada('estudiantes', estudiantes)
         
         try:
             with open(archivo, 'r', newline='', encoding='utf-8') as f:
@@ -41,13 +84,13 @@ class PersistenciaCSV:
         except Exception as e:
             print(f"Error cargando estudiantes: {e}")
         
-        return estudiantes
+        return self._cargada('estudiantes', estudiantes)
     
     def guardar_estudiantes(self, estudiantes: List[Estudiante]):
         """Guarda estudiantes en CSV"""
         archivo = os.path.join(self.base_path, "estudiantes.csv")
         
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        with self._escribir_atomico(archivo) as f:
             if estudiantes:
                 fieldnames = ['id', 'documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -62,6 +105,8 @@ class PersistenciaCSV:
                         'correo': estudiante.correo,
                         'fecha_nacimiento': estudiante.fecha_nacimiento
                     })
+        self._vaciar_diario('estudiantes')
+        self.tablas_modificadas.discard('estudiantes')
     
     def cargar_cursos(self) -> List[Curso]:
         """Carga cursos desde CSV"""
@@ -69,7 +114,8 @@ class PersistenciaCSV:
         cursos = []
         
         if not os.path.exists(archivo):
-            return cursos
+            # Sin CSV todavía: el diario se aplica sobre una tabla vacía
+            return self._cargada('cursos', cursos)
         
         try:
             with open(archivo, 'r', newline='', encoding='utf-8') as f:
@@ -85,13 +131,13 @@ class PersistenciaCSV:
         except Exception as e:
             print(f"Error cargando cursos: {e}")
         
-        return cursos
+        return self._cargada('cursos', cursos)
     
     def guardar_cursos(self, cursos: List[Curso]):
         """Guarda cursos en CSV"""
         archivo = os.path.join(self.base_path, "cursos.csv")
         
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        with self._escribir_atomico(archivo) as f:
             if cursos:
                 fieldnames = ['codigo', 'nombre', 'creditos', 'docente']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -104,6 +150,8 @@ class PersistenciaCSV:
                         'creditos': curso.creditos,
                         'docente': curso.docente
                     })
+        self._vaciar_diario('cursos')
+        self.tablas_modificadas.discard('cursos')
     
     def cargar_inscripciones(self) -> List[Inscripcion]:
         """Carga inscripciones desde CSV"""
@@ -111,7 +159,8 @@ class PersistenciaCSV:
         inscripciones = []
         
         if not os.path.exists(archivo):
-            return inscripciones
+            # Sin CSV todavía: el diario se aplica sobre una tabla vacía
+            return self._cargada('inscripciones', inscripciones)
         
         try:
             with open(archivo, 'r', newline='', encoding='utf-8') as f:
@@ -127,13 +176,13 @@ class PersistenciaCSV:
         except Exception as e:
             print(f"Error cargando inscripciones: {e}")
         
-        return inscripciones
+        return self._cargada('inscripciones', inscripciones)
     
     def guardar_inscripciones(self, inscripciones: List[Inscripcion]):
         """Guarda inscripciones en CSV"""
         archivo = os.path.join(self.base_path, "inscripciones.csv")
         
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        with self._escribir_atomico(archivo) as f:
             if inscripciones:
                 fieldnames = ['id', 'estudiante_id', 'curso_codigo', 'fecha_inscripcion']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -146,6 +195,8 @@ class PersistenciaCSV:
                         'curso_codigo': inscripcion.curso_codigo,
                         'fecha_inscripcion': inscripcion.fecha_inscripcion
                     })
+        self._vaciar_diario('inscripciones')
+        self.tablas_modificadas.discard('inscripciones')
     
     def cargar_matriculas(self) -> List[Matricula]:
         """Carga matrículas desde CSV - ahora incluye inscripcion_id"""
@@ -153,7 +204,8 @@ class PersistenciaCSV:
         matriculas = []
         
         if not os.path.exists(archivo):
-            return matriculas
+            # Sin CSV todavía: el diario se aplica sobre una tabla vacía
+            return self._cargada('matriculas', matriculas)
         
         try:
             with open(archivo, 'r', newline='', encoding='utf-8') as f:
@@ -184,13 +236,13 @@ class PersistenciaCSV:
         except Exception as e:
             print(f"Error cargando matrículas: {e}")
         
-        return matriculas
+        return self._cargada('matriculas', matriculas)
     
     def guardar_matriculas(self, matriculas: List[Matricula]):
         """Guarda matrículas en CSV - ahora incluye inscripcion_id"""
         archivo = os.path.join(self.base_path, "matriculas.csv")
         
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        with self._escribir_atomico(archivo) as f:
             if matriculas:
                 fieldnames = ['id', 'inscripcion_id', 'estudiante_id', 'curso_codigo', 'fecha_matricula', 'nota']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -205,6 +257,33 @@ class PersistenciaCSV:
                         'fecha_matricula': matricula.fecha_matricula,
                         'nota': matricula.nota if matricula.nota is not None else ''
                     })
+        self._vaciar_diario('matriculas')
+        self.tablas_modificadas.discard('matriculas')
+    
+    def cargar_todo(self, procesos: int = 0) -> CargaTablas:
+        """Carga las cuatro tablas a la vez, cada una en su hilo, midiendo cada una.
+        
+        Con `procesos` > 0 el parseo de los CSV se reparte además en un pool de
+        ese número de procesos: con archivos grandes pesa más el parseo (que
+        en hilos no corre en paralelo) que la lectura. Los registros vuelven
+        serializados al proceso principal, así que con archivos chicos no conviene.
+        
+        Cada tabla se parsea entera en un solo proceso (el diario se reproduce
+        sobre la tabla completa), así que nunca se usan más procesos que
+        tablas: la carga tarda al menos lo que tarda la tabla más grande.
+        """
+        if procesos <= 0:
+            return cargar_concurrente({tabla: getattr(self, f"cargar_{tabla}") for tabla in TABLAS})
+        
+        with ProcessPoolExecutor(max_workers=min(procesos, len(TABLAS))) as pool:
+            return cargar_concurrente({tabla: partial(self._cargar_en_proceso, pool, tabla) for tabla in TABLAS})
+    
+    def _cargar_en_proceso(self, pool: ProcessPoolExecutor, tabla: str) -> List:
+        registros, entradas = pool.submit(_cargar_tabla, self.base_path, tabla).result()
+        # El diario se reprodujo en el otro proceso: se trae su cuenta
+        self.entradas_diario[tabla] = entradas
+        self.tablas_modificadas.discard(tabla)
+        return registros
     
     def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso], 
                      inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str:
@@ -252,4 +331,166 @@ class PersistenciaCSV:
         with open(archivo, 'w', encoding='utf-8') as f:
             json.dump(datos, f, indent=2, ensure_ascii=False)
         
-        return archivo
\ No newline at end of file
+        return archivo
+    
+    # ------------------------------------------------------------------
+    # Diario de cambios
+    # ------------------------------------------------------------------
+    def _ruta_diario(self, tabla: str) -> str:
+        return os.path.join(self.base_path, f"{tabla}.diario")
+    
+    def _abrir_diario(self, tabla: str):
+        ruta = self._ruta_diario(tabla)
+        archivo = open(ruta, 'a', encoding='utf-8')
+        if archivo.tell() > 0:
+            # Si la última línea quedó cortada por una caída, se cierra antes de seguir
+            with open(ruta, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    archivo.write("\n")
+        self._diarios[tabla] = archivo
+        return archivo
+    
+    def registrar_cambios(self, cambios: List[Cambio]):
+        """Agrega los cambios a los diarios y los confirma (flush + fsync).
+        
+        Pensado como suscriptor de ConsultasAcademicas: cada llamada es una
+        operación completa y queda en disco antes de retornar.
+        """
+        afectados = []
+        for cambio in cambios:
+            archivo = self._diarios.get(cambio.tabla) or self._abrir_diario(cambio.tabla)
+            entrada = {
+                'op': cambio.operacion,
+                'clave': cambio.clave,
+                'registro': asdict(cambio.registro) if cambio.registro is not None else None
+            }
+            archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self.entradas_diario[cambio.tabla] += 1
+            if archivo not in afectados:
+                afectados.append(archivo)
+        
+        for archivo in afectados:
+            archivo.flush()
+            os.fsync(archivo.fileno())
+    
+    def upsert(self, tabla: str, registros):
+        """Guarda registros por clave agregándolos al diario de la tabla"""
+        self.registrar_cambios([guardado(tabla, registro) for registro in registros])
+    
+    def eliminar(self, tabla: str, claves):
+        """Elimina registros por clave agregando la baja al diario de la tabla"""
+        self.registrar_cambios([eliminado(tabla, clave) for clave in claves])
+    
+    def _cargada(self, tabla: str, registros: List) -> List:
+        # Recién cargada, la tabla coincide con lo guardado más su diario
+        self.tablas_modificadas.discard(tabla)
+        return self._reproducir_diario(tabla, registros)
+    
+    def _reproducir_diario(self, tabla: str, registros: List) -> List:
+        """Aplica el diario de `tabla` sobre los registros leídos del CSV"""
+        ruta = self._ruta_diario(tabla)
+        self.entradas_diario[tabla] = 0
+        if not os.path.exists(ruta):
+            return registros
+        
+        modelo = MODELOS[tabla]
+        campo = CLAVES[tabla]
+        resultado = list(registros)
+        posiciones = {}
+        for posicion, registro in enumerate(resultado):
+            posiciones.setdefault(getattr(registro, campo), posicion)
+        
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    entrada = json.loads(linea)
+                except ValueError:
+                    # Línea cortada por una caída durante la escritura
+                    continue
+                self.entradas_diario[tabla] += 1
+                clave = entrada['clave']
+                posicion = posiciones.get(clave)
+                if entrada['op'] == GUARDAR:
+                    registro = modelo(**entrada['registro'])
+                    if posicion is None:
+                        posiciones[clave] = len(resultado)
+                        resultado.append(registro)
+                    else:
+                        resultado[posicion] = registro
+                elif posicion is not None:
+                    # Los huecos se quitan al final para no mover las posiciones
+                    resultado[posicion] = None
+                    del posiciones[clave]
+        
+        return [registro for registro in resultado if registro is not None]
+    
+    def _vaciar_diario(self, tabla: str):
+        archivo = self._diarios.pop(tabla, None)
+        if archivo is not None:
+            archivo.close()
+        ruta = self._ruta_diario(tabla)
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        self.entradas_diario[tabla] = 0
+    
+    def compactar(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                  inscripciones: List[Inscripcion], matriculas: List[Matricula],
+                  umbral: int = 0) -> List[str]:
+        """Vuelca al CSV las tablas con más de `umbral` entradas en el diario.
+        
+        El CSV se reescribe antes de borrar el diario; si el proceso cae entre
+        ambos pasos, reproducir el diario sobre el CSV nuevo da el mismo estado.
+        Retorna las tablas compactadas.
+        """
+        compactadas = [tabla for tabla in MODELOS if self.entradas_diario[tabla] > umbral]
+        return self._guardar_tablas(compactadas, estudiantes, cursos, inscripciones, matriculas)
+    
+    def _guardar_tablas(self, tablas: List[str], estudiantes: List[Estudiante], cursos: List[Curso],
+                        inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> List[str]:
+        guardar = {
+            'estudiantes': (self.guardar_estudiantes, estudiantes),
+            'cursos': (self.guardar_cursos, cursos),
+            'inscripciones': (self.guardar_inscripciones, inscripciones),
+            'matriculas': (self.guardar_matriculas, matriculas),
+        }
+        for tabla in tablas:
+            funcion, registros = guardar[tabla]
+            funcion(registros)
+        self._ultimo_guardado = time.monotonic()
+        return tablas
+    
+    def cerrar(self):
+        """Cierra los diarios abiertos"""
+        for archivo in self._diarios.values():
+            archivo.close()
+        self._diarios.clear()
+    
+    # ------------------------------------------------------------------
+    # Tablas modificadas y autoguardado
+    # ------------------------------------------------------------------
+    def marcar_cambios(self, cambios: List[Cambio]):
+        """Suscriptor de ConsultasAcademicas: marca las tablas que cambiaron"""
+        self.tablas_modificadas.update(cambio.tabla for cambio in cambios)
+    
+    def guardar_modificadas(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                            inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> List[str]:
+        """Reescribe solo las tablas modificadas desde la última carga o guardado.
+        Retorna las tablas guardadas."""
+        modificadas = [tabla for tabla in MODELOS if tabla in self.tablas_modificadas]
+        return self._guardar_tablas(modificadas, estudiantes, cursos, inscripciones, matriculas)
+    
+    def autoguardar(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                    inscripciones: List[Inscripcion], matriculas: List[Matricula],
+                    intervalo: float) -> List[str]:
+        """Guarda las tablas modificadas si pasaron `intervalo` segundos desde el
+        último guardado; retorna las tablas guardadas (vacía si no tocaba)"""
+        if time.monotonic() - self._ultimo_guardado < intervalo:
+            return []
+        return self.guardar_modificadas(estudiantes, cursos, inscripciones, matriculas)
+
+
+def _cargar_tabla(base_path: str, tabla: str) -> Tuple[List, int]:
+    # Función de nivel de módulo para que el pool pueda enviarla a otro proceso
+    persistencia = PersistenciaCSV(base_path)
+    return getattr(persistencia, f"cargar_{tabla}")(), persistencia.entradas_diario[tabla]
\ No newline at end of file
@@ -0,0 +1,146 @@
+# src/persistencia_memoria.py - Persistencia en memoria, sin disco (pruebas y mediciones)
+import copy
+import json
+import random
+from dataclasses import asdict
+from datetime import date, timedelta
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.cambios import CLAVES, GUARDAR, MODELOS, Cambio
+from src.carga import TABLAS, CargaTablas, cargar_concurrente
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+
+class PersistenciaMemoria:
+    """Almacenamiento en diccionarios por clave, con la interfaz de PersistenciaCSV.
+
+    Sirve para medir consultas e interfaz sin E/S de disco y para pruebas
+    rápidas con volúmenes grandes. Guarda copias de los registros, de modo
+    que modificar lo cargado no altera lo almacenado hasta guardarlo, igual
+    que con un archivo.
+    """
+
+    escritura_por_fila = True
+
+    def __init__(self):
+        self._tablas: Dict[str, Dict[str, object]] = {tabla: {} for tabla in MODELOS}
+        self.exportacion: Optional[str] = None
+
+    def _cargar(self, tabla: str) -> List:
+        return [copy.copy(registro) for registro in self._tablas[tabla].values()]
+
+    def _guardar(self, tabla: str, registros: Iterable):
+        campo = CLAVES[tabla]
+        self._tablas[tabla] = {getattr(r, campo): copy.copy(r) for r in registros}
+
+    def upsert(self, tabla: str, registros: Iterable):
+        """Inserta o reemplaza los registros por su clave"""
+        filas = self._tablas[tabla]
+        campo = CLAVES[tabla]
+        for registro in registros:
+            filas[getattr(registro, campo)] = copy.copy(registro)
+
+    def eliminar(self, tabla: str, claves: Iterable[str]):
+        """Elimina los registros con las claves dadas (las ausentes se ignoran)"""
+        filas = self._tablas[tabla]
+        for clave in claves:
+            filas.pop(clave, None)
+
+    def registrar_cambios(self, cambios: List[Cambio]):
+        """Aplica los cambios de una operación de ConsultasAcademicas"""
+        for cambio in cambios:
+            if cambio.operacion == GUARDAR:
+                self.upsert(cambio.tabla, (cambio.registro,))
+            else:
+                self.eliminar(cambio.tabla, (cambio.clave,))
+
+    def cerrar(self):
+        pass
+
+    def cargar_estudiantes(self) -> List[Estudiante]:
+        return self._cargar('estudiantes')
+
+    def guardar_estudiantes(self, estudiantes: List[Estudiante]):
+        self._guardar('estudiantes', estudiantes)
+
+    def cargar_cursos(self) -> List[Curso]:
+        return self._cargar('cursos')
+
+    def guardar_cursos(self, cursos: List[Curso]):
+        self._guardar('cursos', cursos)
+
+    def cargar_inscripciones(self) -> List[Inscripcion]:
+        return self._cargar('inscripciones')
+
+    def guardar_inscripciones(self, inscripciones: List[Inscripcion]):
+        self._guardar('inscripciones', inscripciones)
+
+    def cargar_matriculas(self) -> List[Matricula]:
+        return self._cargar('matriculas')
+
+    def guardar_matriculas(self, matriculas: List[Matricula]):
+        self._guardar('matriculas', matriculas)
+
+    def cargar_todo(self, procesos: int = 0) -> CargaTablas:
+        """Carga las cuatro tablas en serie (no hay E/S que solapar); `procesos` no aplica"""
+        return cargar_concurrente({tabla: partial(self._cargar, tabla) for tabla in TABLAS}, hilos=False)
+
+    def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                      inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str:
+        """Genera el JSON en `self.exportacion`; retorna un nombre simbólico"""
+        datos = {
+            'estudiantes': [asdict(e) for e in estudiantes],
+            'cursos': [asdict(c) for c in cursos],
+            'inscripciones': [asdict(i) for i in inscripciones],
+            'matriculas': [asdict(m) for m in matriculas]
+        }
+        self.exportacion = json.dumps(datos, indent=2, ensure_ascii=False)
+        return "<memoria>/export.json"
+
+
+NOMBRES = ["Ana", "Juan", "María", "Carlos", "Laura", "Andrés", "Sofía", "Diego", "Valentina", "Camilo"]
+APELLIDOS = ["Pérez", "González", "López", "Rodríguez", "Martínez", "Gómez", "Díaz", "Torres", "Ramírez", "Castro"]
+DOMINIOS = ["universidad.edu.co", "gmail.com", "hotmail.com", "outlook.com"]
+
+
+def datos_sinteticos(estudiantes: int = 1000, cursos: int = 50, inscripciones_por_estudiante: int = 5,
+                     proporcion_matriculadas: float = 0.8,
+                     semilla: int = 0) -> Tuple[List[Estudiante], List[Curso], List[Inscripcion], List[Matricula]]:
+    """Genera un conjunto de datos válido y reproducible (misma semilla, mismos datos).
+
+    Cada estudiante se inscribe en `inscripciones_por_estudiante` cursos
+    distintos; una `proporcion_matriculadas` de las inscripciones tiene
+    matrícula, y la mayoría de las matrículas tiene nota.
+    """
+    azar = random.Random(semilla)
+    inicio = date(2024, 1, 8)
+
+    lista_cursos = [Curso(f"C{j:04d}", f"Curso {j}", azar.randint(1, 5),
+                          f"Dr. {azar.choice(APELLIDOS)}") for j in range(cursos)]
+    lista_estudiantes = []
+    lista_inscripciones = []
+    lista_matriculas = []
+    for i in range(estudiantes):
+        estudiante = Estudiante(
+            id=f"E{i:06d}",
+            documento=str(10000000 + i),
+            nombres=azar.choice(NOMBRES),
+            apellidos=f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}",
+            correo=f"est{i}@{azar.choice(DOMINIOS)}",
+            fecha_nacimiento=(date(1995, 1, 1) + timedelta(days=azar.randrange(3650))).isoformat()
+        )
+        lista_estudiantes.append(estudiante)
+
+        for curso in azar.sample(lista_cursos, min(inscripciones_por_estudiante, cursos)):
+            fecha = inicio + timedelta(days=azar.randrange(365))
+            inscripcion = Inscripcion(f"I{len(lista_inscripciones):07d}", estudiante.id, curso.codigo,
+                                      fecha.isoformat())
+            lista_inscripciones.append(inscripcion)
+            if azar.random() < proporcion_matriculadas:
+                nota = round(azar.uniform(0.0, 5.0), 1) if azar.random() < 0.9 else None
+                lista_matriculas.append(Matricula(
+                    f"M{len(lista_matriculas):07d}", inscripcion.id, estudiante.id, curso.codigo,
+                    (fecha + timedelta(days=azar.randrange(1, 30))).isoformat(), nota))
+
+    return lista_estudiantes, lista_cursos, lista_inscripciones, lista_matriculas
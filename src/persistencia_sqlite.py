@@ -0,0 +1,221 @@
+# src/persistencia_sqlite.py - Persistencia en una base SQLite (solo biblioteca estándar)
+import json
+import os
+import sqlite3
+from dataclasses import asdict, fields
+from functools import partial
+from itertools import groupby
+from typing import Dict, Iterable, List
+
+from src.cambios import CLAVES, GUARDAR, MODELOS, Cambio
+from src.carga import TABLAS, CargaTablas, cargar_concurrente
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.persistencia import PersistenciaCSV
+
+# Columnas que no son texto
+TIPOS_COLUMNA = {'creditos': 'INTEGER', 'nota': 'REAL'}
+
+# Columnas indexadas (además de la clave primaria) por las que se busca y se une
+INDICES = {
+    'estudiantes': ('documento', 'correo'),
+    'inscripciones': ('estudiante_id', 'curso_codigo'),
+    'matriculas': ('inscripcion_id', 'estudiante_id', 'curso_codigo'),
+}
+
+
+def _columnas(tabla: str) -> List[str]:
+    return [f.name for f in fields(MODELOS[tabla])]
+
+
+class PersistenciaSQLite:
+    """Maneja la persistencia de datos en una base SQLite.
+
+    Ofrece la misma interfaz cargar_*/guardar_*/exportar_json que
+    PersistenciaCSV y, además, escritura por fila: `upsert` y `eliminar`, o
+    `registrar_cambios` como suscriptor de ConsultasAcademicas para confirmar
+    cada operación en su propia transacción. La base usa modo WAL, así las
+    lecturas no bloquean a la escritura, y las escrituras en lote van con
+    executemany.
+    """
+
+    escritura_por_fila = True
+
+    def __init__(self, base_path: str = "datos", archivo: str = "minisiga.db"):
+        self.base_path = base_path
+        os.makedirs(base_path, exist_ok=True)
+        self.ruta = os.path.join(base_path, archivo)
+        self._conexion = sqlite3.connect(self.ruta)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self.crear_esquema()
+
+    def crear_esquema(self):
+        """Crea las tablas y sus índices si no existen"""
+        with self._conexion:
+            for tabla in MODELOS:
+                columnas = ", ".join(
+                    f"{columna} {TIPOS_COLUMNA.get(columna, 'TEXT')}" +
+                    (" PRIMARY KEY NOT NULL" if columna == CLAVES[tabla] else "")
+                    for columna in _columnas(tabla))
+                self._conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+                for columna in INDICES.get(tabla, ()):
+                    self._conexion.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{tabla}_{columna} ON {tabla} ({columna})")
+
+    def cerrar(self):
+        self._conexion.close()
+
+    # ------------------------------------------------------------------
+    # Operaciones genéricas por tabla
+    # ------------------------------------------------------------------
+    def _cargar(self, tabla: str, conexion: sqlite3.Connection = None) -> List:
+        modelo = MODELOS[tabla]
+        registros = []
+        try:
+            # rowid conserva el orden de inserción, como las filas del CSV
+            for fila in (conexion or self._conexion).execute(f"SELECT {', '.join(_columnas(tabla))} FROM {tabla} ORDER BY rowid"):
+                registros.append(modelo(*fila))
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error cargando {tabla}: {e}")
+        return registros
+
+    def _filas(self, tabla: str, registros: Iterable):
+        columnas = _columnas(tabla)
+        return (tuple(getattr(registro, columna) for columna in columnas) for registro in registros)
+
+    def _insertar(self, tabla: str, registros: Iterable, upsert: bool):
+        columnas = _columnas(tabla)
+        sql = (f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+               f"VALUES ({', '.join('?' for _ in columnas)})")
+        if upsert:
+            # ON CONFLICT ... DO UPDATE conserva el rowid (y con él el orden)
+            sql += (f" ON CONFLICT({CLAVES[tabla]}) DO UPDATE SET " +
+                    ", ".join(f"{columna} = excluded.{columna}" for columna in columnas if columna != CLAVES[tabla]))
+        self._conexion.executemany(sql, self._filas(tabla, registros))
+
+    def _eliminar(self, tabla: str, claves: Iterable[str]):
+        self._conexion.executemany(f"DELETE FROM {tabla} WHERE {CLAVES[tabla]} = ?",
+                                   ((clave,) for clave in claves))
+
+    def _guardar(self, tabla: str, registros: Iterable):
+        self.reemplazar_tablas({tabla: registros})
+
+    def reemplazar_tablas(self, tablas: Dict[str, Iterable]):
+        """Reemplaza por completo las tablas dadas en una sola transacción:
+        o quedan todas con su contenido nuevo o todas con el anterior"""
+        with self._conexion:
+            for tabla, registros in tablas.items():
+                self._conexion.execute(f"DELETE FROM {tabla}")
+                self._insertar(tabla, registros, upsert=False)
+
+    def upsert(self, tabla: str, registros: Iterable):
+        """Inserta o actualiza (por clave primaria) los registros dados"""
+        with self._conexion:
+            self._insertar(tabla, registros, upsert=True)
+
+    def eliminar(self, tabla: str, claves: Iterable[str]):
+        """Elimina los registros con las claves dadas"""
+        with self._conexion:
+            self._eliminar(tabla, claves)
+
+    def registrar_cambios(self, cambios: List[Cambio]):
+        """Aplica los cambios de una operación de ConsultasAcademicas en una transacción"""
+        with self._conexion:
+            for (tabla, operacion), grupo in groupby(cambios, key=lambda c: (c.tabla, c.operacion)):
+                if operacion == GUARDAR:
+                    self._insertar(tabla, (cambio.registro for cambio in grupo), upsert=True)
+                else:
+                    self._eliminar(tabla, (cambio.clave for cambio in grupo))
+
+    # ------------------------------------------------------------------
+    # Interfaz compatible con PersistenciaCSV
+    # ------------------------------------------------------------------
+    def cargar_estudiantes(self) -> List[Estudiante]:
+        return self._cargar('estudiantes')
+
+    def guardar_estudiantes(self, estudiantes: List[Estudiante]):
+        self._guardar('estudiantes', estudiantes)
+
+    def cargar_cursos(self) -> List[Curso]:
+        return self._cargar('cursos')
+
+    def guardar_cursos(self, cursos: List[Curso]):
+        self._guardar('cursos', cursos)
+
+    def cargar_inscripciones(self) -> List[Inscripcion]:
+        return self._cargar('inscripciones')
+
+    def guardar_inscripciones(self, inscripciones: List[Inscripcion]):
+        self._guardar('inscripciones', inscripciones)
+
+    def cargar_matriculas(self) -> List[Matricula]:
+        return self._cargar('matriculas')
+
+    def guardar_matriculas(self, matriculas: List[Matricula]):
+        self._guardar('matriculas', matriculas)
+
+    def cargar_todo(self, procesos: int = 0) -> CargaTablas:
+        """Carga las cuatro tablas a la vez, cada una en su hilo y con su propia
+        conexión (en modo WAL los lectores no se bloquean); `procesos` no aplica"""
+        return cargar_concurrente({tabla: partial(self._cargar_con_conexion_propia, tabla) for tabla in TABLAS})
+
+    def _cargar_con_conexion_propia(self, tabla: str) -> List:
+        # Una conexión sqlite3 no puede usarse desde otro hilo
+        conexion = sqlite3.connect(self.ruta)
+        try:
+            return self._cargar(tabla, conexion)
+        finally:
+            conexion.close()
+
+    def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                      inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str:
+        """Exporta todos los datos a formato JSON (mismo formato que PersistenciaCSV)"""
+        datos = {
+            'estudiantes': [asdict(e) for e in estudiantes],
+            'cursos': [asdict(c) for c in cursos],
+            'inscripciones': [asdict(i) for i in inscripciones],
+            'matriculas': [asdict(m) for m in matriculas]
+        }
+
+        archivo = os.path.join(self.base_path, "export.json")
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+
+        return archivo
+
+
+def claves_repetidas(tabla: str, registros: Iterable) -> List[str]:
+    """Claves que aparecen más de una vez en `registros`, en orden de aparición"""
+    campo = CLAVES[tabla]
+    vistas = set()
+    repetidas = {}
+    for registro in registros:
+        clave = getattr(registro, campo)
+        if clave in vistas:
+            repetidas[clave] = None
+        vistas.add(clave)
+    return list(repetidas)
+
+
+def importar_csv(destino: PersistenciaSQLite, origen: str = "datos") -> Dict[str, int]:
+    """Copia las cuatro tablas de los CSV de `origen` (con su diario, si hay)
+    a la base `destino`, reemplazando su contenido. Retorna las filas por tabla.
+
+    La copia es una sola transacción. Si algún CSV repite claves (versiones
+    anteriores podían generarlas) lanza ValueError con las claves repetidas
+    y la base queda como estaba: elegir cuál registro conservar le toca a
+    quien conoce los datos.
+    """
+    csv_origen = PersistenciaCSV(origen)
+    tablas = {tabla: getattr(csv_origen, f"cargar_{tabla}")() for tabla in TABLAS}
+
+    repetidas = []
+    for tabla, registros in tablas.items():
+        claves = claves_repetidas(tabla, registros)
+        if claves:
+            muestra = ", ".join(claves[:10]) + (f" y {len(claves) - 10} más" if len(claves) > 10 else "")
+            repetidas.append(f"{tabla}: {muestra}")
+    if repetidas:
+        raise ValueError("Claves repetidas en los CSV, no se importó nada (" + "; ".join(repetidas) + ")")
+
+    destino.reemplazar_tablas(tablas)
+    return {tabla: len(registros) for tabla, registros in tablas.items()}
@@ -0,0 +1,159 @@
+# src/reportes.py - Reportes a archivo: fin de periodo por curso e historiales académicos
+import csv
+import hashlib
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from src.estadisticas import EstadisticasCurso, NOTA_APROBATORIA, calcular_estadisticas
+
+# (estudiante_id, nombre completo, nota): filas planas, baratas de enviar a otro proceso
+FilaNota = Tuple[str, str, float]
+
+
+@dataclass
+class ReporteCurso:
+    """Reporte de fin de periodo de un curso"""
+    curso_codigo: str
+    curso_nombre: str
+    estadisticas: Optional[EstadisticasCurso]
+    mejores: List[FilaNota] = field(default_factory=list)
+    reprobados: List[FilaNota] = field(default_factory=list)
+    archivo: Optional[str] = None
+
+
+def generar_reportes_por_curso(consultas, directorio: Optional[str] = "reportes",
+                               procesos: Optional[int] = None, top: int = 3,
+                               nota_minima: float = NOTA_APROBATORIA) -> List[ReporteCurso]:
+    """Genera el reporte de cada curso repartiendo el trabajo en procesos.
+
+    Las matrículas calificadas se particionan por curso (con los índices de
+    `consultas`) en tareas independientes que se reparten en un
+    ProcessPoolExecutor de `procesos` trabajadores (None = núcleos de la
+    máquina; 1 = en este mismo proceso, sin pool). Cada tarea calcula
+    estadísticas, mejores notas y reprobados de su curso y, si hay
+    `directorio`, escribe un archivo por curso. El resultado sale ordenado
+    por código de curso, así que no depende del orden en que terminen.
+    """
+    tareas = []
+    archivos = set()
+    for curso in sorted(consultas.cursos, key=lambda c: c.codigo):
+        filas = []
+        for matricula in consultas.obtener_matriculas_de_curso(curso.codigo):
+            if matricula.nota is None:
+                continue
+            estudiante = consultas.buscar_estudiante_por_id(matricula.estudiante_id)
+            nombre = estudiante.nombre_completo() if estudiante else matricula.estudiante_id
+            filas.append((matricula.estudiante_id, nombre, matricula.nota))
+        archivo = None
+        if directorio:
+            # Los nombres se eligen aquí, antes de repartir: dos tareas nunca
+            # escriben el mismo archivo, ni siquiera con códigos repetidos
+            archivo = _nombre_archivo_reporte(curso.codigo, archivos)
+            archivos.add(archivo)
+            archivo = os.path.join(directorio, archivo)
+        tareas.append((curso.codigo, curso.nombre, filas, top, nota_minima, archivo))
+
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    if procesos == 1 or len(tareas) <= 1:
+        return [_generar_reporte_curso(tarea) for tarea in tareas]
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        # map conserva el orden de las tareas; los lotes ahorran viajes entre
+        # procesos cuando hay muchos cursos pequeños
+        trabajadores = procesos or os.cpu_count() or 1
+        lote = max(1, len(tareas) // (trabajadores * 4))
+        return list(pool.map(_generar_reporte_curso, tareas, chunksize=lote))
+
+
+def _nombre_archivo_reporte(codigo: str, usados: set) -> str:
+    """Nombre de archivo del reporte de un curso, distinto para cada código.
+
+    Los códigos con símbolos que no sirven en un nombre de archivo se
+    reemplazan por '_' y llevan un resumen corto del código original tras un
+    punto (que ningún código limpio contiene), así 'MAT*1' y 'MAT?1' no
+    comparten archivo. Un código repetido recibe un sufijo numérico.
+    """
+    base = re.sub(r'[^A-Za-z0-9_-]', '_', codigo)
+    if base != codigo:
+        base += "." + hashlib.sha1(codigo.encode('utf-8')).hexdigest()[:8]
+    nombre = f"reporte_{base}.txt"
+    repeticion = 1
+    while nombre in usados:
+        repeticion += 1
+        nombre = f"reporte_{base}.{repeticion}.txt"
+    return nombre
+
+
+def _generar_reporte_curso(tarea) -> ReporteCurso:
+    # Función de nivel de módulo para que el pool pueda enviarla a otro proceso
+    codigo, nombre, filas, top, nota_minima, archivo = tarea
+
+    notas = array('d', (nota for _, _, nota in filas))
+    estadisticas = calcular_estadisticas({codigo: notas}, nota_minima).get(codigo)
+    mejores = sorted(filas, key=lambda fila: (-fila[2], fila[0]))[:max(top, 0)]
+    reprobados = sorted((fila for fila in filas if fila[2] < nota_minima),
+                        key=lambda fila: (fila[2], fila[0]))
+
+    reporte = ReporteCurso(codigo, nombre, estadisticas, mejores, reprobados)
+    if archivo:
+        reporte.archivo = _escribir_reporte(reporte, archivo, nota_minima)
+    return reporte
+
+
+def _escribir_reporte(reporte: ReporteCurso, archivo: str, nota_minima: float) -> str:
+    lineas = [f"REPORTE DEL CURSO {reporte.curso_codigo} - {reporte.curso_nombre}", ""]
+    est = reporte.estadisticas
+    if est is None:
+        lineas.append("Sin notas registradas")
+    else:
+        lineas.append(f"Notas: {est.cantidad}  Promedio: {est.promedio:.2f}  Mediana: {est.mediana:.2f}  "
+                      f"Desv.: {est.desviacion:.2f}  Aprobación: {est.tasa_aprobacion * 100:.1f}%")
+        lineas.append("Histograma [0-1,1-2,2-3,3-4,4-5]: " + ", ".join(str(c) for c in est.histograma))
+
+    lineas += ["", "Mejores notas:"]
+    lineas += [f"  {puesto}. {nombre} ({estudiante_id}): {nota:.1f}"
+               for puesto, (estudiante_id, nombre, nota) in enumerate(reporte.mejores, 1)]
+    lineas += ["", f"Reprobados (nota < {nota_minima}): {len(reporte.reprobados)}"]
+    lineas += [f"  {nombre} ({estudiante_id}): {nota:.1f}" for estudiante_id, nombre, nota in reporte.reprobados]
+
+    with open(archivo, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lineas) + "\n")
+    return archivo
+
+
+COLUMNAS_TRANSCRIPT = ['estudiante_id', 'documento', 'nombre', 'curso_codigo', 'curso_nombre', 'creditos',
+                       'inscripcion_id', 'fecha_inscripcion', 'matricula_id', 'fecha_matricula', 'nota',
+                       'estado', 'creditos_inscritos', 'creditos_cursados', 'creditos_aprobados', 'promedio']
+
+
+def exportar_transcripts(consultas, ruta: str, nota_minima: float = NOTA_APROBATORIA) -> int:
+    """Escribe el historial de todos los estudiantes en un CSV (una fila por línea).
+
+    Los historiales se generan y escriben de a uno (consultas.iterar_transcripts),
+    así que la memoria no crece con la cantidad de estudiantes. Retorna la
+    cantidad de estudiantes exportados.
+    """
+    cantidad = 0
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(COLUMNAS_TRANSCRIPT)
+        for historial in consultas.iterar_transcripts(nota_minima):
+            estudiante = historial.estudiante
+            for linea in historial.lineas:
+                writer.writerow([
+                    estudiante.id, estudiante.documento, estudiante.nombre_completo(),
+                    linea.curso_codigo, linea.curso_nombre, linea.creditos,
+                    linea.inscripcion_id or '', linea.fecha_inscripcion or '',
+                    linea.matricula_id or '', linea.fecha_matricula or '',
+                    '' if linea.nota is None else linea.nota, linea.estado,
+                    linea.creditos_inscritos, linea.creditos_cursados, linea.creditos_aprobados,
+                    '' if linea.promedio is None else f"{linea.promedio:.2f}"
+                ])
+            cantidad += 1
+    return cantidad
@@ -2,12 +2,18 @@
 from typing import List 
 from datetime import datetime
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
-from src.validaciones import validar_estudiante_completo, validar_fecha, validar_creditos, validar_nota
+from src.validaciones import (validar_estudiante_completo, validar_fecha, validar_creditos, validar_nota,
+                              LIMITE_CREDITOS_ESTUDIANTE)
 from src.consultas import ConsultasAcademicas
+from src.paginacion import Paginador
+from src.reportes import exportar_transcripts, generar_reportes_por_curso
+from src.estadisticas import exportar_cohortes_csv
 
 class InterfazUsuario:
     """Interfaz de usuario para el sistema MiniSIGA"""
     
+    TAMANO_PAGINA = 20
+    
     def __init__(self, estudiantes: List[Estudiante], cursos: List[Curso], 
                  inscripciones: List[Inscripcion], matriculas: List[Matricula]):
         self.estudiantes = estudiantes
@@ -16,6 +22,17 @@ class InterfazUsuario:
         self.matriculas = matriculas
         self.consultas = ConsultasAcademicas(estudiantes, cursos, inscripciones, matriculas)
     
+    def _mostrar_paginas(self, paginador: Paginador, formatear):
+        """Imprime los resultados de a una página, pidiendo confirmación entre páginas"""
+        while paginador.hay_mas:
+            for elemento in paginador.siguiente_pagina():
+                print(formatear(elemento))
+            
+            if paginador.hay_mas:
+                continuar = input(f"-- {paginador.entregados} mostrados. Enter para ver más, 'q' para salir: ").strip().lower()
+                if continuar == 'q':
+                    break
+    
     def mostrar_menu_principal(self):
         """Muestra el menú principal del sistema"""
         print("\n" + "="*50)
@@ -73,11 +90,20 @@ class InterfazUsuario:
         print("1. Buscar estudiante por documento")
         print("2. Buscar estudiante por correo")
         print("3. Listar estudiantes ordenados por apellido")
-        print("4. Top 3 promedios por curso")
+        print("4. Top promedios por curso")
         print("5. Estudiantes reprobados")
         print("6. Créditos inscritos por estudiante")
         print("7. Dominios de correo únicos")
         print("8. Búsqueda binaria por apellido")
+        print("9. Buscar estudiante por nombre (parcial o aproximado)")
+        print("10. Estadísticas de notas por curso")
+        print("11. Ranking por promedio ponderado")
+        print("12. Generar reportes de fin de periodo por curso")
+        print("13. Aprobación por cohorte de inscripción")
+        print("14. Percentiles de un estudiante")
+        print("15. Historial académico de un estudiante")
+        print("16. Exportar historiales de todos los estudiantes")
+        print("17. Carga por docente")
         print("0. Volver al menú principal")
     
     def crear_estudiante(self):
@@ -100,19 +126,17 @@ class InterfazUsuario:
             return False
         
         # Verificar que el documento no esté duplicado
-        for estudiante in self.estudiantes:
-            if estudiante.documento == datos['documento']:
-                print(f"❌ Error: Ya existe un estudiante con documento {datos['documento']}")
-                return False
+        if self.consultas.buscar_estudiante_por_documento(datos['documento']):
+            print(f"❌ Error: Ya existe un estudiante con documento {datos['documento']}")
+            return False
         
         # Verificar que el correo no esté duplicado
-        for estudiante in self.estudiantes:
-            if estudiante.correo.lower() == datos['correo'].lower():
-                print(f"❌ Error: Ya existe un estudiante con correo {datos['correo']}")
-                return False
+        if self.consultas.buscar_estudiante_por_correo(datos['correo']):
+            print(f"❌ Error: Ya existe un estudiante con correo {datos['correo']}")
+            return False
         
         # Crear estudiante
-        nuevo_id = f"est{len(self.estudiantes)+1:03d}"
+        nuevo_id = self.consultas.siguiente_id('estudiantes', 'est')
         nuevo_estudiante = Estudiante(
             id=nuevo_id,
             documento=datos['documento'],
@@ -122,7 +146,7 @@ class InterfazUsuario:
             fecha_nacimiento=datos['fecha_nacimiento']
         )
         
-        self.estudiantes.append(nuevo_estudiante)
+        self.consultas.agregar_estudiante(nuevo_estudiante)
         print(f"✅ Estudiante creado exitosamente con ID: {nuevo_id}")
         return True
     
@@ -193,21 +217,24 @@ class InterfazUsuario:
                 return False
             
             # Verificar duplicados (excluyendo el estudiante actual)
-            for estudiante in self.estudiantes:
-                if estudiante.id != estudiante_a_editar.id:
-                    if estudiante.documento == nuevo_documento:
-                        print(f"❌ Error")
-                        return False
-                    if estudiante.correo.lower() == nuevo_correo.lower():
-                        print(f"❌ Error")
-                        return False
+            otro = self.consultas.buscar_estudiante_por_documento(nuevo_documento)
+            if otro and otro.id != estudiante_a_editar.id:
+                print(f"❌ Error: Ya existe un estudiante con documento {nuevo_documento}")
+                return False
+            otro = self.consultas.buscar_estudiante_por_correo(nuevo_correo)
+            if otro and otro.id != estudiante_a_editar.id:
+                print(f"❌ Error: Ya existe un estudiante con correo {nuevo_correo}")
+                return False
             
             # Actualizar estudiante
-            estudiante_a_editar.documento = nuevo_documento
-            estudiante_a_editar.nombres = nuevos_nombres
-            estudiante_a_editar.apellidos = nuevos_apellidos
-            estudiante_a_editar.correo = nuevo_correo
-            estudiante_a_editar.fecha_nacimiento = nueva_fecha
+            self.consultas.actualizar_estudiante(
+                estudiante_a_editar,
+                documento=nuevo_documento,
+                nombres=nuevos_nombres,
+                apellidos=nuevos_apellidos,
+                correo=nuevo_correo,
+                fecha_nacimiento=nueva_fecha
+            )
             
             print("✅ Estudiante actualizado exitosamente")
             return True
@@ -238,8 +265,10 @@ class InterfazUsuario:
             estudiante_a_eliminar = self.estudiantes[indice]
             
             # Verificar si tiene inscripciones o matrículas
-            tiene_inscripciones = any(i.estudiante_id == estudiante_a_eliminar.id for i in self.inscripciones)
-            tiene_matriculas = any(m.estudiante_id == estudiante_a_eliminar.id for m in self.matriculas)
+            inscripciones_asociadas = self.consultas.obtener_inscripciones_de_estudiante(estudiante_a_eliminar.id)
+            matriculas_asociadas = self.consultas.obtener_matriculas_de_estudiante(estudiante_a_eliminar.id)
+            tiene_inscripciones = bool(inscripciones_asociadas)
+            tiene_matriculas = bool(matriculas_asociadas)
             
             if tiene_inscripciones or tiene_matriculas:
                 print(f"⚠️  ADVERTENCIA: El estudiante {estudiante_a_eliminar.nombre_completo()} tiene registros asociados:")
@@ -254,13 +283,13 @@ class InterfazUsuario:
                     return False
                 
                 # Eliminar inscripciones asociadas
-                self.inscripciones = [i for i in self.inscripciones if i.estudiante_id != estudiante_a_eliminar.id]
+                self.consultas.eliminar_inscripciones(inscripciones_asociadas)
                 
                 # Eliminar matrículas asociadas
-                self.matriculas = [m for m in self.matriculas if m.estudiante_id != estudiante_a_eliminar.id]
+                self.consultas.eliminar_matriculas(matriculas_asociadas)
             
             # Eliminar estudiante
-            self.estudiantes.remove(estudiante_a_eliminar)
+            self.consultas.eliminar_estudiante(estudiante_a_eliminar)
             print(f"✅ Estudiante {estudiante_a_eliminar.nombre_completo()} eliminado exitosamente")
             return True
             
@@ -278,8 +307,10 @@ class InterfazUsuario:
         print(f"{'ID':<10} {'Documento':<12} {'Nombres':<20} {'Apellidos':<20} {'Correo':<25} {'fecha_nacimiento':<40}")
         print("-" * 140)
         
-        for estudiante in self.estudiantes:
-            print(f"{estudiante.id:<10} {estudiante.documento:<12} {estudiante.nombres:<20} {estudiante.apellidos:<20} {estudiante.correo:<25} {estudiante.fecha_nacimiento:<1}")
+        self._mostrar_paginas(
+            Paginador(self.estudiantes, self.TAMANO_PAGINA),
+            lambda estudiante: f"{estudiante.id:<10} {estudiante.documento:<12} {estudiante.nombres:<20} {estudiante.apellidos:<20} {estudiante.correo:<25} {estudiante.fecha_nacimiento:<1}"
+        )
     
     def crear_curso(self):
         """Interfaz para crear un nuevo curso"""
@@ -306,10 +337,9 @@ class InterfazUsuario:
             return False
         
         # Verificar que el código no esté duplicado
-        for curso in self.cursos:
-            if curso.codigo == codigo:
-                print(f"❌ Error: Ya existe un curso con código {codigo}")
-                return False
+        if self.consultas.buscar_curso_por_codigo(codigo):
+            print(f"❌ Error: Ya existe un curso con código {codigo}")
+            return False
         
         # Crear curso
         nuevo_curso = Curso(
@@ -319,7 +349,7 @@ class InterfazUsuario:
             docente=docente
         )
         
-        self.cursos.append(nuevo_curso)
+        self.consultas.agregar_curso(nuevo_curso)
         print(f"✅ Curso creado exitosamente con código: {codigo}")
         return True
     
@@ -379,26 +409,19 @@ class InterfazUsuario:
                 nuevo_docente = curso_a_editar.docente
             
             # Verificar duplicado de código (excluyendo el curso actual)
-            for curso in self.cursos:
-                if curso.codigo != curso_a_editar.codigo and curso.codigo == nuevo_codigo:
-                    print(f"❌ Error: Ya existe otro curso con código {nuevo_codigo}")
-                    return False
+            if nuevo_codigo != curso_a_editar.codigo and self.consultas.buscar_curso_por_codigo(nuevo_codigo):
+                print(f"❌ Error: Ya existe otro curso con código {nuevo_codigo}")
+                return False
             
             # Actualizar curso
-            # Si cambia el código, también actualizar referencias en inscripciones y matrículas
-            if nuevo_codigo != curso_a_editar.codigo:
-                for inscripcion in self.inscripciones:
-                    if inscripcion.curso_codigo == curso_a_editar.codigo:
-                        inscripcion.curso_codigo = nuevo_codigo
-                
-                for matricula in self.matriculas:
-                    if matricula.curso_codigo == curso_a_editar.codigo:
-                        matricula.curso_codigo = nuevo_codigo
-            
-            curso_a_editar.codigo = nuevo_codigo
-            curso_a_editar.nombre = nuevo_nombre
-            curso_a_editar.creditos = nuevos_creditos
-            curso_a_editar.docente = nuevo_docente
+            # Si cambia el código, también se actualizan las referencias en inscripciones y matrículas
+            self.consultas.actualizar_curso(
+                curso_a_editar,
+                codigo=nuevo_codigo,
+                nombre=nuevo_nombre,
+                creditos=nuevos_creditos,
+                docente=nuevo_docente
+            )
             
             print("✅ Curso actualizado exitosamente")
             return True
@@ -429,8 +452,10 @@ class InterfazUsuario:
             curso_a_eliminar = self.cursos[indice]
             
             # Verificar si tiene inscripciones o matrículas
-            tiene_inscripciones = any(i.curso_codigo == curso_a_eliminar.codigo for i in self.inscripciones)
-            tiene_matriculas = any(m.curso_codigo == curso_a_eliminar.codigo for m in self.matriculas)
+            inscripciones_asociadas = self.consultas.obtener_inscripciones_de_curso(curso_a_eliminar.codigo)
+            matriculas_asociadas = self.consultas.obtener_matriculas_de_curso(curso_a_eliminar.codigo)
+            tiene_inscripciones = bool(inscripciones_asociadas)
+            tiene_matriculas = bool(matriculas_asociadas)
             
             if tiene_inscripciones or tiene_matriculas:
                 print(f"⚠️  ADVERTENCIA: El curso {curso_a_eliminar.nombre} tiene registros asociados:")
@@ -445,13 +470,13 @@ class InterfazUsuario:
                     return False
                 
                 # Eliminar inscripciones asociadas
-                self.inscripciones = [i for i in self.inscripciones if i.curso_codigo != curso_a_eliminar.codigo]
+                self.consultas.eliminar_inscripciones(inscripciones_asociadas)
                 
                 # Eliminar matrículas asociadas
-                self.matriculas = [m for m in self.matriculas if m.curso_codigo != curso_a_eliminar.codigo]
+                self.consultas.eliminar_matriculas(matriculas_asociadas)
             
             # Eliminar curso
-            self.cursos.remove(curso_a_eliminar)
+            self.consultas.eliminar_curso(curso_a_eliminar)
             print(f"✅ Curso {curso_a_eliminar.nombre} eliminado exitosamente")
             return True
             
@@ -469,8 +494,10 @@ class InterfazUsuario:
         print(f"{'Código':<10} {'Nombre':<30} {'Créditos':<10} {'Docente':<25}")
         print("-" * 75)
         
-        for curso in self.cursos:
-            print(f"{curso.codigo:<10} {curso.nombre:<30} {curso.creditos:<10} {curso.docente:<25}")
+        self._mostrar_paginas(
+            Paginador(self.cursos, self.TAMANO_PAGINA),
+            lambda curso: f"{curso.codigo:<10} {curso.nombre:<30} {curso.creditos:<10} {curso.docente:<25}"
+        )
     
     def crear_inscripcion(self):
         """Interfaz para crear una nueva inscripción"""
@@ -515,21 +542,27 @@ class InterfazUsuario:
             return False
         
         # Verificar que no esté ya inscrito
-        for inscripcion in self.inscripciones:
-            if (inscripcion.estudiante_id == estudiante_seleccionado.id and 
-                inscripcion.curso_codigo == curso_seleccionado.codigo):
-                print(f"❌ Error: El estudiante ya está inscrito en el curso {curso_seleccionado.codigo}")
-                return False
+        if self.consultas.buscar_inscripcion_de_estudiante_en_curso(estudiante_seleccionado.id,
+                                                                    curso_seleccionado.codigo):
+            print(f"❌ Error: El estudiante ya está inscrito en el curso {curso_seleccionado.codigo}")
+            return False
+        
+        # Verificar el límite de créditos del estudiante
+        if self.consultas.supera_limite_creditos(estudiante_seleccionado.id, curso_seleccionado.codigo):
+            creditos_actuales = self.consultas.obtener_creditos_inscritos_por_estudiante(estudiante_seleccionado.id)
+            print(f"❌ Error: El estudiante tiene {creditos_actuales} créditos inscritos y el curso "
+                  f"suma {curso_seleccionado.creditos}; el máximo es {LIMITE_CREDITOS_ESTUDIANTE}")
+            return False
         
         # Crear inscripción
         nueva_inscripcion = Inscripcion(
-            id=f"ins{len(self.inscripciones)+1:03d}",
+            id=self.consultas.siguiente_id('inscripciones', 'ins'),
             estudiante_id=estudiante_seleccionado.id,
             curso_codigo=curso_seleccionado.codigo,
             fecha_inscripcion=datetime.now().strftime('%Y-%m-%d')
         )
         
-        self.inscripciones.append(nueva_inscripcion)
+        self.consultas.agregar_inscripcion(nueva_inscripcion)
         print(f"✅ Inscripción creada exitosamente. ID: {nueva_inscripcion.id}")
         print(f"   Estudiante: {estudiante_seleccionado.nombre_completo()}")
         print(f"   Curso: {curso_seleccionado.nombre}")
@@ -563,8 +596,7 @@ class InterfazUsuario:
             inscripcion_a_editar = self.inscripciones[indice]
             
             # Verificar si ya tiene matrícula asociada
-            tiene_matricula = any(m.inscripcion_id == inscripcion_a_editar.id for m in self.matriculas)
-            if tiene_matricula:
+            if self.consultas.inscripcion_tiene_matricula(inscripcion_a_editar.id):
                 print("⚠️  Esta inscripción ya tiene una matrícula asociada.")
                 print("Solo se puede modificar la fecha de inscripción.")
                 
@@ -576,7 +608,7 @@ class InterfazUsuario:
                     return False
                 
                 if nueva_fecha:
-                    inscripcion_a_editar.fecha_inscripcion = nueva_fecha
+                    self.consultas.actualizar_inscripcion(inscripcion_a_editar, fecha_inscripcion=nueva_fecha)
                     print("✅ Fecha de inscripción actualizada")
                 else:
                     print("No se realizaron cambios")
@@ -628,12 +660,16 @@ class InterfazUsuario:
             if (nuevo_estudiante_id != inscripcion_a_editar.estudiante_id or 
                 nuevo_curso_codigo != inscripcion_a_editar.curso_codigo):
                 
-                for inscripcion in self.inscripciones:
-                    if (inscripcion.id != inscripcion_a_editar.id and
-                        inscripcion.estudiante_id == nuevo_estudiante_id and 
-                        inscripcion.curso_codigo == nuevo_curso_codigo):
-                        print("❌ Error: Ya existe una inscripción con esta combinación")
-                        return False
+                existente = self.consultas.buscar_inscripcion_de_estudiante_en_curso(nuevo_estudiante_id,
+                                                                                     nuevo_curso_codigo)
+                if existente and existente.id != inscripcion_a_editar.id:
+                    print("❌ Error: Ya existe una inscripción con esta combinación")
+                    return False
+                
+                if self.consultas.supera_limite_creditos(nuevo_estudiante_id, nuevo_curso_codigo,
+                                                         reemplaza=inscripcion_a_editar):
+                    print(f"❌ Error: El estudiante superaría el máximo de {LIMITE_CREDITOS_ESTUDIANTE} créditos")
+                    return False
             
             # Cambiar fecha
             print(f"\n3. Fecha actual: {inscripcion_a_editar.fecha_inscripcion}")
@@ -643,10 +679,12 @@ class InterfazUsuario:
                 return False
             
             # Aplicar cambios
-            inscripcion_a_editar.estudiante_id = nuevo_estudiante_id
-            inscripcion_a_editar.curso_codigo = nuevo_curso_codigo
-            if nueva_fecha:
-                inscripcion_a_editar.fecha_inscripcion = nueva_fecha
+            self.consultas.actualizar_inscripcion(
+                inscripcion_a_editar,
+                estudiante_id=nuevo_estudiante_id,
+                curso_codigo=nuevo_curso_codigo,
+                fecha_inscripcion=nueva_fecha or inscripcion_a_editar.fecha_inscripcion
+            )
             
             print("✅ Inscripción actualizada exitosamente")
             return True
@@ -673,7 +711,7 @@ class InterfazUsuario:
             nombre_curso = curso.nombre if curso else "N/A"
             
             # Verificar si tiene matrícula
-            tiene_matricula = any(m.inscripcion_id == inscripcion.id for m in self.matriculas)
+            tiene_matricula = self.consultas.inscripcion_tiene_matricula(inscripcion.id)
             estado = " [CON MATRÍCULA]" if tiene_matricula else ""
             
             print(f"{i}. {inscripcion.id} - {nombre_estudiante} en {nombre_curso}{estado}")
@@ -687,7 +725,7 @@ class InterfazUsuario:
             inscripcion_a_eliminar = self.inscripciones[indice]
             
             # Verificar si tiene matrícula asociada
-            matriculas_asociadas = [m for m in self.matriculas if m.inscripcion_id == inscripcion_a_eliminar.id]
+            matriculas_asociadas = self.consultas.obtener_matriculas_de_inscripcion(inscripcion_a_eliminar.id)
             
             if matriculas_asociadas:
                 print(f"⚠️  ADVERTENCIA: Esta inscripción tiene {len(matriculas_asociadas)} matrícula(s) asociada(s)")
@@ -697,11 +735,11 @@ class InterfazUsuario:
                     return False
                 
                 # Eliminar matrículas asociadas
-                self.matriculas = [m for m in self.matriculas if m.inscripcion_id != inscripcion_a_eliminar.id]
+                self.consultas.eliminar_matriculas(matriculas_asociadas)
                 print(f"  • {len(matriculas_asociadas)} matrícula(s) eliminada(s)")
             
             # Eliminar inscripción
-            self.inscripciones.remove(inscripcion_a_eliminar)
+            self.consultas.eliminar_inscripciones([inscripcion_a_eliminar])
             
             estudiante = self.consultas.buscar_estudiante_por_id(inscripcion_a_eliminar.estudiante_id)
             curso = self.consultas.buscar_curso_por_codigo(inscripcion_a_eliminar.curso_codigo)
@@ -727,7 +765,7 @@ class InterfazUsuario:
         print(f"{'ID':<10} {'Estudiante':<25} {'Curso':<15} {'Fecha':<12} {'Estado':<12}")
         print("-" * 74)
         
-        for inscripcion in self.inscripciones:
+        def formatear(inscripcion):
             estudiante = self.consultas.buscar_estudiante_por_id(inscripcion.estudiante_id)
             curso = self.consultas.buscar_curso_por_codigo(inscripcion.curso_codigo)
             
@@ -735,25 +773,29 @@ class InterfazUsuario:
             codigo_curso = curso.codigo if curso else "N/A"
             
             # Verificar si ya tiene matrícula
-            tiene_matricula = any(m.inscripcion_id == inscripcion.id for m in self.matriculas)
+            tiene_matricula = self.consultas.inscripcion_tiene_matricula(inscripcion.id)
             estado = "Matriculado" if tiene_matricula else "Pendiente"
             
-            print(f"{inscripcion.id:<10} {nombre_estudiante:<25} {codigo_curso:<15} {inscripcion.fecha_inscripcion:<12} {estado:<12}")
+            return f"{inscripcion.id:<10} {nombre_estudiante:<25} {codigo_curso:<15} {inscripcion.fecha_inscripcion:<12} {estado:<12}"
+        
+        self._mostrar_paginas(Paginador(self.inscripciones, self.TAMANO_PAGINA), formatear)
     
     def ver_inscripciones_pendientes(self):
         """Muestra inscripciones pendientes de convertir en matrícula"""
-        pendientes = self.consultas.obtener_inscripciones_sin_matricular()
+        paginador = Paginador(self.consultas.iterar_inscripciones_sin_matricular(), self.TAMANO_PAGINA)
         
-        if not pendientes:
+        if not paginador.hay_mas:
             print("✅ No hay inscripciones pendientes de matrícula.")
             return
         
-        print(f"\n--- INSCRIPCIONES PENDIENTES DE MATRÍCULA ({len(pendientes)}) ---")
+        print("\n--- INSCRIPCIONES PENDIENTES DE MATRÍCULA ---")
         print(f"{'ID':<10} {'Estudiante':<25} {'Curso':<15} {'Fecha':<12}")
         print("-" * 62)
         
-        for inscripcion, estudiante, curso in pendientes:
-            print(f"{inscripcion.id:<10} {estudiante.nombre_completo():<25} {curso.codigo:<15} {inscripcion.fecha_inscripcion:<12}")
+        self._mostrar_paginas(
+            paginador,
+            lambda fila: f"{fila[0].id:<10} {fila[1].nombre_completo():<25} {fila[2].codigo:<15} {fila[0].fecha_inscripcion:<12}"
+        )
     
     def crear_matricula(self):
         """Interfaz para crear matrícula desde inscripción"""
@@ -781,10 +823,10 @@ class InterfazUsuario:
             # Crear matrícula desde inscripción
             nueva_matricula = Matricula.from_inscripcion(
                 inscripcion_seleccionada, 
-                f"mat{len(self.matriculas)+1:03d}"
+                self.consultas.siguiente_id('matriculas', 'mat')
             )
             
-            self.matriculas.append(nueva_matricula)
+            self.consultas.agregar_matricula(nueva_matricula)
             print(f"✅ Matrícula creada exitosamente. ID: {nueva_matricula.id}")
             print(f"   Estudiante: {estudiante.nombre_completo()}")
             print(f"   Curso: {curso.nombre}")
@@ -829,7 +871,7 @@ class InterfazUsuario:
                 print("❌ Error: La nota debe estar entre 0.0 y 5.0")
                 return False
             
-            matricula_seleccionada.nota = nota
+            self.consultas.asignar_nota(matricula_seleccionada, nota)
             print(f"✅ Nota asignada exitosamente: {nota}")
             return True
             
@@ -886,7 +928,7 @@ class InterfazUsuario:
                 return False
             
             # Eliminar matrícula
-            self.matriculas.remove(matricula_a_eliminar)
+            self.consultas.eliminar_matriculas([matricula_a_eliminar])
             print(f"✅ Matrícula {matricula_a_eliminar.id} eliminada exitosamente")
             return True
             
@@ -904,7 +946,7 @@ class InterfazUsuario:
         print(f"{'ID':<10} {'Inscr.ID':<10} {'Estudiante':<25} {'Curso':<15} {'Fecha':<12} {'Nota':<6}")
         print("-" * 88)
         
-        for matricula in self.matriculas:
+        def formatear(matricula):
             estudiante = self.consultas.buscar_estudiante_por_id(matricula.estudiante_id)
             curso = self.consultas.buscar_curso_por_codigo(matricula.curso_codigo)
             
@@ -912,7 +954,9 @@ class InterfazUsuario:
             codigo_curso = curso.codigo if curso else "N/A"
             nota_str = f"{matricula.nota:.1f}" if matricula.nota is not None else "---"
             
-            print(f"{matricula.id:<10} {matricula.inscripcion_id:<10} {nombre_estudiante:<25} {codigo_curso:<15} {matricula.fecha_matricula:<12} {nota_str:<6}")
+            return f"{matricula.id:<10} {matricula.inscripcion_id:<10} {nombre_estudiante:<25} {codigo_curso:<15} {matricula.fecha_matricula:<12} {nota_str:<6}"
+        
+        self._mostrar_paginas(Paginador(self.matriculas, self.TAMANO_PAGINA), formatear)
     
     # Métodos de consultas (mantienen la misma funcionalidad)
     def ejecutar_consulta_buscar_documento(self):
@@ -947,21 +991,21 @@ class InterfazUsuario:
     
     def ejecutar_consulta_ordenados_apellido(self):
         """Ejecuta consulta de estudiantes ordenados por apellido"""
-        estudiantes_ordenados = self.consultas.listar_estudiantes_ordenados_por_apellido()
-        
-        if not estudiantes_ordenados:
+        if not self.estudiantes:
             print("No hay estudiantes registrados.")
             return
         
-        print(f"\n--- ESTUDIANTES ORDENADOS POR APELLIDO ({len(estudiantes_ordenados)}) ---")
+        print(f"\n--- ESTUDIANTES ORDENADOS POR APELLIDO ({len(self.estudiantes)}) ---")
         print(f"{'Apellidos':<20} {'Nombres':<20} {'Documento':<12} {'Correo':<25}")
         print("-" * 77)
         
-        for estudiante in estudiantes_ordenados:
-            print(f"{estudiante.apellidos:<20} {estudiante.nombres:<20} {estudiante.documento:<12} {estudiante.correo:<25}")
+        self._mostrar_paginas(
+            Paginador(self.consultas.iterar_estudiantes_ordenados_por_apellido(), self.TAMANO_PAGINA),
+            lambda estudiante: f"{estudiante.apellidos:<20} {estudiante.nombres:<20} {estudiante.documento:<12} {estudiante.correo:<25}"
+        )
     
     def ejecutar_consulta_top_promedios(self):
-        """Ejecuta consulta de top 3 promedios por curso"""
+        """Ejecuta consulta de top promedios por curso"""
         if not self.cursos:
             print("No hay cursos registrados.")
             return
@@ -977,13 +1021,20 @@ class InterfazUsuario:
                 return
             
             curso_seleccionado = self.cursos[indice]
-            top_estudiantes = self.consultas.obtener_top_promedios_por_curso(curso_seleccionado.codigo)
+            
+            top_str = input("Cantidad de estudiantes a mostrar (Enter = 3): ").strip()
+            top = int(top_str) if top_str else 3
+            if top <= 0:
+                print("❌ Error: La cantidad debe ser un número positivo")
+                return
+            
+            top_estudiantes = self.consultas.obtener_top_promedios_por_curso(curso_seleccionado.codigo, top)
             
             if not top_estudiantes:
                 print(f"No hay notas registradas para el curso {curso_seleccionado.codigo}")
                 return
             
-            print(f"\n--- TOP 3 PROMEDIOS - {curso_seleccionado.nombre} ---")
+            print(f"\n--- TOP {top} PROMEDIOS - {curso_seleccionado.nombre} ---")
             print(f"{'Posición':<10} {'Estudiante':<25} {'Nota':<6}")
             print("-" * 41)
             
@@ -995,18 +1046,20 @@ class InterfazUsuario:
     
     def ejecutar_consulta_reprobados(self):
         """Ejecuta consulta de estudiantes reprobados"""
-        reprobados = self.consultas.obtener_reprobados()
+        paginador = Paginador(self.consultas.iterar_reprobados(), self.TAMANO_PAGINA)
         
-        if not reprobados:
+        if not paginador.hay_mas:
             print("No hay estudiantes reprobados (nota < 3.0)")
             return
         
-        print(f"\n--- ESTUDIANTES REPROBADOS ({len(reprobados)}) ---")
+        print("\n--- ESTUDIANTES REPROBADOS ---")
         print(f"{'Estudiante':<25} {'Curso':<15} {'Nota':<6}")
         print("-" * 46)
         
-        for estudiante, curso, nota in reprobados:
-            print(f"{estudiante.nombre_completo():<25} {curso.codigo:<15} {nota:.1f}")
+        self._mostrar_paginas(
+            paginador,
+            lambda fila: f"{fila[0].nombre_completo():<25} {fila[1].codigo:<15} {fila[2]:.1f}"
+        )
     
     def ejecutar_consulta_creditos_estudiante(self):
         """Ejecuta consulta de créditos inscritos por estudiante"""
@@ -1036,27 +1089,227 @@ class InterfazUsuario:
     
     def ejecutar_consulta_dominios_correo(self):
         """Ejecuta consulta de dominios de correo únicos"""
-        dominios = self.consultas.obtener_dominios_correo_unicos()
+        dominios = self.consultas.obtener_conteo_dominios()
         
         if not dominios:
             print("No hay dominios de correo registrados.")
             return
         
         print(f"\n--- DOMINIOS DE CORREO ÚNICOS ({len(dominios)}) ---")
-        for i, dominio in enumerate(dominios, 1):
-            print(f"{i}. {dominio}")
+        for i, (dominio, cantidad) in enumerate(dominios, 1):
+            print(f"{i}. {dominio} ({cantidad} estudiante{'s' if cantidad != 1 else ''})")
     
     def ejecutar_busqueda_binaria_apellido(self):
         """Ejecuta búsqueda binaria por apellido"""
         apellido = input("Ingrese apellido a buscar: ").strip()
-        estudiante = self.consultas.buscar_binario_estudiante(apellido)
-        
-        if estudiante:
-            print(f"\n✅ Estudiante encontrado (búsqueda binaria):")
-            print(f"   ID: {estudiante.id}")
-            print(f"   Documento: {estudiante.documento}")
-            print(f"   Nombre: {estudiante.nombre_completo()}")
-            print(f"   Correo: {estudiante.correo}")
-            print(f"   Fecha nacimiento: {estudiante.fecha_nacimiento}")
+        estudiantes = self.consultas.buscar_binario_estudiante(apellido)
+        
+        if estudiantes:
+            print(f"\n✅ {len(estudiantes)} estudiante(s) encontrado(s) (búsqueda binaria):")
+            for estudiante in estudiantes:
+                print(f"\n   ID: {estudiante.id}")
+                print(f"   Documento: {estudiante.documento}")
+                print(f"   Nombre: {estudiante.nombre_completo()}")
+                print(f"   Correo: {estudiante.correo}")
+                print(f"   Fecha nacimiento: {estudiante.fecha_nacimiento}")
         else:
-            print(f"❌ No se encontró estudiante con apellido {apellido}")
\ No newline at end of file
+            print(f"❌ No se encontró estudiante con apellido {apellido}")
+    
+    def ejecutar_consulta_buscar_nombre(self):
+        """Ejecuta búsqueda por nombre parcial o aproximado"""
+        texto = input("Ingrese nombre o apellido (puede ser parcial): ").strip()
+        if not texto:
+            print("❌ Error: Debe ingresar un texto a buscar")
+            return
+        
+        resultados = self.consultas.buscar_estudiantes_por_nombre(texto)
+        
+        if not resultados:
+            print(f"❌ No se encontraron estudiantes para '{texto}'")
+            return
+        
+        print(f"\n--- RESULTADOS PARA '{texto}' ({len(resultados)}) ---")
+        print(f"{'ID':<10} {'Nombre':<35} {'Documento':<12} {'Relevancia':<10}")
+        print("-" * 70)
+        
+        for estudiante, puntaje in resultados:
+            print(f"{estudiante.id:<10} {estudiante.nombre_completo():<35} {estudiante.documento:<12} {puntaje:.2f}")
+    
+    def ejecutar_consulta_estadisticas_cursos(self):
+        """Ejecuta consulta de estadísticas de notas por curso"""
+        estadisticas = self.consultas.obtener_estadisticas_cursos()
+        
+        if not estadisticas:
+            print("No hay notas registradas.")
+            return
+        
+        print(f"\n--- ESTADÍSTICAS DE NOTAS POR CURSO ({len(estadisticas)}) ---")
+        print(f"{'Curso':<10} {'N':<6} {'Promedio':<9} {'Mediana':<8} {'Desv.':<6} {'% Aprob.':<9} {'Histograma [0-1,1-2,2-3,3-4,4-5]':<30}")
+        print("-" * 82)
+        
+        for codigo, est in estadisticas.items():
+            histograma = ", ".join(str(c) for c in est.histograma)
+            print(f"{codigo:<10} {est.cantidad:<6} {est.promedio:<9.2f} {est.mediana:<8.2f} {est.desviacion:<6.2f} {est.tasa_aprobacion * 100:<9.1f} [{histograma}]")
+    
+    def ejecutar_consulta_ranking_promedios(self):
+        """Ejecuta consulta del ranking por promedio ponderado por créditos"""
+        try:
+            cantidad_str = input("Cantidad de estudiantes a mostrar (Enter = 10): ").strip()
+            cantidad = int(cantidad_str) if cantidad_str else 10
+        except ValueError:
+            print("❌ Error: Debe ingresar un número válido")
+            return
+        
+        if cantidad <= 0:
+            print("❌ Error: La cantidad debe ser un número positivo")
+            return
+        
+        ranking = self.consultas.obtener_promedios_ponderados()
+        
+        if not ranking:
+            print("No hay notas registradas.")
+            return
+        
+        print(f"\n--- RANKING POR PROMEDIO PONDERADO ({min(cantidad, len(ranking))} de {len(ranking)}) ---")
+        print(f"{'Puesto':<8} {'Estudiante':<30} {'Promedio':<9} {'Cr. cursados':<13} {'Cr. aprobados':<13}")
+        print("-" * 77)
+        
+        for promedio in ranking[:cantidad]:
+            estudiante = self.consultas.buscar_estudiante_por_id(promedio.estudiante_id)
+            nombre = estudiante.nombre_completo() if estudiante else promedio.estudiante_id
+            print(f"{promedio.puesto:<8} {nombre:<30} {promedio.promedio:<9.2f} {promedio.creditos_cursados:<13} {promedio.creditos_aprobados:<13}")
+    
+    def ejecutar_reportes_por_curso(self):
+        """Genera un archivo de reporte por curso usando varios procesos"""
+        directorio = input("Directorio de salida (Enter = reportes): ").strip() or "reportes"
+        try:
+            procesos_str = input("Procesos a usar (Enter = todos los núcleos): ").strip()
+            procesos = int(procesos_str) if procesos_str else None
+        except ValueError:
+            print("❌ Error: Debe ingresar un número válido")
+            return
+        
+        if procesos is not None and procesos <= 0:
+            print("❌ Error: La cantidad de procesos debe ser positiva")
+            return
+        
+        try:
+            reportes = generar_reportes_por_curso(self.consultas, directorio, procesos)
+        except OSError as e:
+            print(f"❌ Error al escribir los reportes: {e}")
+            return
+        
+        if not reportes:
+            print("No hay cursos registrados.")
+            return
+        
+        print(f"\n--- REPORTES GENERADOS ({len(reportes)}) ---")
+        for reporte in reportes:
+            cantidad = reporte.estadisticas.cantidad if reporte.estadisticas else 0
+            print(f"{reporte.curso_codigo:<10} {cantidad:<6} notas -> {reporte.archivo}")
+    
+    def ejecutar_consulta_cohortes(self):
+        """Ejecuta el análisis de aprobación por curso y periodo de inscripción"""
+        opcion = input("Agrupar por (1) mes o (2) semestre [Enter = mes]: ").strip()
+        if opcion not in ("", "1", "2"):
+            print("❌ Error: Opción no válida")
+            return
+        periodo = 'semestre' if opcion == "2" else 'mes'
+        
+        cohortes = self.consultas.obtener_cohortes(periodo)
+        
+        if not cohortes:
+            print("No hay matrículas con fecha de inscripción válida.")
+            return
+        
+        print(f"\n--- APROBACIÓN POR COHORTE ({periodo.upper()}) ---")
+        print(f"{'Curso':<10} {'Periodo':<9} {'Matr.':<6} {'Calif.':<7} {'% Aprob.':<9} {'Promedio':<9}")
+        print("-" * 52)
+        for periodos in cohortes.values():
+            for cohorte in periodos.values():
+                print(f"{cohorte.curso_codigo:<10} {cohorte.periodo:<9} {cohorte.cantidad:<6} {cohorte.calificadas:<7} "
+                      f"{cohorte.tasa_aprobacion * 100:<9.1f} {cohorte.promedio:<9.2f}")
+        
+        ruta = input("\nArchivo CSV para exportar (Enter = no exportar): ").strip()
+        if ruta:
+            try:
+                exportar_cohortes_csv(cohortes, ruta)
+                print(f"✅ Cohortes exportadas a: {ruta}")
+            except OSError as e:
+                print(f"❌ Error al exportar: {e}")
+    
+    def ejecutar_consulta_percentiles(self):
+        """Ejecuta consulta de percentiles de un estudiante por curso y en la institución"""
+        documento = input("Documento del estudiante: ").strip()
+        estudiante = self.consultas.buscar_estudiante_por_documento(documento)
+        
+        if not estudiante:
+            print("❌ Estudiante no encontrado")
+            return
+        
+        por_curso, general = self.consultas.obtener_percentiles_de_estudiante(estudiante.id)
+        
+        print(f"\n--- PERCENTILES DE {estudiante.nombre_completo()} ---")
+        if not por_curso:
+            print("El estudiante no tiene notas registradas.")
+            return
+        
+        print(f"{'Curso':<10} {'Nota':<6} {'Puesto':<8} {'Percentil':<9}")
+        print("-" * 36)
+        for codigo, (nota, puesto, percentil) in sorted(por_curso.items()):
+            print(f"{codigo:<10} {nota:<6.1f} {puesto:<8} {percentil:<9.1f}")
+        
+        if general:
+            promedio, puesto, percentil = general
+            print(f"\nPromedio ponderado: {promedio:.2f} - puesto {puesto} - percentil {percentil:.1f}")
+    
+    def ejecutar_consulta_transcript(self):
+        """Muestra el historial académico completo de un estudiante"""
+        documento = input("Documento del estudiante: ").strip()
+        estudiante = self.consultas.buscar_estudiante_por_documento(documento)
+        
+        if not estudiante:
+            print("❌ Estudiante no encontrado")
+            return
+        
+        historial = self.consultas.transcript(estudiante.id)
+        
+        print(f"\n--- HISTORIAL ACADÉMICO: {estudiante.nombre_completo()} ({estudiante.documento}) ---")
+        if not historial.lineas:
+            print("El estudiante no tiene inscripciones ni matrículas.")
+            return
+        
+        print(f"{'Fecha':<12} {'Curso':<10} {'Nombre':<25} {'Cr.':<4} {'Nota':<6} {'Estado':<12} {'Cr. aprob.':<11} {'Promedio':<8}")
+        print("-" * 94)
+        for linea in historial.lineas:
+            fecha = linea.fecha_inscripcion or linea.fecha_matricula or ""
+            nota = f"{linea.nota:.1f}" if linea.nota is not None else "-"
+            promedio = f"{linea.promedio:.2f}" if linea.promedio is not None else "-"
+            print(f"{fecha:<12} {linea.curso_codigo:<10} {linea.curso_nombre[:25]:<25} {linea.creditos:<4} {nota:<6} {linea.estado:<12} {linea.creditos_aprobados:<11} {promedio:<8}")
+        
+        promedio = f"{historial.promedio:.2f}" if historial.promedio is not None else "-"
+        print(f"\nCréditos inscritos: {historial.creditos_inscritos}  Aprobados: {historial.creditos_aprobados}  Promedio: {promedio}")
+    
+    def ejecutar_exportar_transcripts(self):
+        """Exporta a CSV el historial de todos los estudiantes"""
+        ruta = input("Archivo CSV de salida (Enter = historiales.csv): ").strip() or "historiales.csv"
+        try:
+            cantidad = exportar_transcripts(self.consultas, ruta)
+        except OSError as e:
+            print(f"❌ Error al exportar: {e}")
+            return
+        print(f"✅ Historiales de {cantidad} estudiante(s) exportados a: {ruta}")
+    
+    def ejecutar_consulta_carga_docentes(self):
+        """Ejecuta el reporte de carga por docente"""
+        cargas = self.consultas.obtener_carga_docentes()
+        
+        if not cargas:
+            print("No hay cursos registrados.")
+            return
+        
+        print(f"\n--- CARGA POR DOCENTE ({len(cargas)}) ---")
+        print(f"{'Docente':<25} {'Cursos':<7} {'Créditos':<9} {'Inscritos':<10} {'Estudiantes':<12} {'Calificados':<11}")
+        print("-" * 79)
+        for carga in cargas:
+            print(f"{carga.docente[:25]:<25} {len(carga.cursos):<7} {carga.creditos:<9} {carga.inscritos:<10} {carga.estudiantes:<12} {carga.calificados:<11}")
\ No newline at end of file
@@ -3,6 +3,9 @@ import re
 from datetime import datetime
 from typing import List
 
+# Máximo de créditos que puede tener inscritos un estudiante
+LIMITE_CREDITOS_ESTUDIANTE = 20
+
 def validar_correo(correo: str) -> bool:
     """Valida que el correo tenga formato válido"""
     patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
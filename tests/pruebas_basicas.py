@@ -2,18 +2,27 @@
 # tests/pruebas_basicas.py
 import unittest
 import tempfile
+import io
 import shutil
 from datetime import datetime
 import os
 import sys
+from contextlib import redirect_stderr
 
 # Añadir el directorio padre al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.modelos import Estudiante, Curso, Matricula
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
 from src.validaciones import validar_correo, validar_documento, validar_fecha, validar_creditos, validar_nota
 from src.persistencia import PersistenciaCSV
-from src.consultas import ConsultasAcademicas
+from src.persistencia_sqlite import PersistenciaSQLite, importar_csv
+from src.persistencia_memoria import PersistenciaMemoria, datos_sinteticos
+from src.almacenamiento import Almacenamiento
+from src.main import guardar_datos, main
+from src.consultas import ConsultasAcademicas, unir_hash
+from src.paginacion import Paginador
+from src.reportes import exportar_transcripts, generar_reportes_por_curso
+from src.estadisticas import fecha_entera
 
 class TestModelos(unittest.TestCase):
     """Pruebas para los modelos de datos"""
@@ -49,6 +58,7 @@ class TestModelos(unittest.TestCase):
         """Prueba creación de matrícula válida"""
         matricula = Matricula(
             id="mat001",
+            inscripcion_id="ins001",
             estudiante_id="est001",
             curso_codigo="MAT101",
             fecha_matricula="2024-02-15"
@@ -171,6 +181,225 @@ class TestPersistencia(unittest.TestCase):
         self.assertEqual(len(cursos_cargados), 2)
         self.assertEqual(cursos_cargados[0].codigo, "MAT101")
         self.assertEqual(cursos_cargados[1].creditos, 4)
+    
+    def test_diario_reproduce_cambios_sobre_csv(self):
+        """Los cambios van al diario y se reproducen al cargar; compactar lo vacía"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        consultas = ConsultasAcademicas(self.persistencia.cargar_estudiantes(),
+                                        self.persistencia.cargar_cursos(), [], [])
+        consultas.suscribir(self.persistencia.registrar_cambios)
+        
+        consultas.agregar_estudiante(Estudiante("3", "11223344", "Ana", "López", "ana@test.com", "1997-03-03"))
+        consultas.actualizar_estudiante(consultas.buscar_estudiante_por_id("1"), correo="juanp@test.com")
+        consultas.eliminar_estudiante(consultas.buscar_estudiante_por_id("2"))
+        consultas.actualizar_curso(consultas.buscar_curso_por_codigo("MAT101"), codigo="MAT102")
+        self.persistencia.cerrar()
+        
+        # Una línea cortada al final (caída a mitad de escritura) se ignora
+        with open(os.path.join(self.temp_dir, "estudiantes.diario"), 'a', encoding='utf-8') as f:
+            f.write('{"op": "guardar", "clave": "9"')
+        
+        recargada = PersistenciaCSV(self.temp_dir)
+        estudiantes = recargada.cargar_estudiantes()
+        cursos = recargada.cargar_cursos()
+        self.assertEqual([e.id for e in estudiantes], ["1", "3"])
+        self.assertEqual(estudiantes[0].correo, "juanp@test.com")
+        self.assertEqual(sorted(c.codigo for c in cursos), ["FIS101", "MAT102"])
+        self.assertEqual(recargada.entradas_diario['estudiantes'], 3)
+        
+        self.assertEqual(recargada.compactar(estudiantes, cursos, [], [], umbral=2), ['estudiantes'])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "estudiantes.diario")))
+        self.assertEqual([e.id for e in PersistenciaCSV(self.temp_dir).cargar_estudiantes()], ["1", "3"])
+    
+    def test_diario_sin_csv_previo(self):
+        """El diario se reproduce aunque la tabla todavía no tenga CSV"""
+        consultas = ConsultasAcademicas([], [], [], [])
+        consultas.suscribir(self.persistencia.registrar_cambios)
+        consultas.agregar_estudiante(self.estudiantes_prueba[0])
+        consultas.agregar_curso(self.cursos_prueba[0])
+        self.persistencia.cerrar()
+        
+        recargada = PersistenciaCSV(self.temp_dir)
+        estudiantes = recargada.cargar_estudiantes()
+        cursos = recargada.cargar_cursos()
+        self.assertEqual([e.id for e in estudiantes], ["1"])
+        self.assertEqual([c.codigo for c in cursos], ["MAT101"])
+        self.assertEqual(recargada.entradas_diario['estudiantes'], 1)
+        
+        self.assertEqual(recargada.compactar(estudiantes, cursos, [], []), ['estudiantes', 'cursos'])
+        self.assertEqual([e.id for e in PersistenciaCSV(self.temp_dir).cargar_estudiantes()], ["1"])
+    
+    def test_eliminar_y_crear_no_repite_ids(self):
+        """Un alta después de una baja recibe un ID nuevo y sobrevive a la recarga"""
+        self.persistencia.guardar_estudiantes([Estudiante(f"est00{n}", f"1000000{n}", "Ana", "López",
+                                                          f"ana{n}@test.com", "1997-03-03") for n in (1, 2, 3)])
+        consultas = ConsultasAcademicas(self.persistencia.cargar_estudiantes(), [], [], [])
+        consultas.suscribir(self.persistencia.registrar_cambios)
+        consultas.eliminar_estudiante(consultas.buscar_estudiante_por_id("est001"))
+        
+        nuevo_id = consultas.siguiente_id('estudiantes', 'est')
+        self.assertEqual(nuevo_id, "est004")
+        consultas.agregar_estudiante(Estudiante(nuevo_id, "10000004", "Juan", "Pérez", "juan@test.com", "1995-01-01"))
+        with self.assertRaises(ValueError):
+            consultas.agregar_estudiante(Estudiante("est003", "10000005", "Luis", "Díaz", "luis@test.com",
+                                                    "1995-01-01"))
+        self.persistencia.cerrar()
+        
+        recargados = PersistenciaCSV(self.temp_dir).cargar_estudiantes()
+        self.assertEqual(sorted(e.id for e in recargados), ["est002", "est003", "est004"])
+        self.assertEqual(sorted(e.id for e in recargados), sorted(e.id for e in consultas.estudiantes))
+    
+    def test_guardar_solo_tablas_modificadas(self):
+        """Solo se reescriben las tablas que cambiaron, sin dejar temporales"""
+        consultas = ConsultasAcademicas(list(self.estudiantes_prueba), list(self.cursos_prueba), [], [])
+        consultas.suscribir(self.persistencia.marcar_cambios)
+        
+        consultas.actualizar_estudiante(consultas.estudiantes[0], nombres="Juan Carlos")
+        guardadas = self.persistencia.guardar_modificadas(consultas.estudiantes, consultas.cursos, [], [])
+        
+        self.assertEqual(guardadas, ['estudiantes'])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["estudiantes.csv"])
+        self.assertEqual(self.persistencia.cargar_estudiantes()[0].nombres, "Juan Carlos")
+        self.assertEqual(self.persistencia.guardar_modificadas(consultas.estudiantes, consultas.cursos, [], []), [])
+        
+        # El autoguardado respeta el intervalo desde el último guardado
+        consultas.eliminar_curso(consultas.cursos[0])
+        self.assertEqual(self.persistencia.autoguardar(consultas.estudiantes, consultas.cursos, [], [], 3600), [])
+        self.assertEqual(self.persistencia.autoguardar(consultas.estudiantes, consultas.cursos, [], [], 0), ['cursos'])
+    
+    def test_persistencia_sqlite(self):
+        """Importa desde CSV y aplica los cambios por fila en la base"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        base = PersistenciaSQLite(self.temp_dir)
+        self.assertEqual(importar_csv(base, self.temp_dir)['estudiantes'], 2)
+        
+        consultas = ConsultasAcademicas(base.cargar_estudiantes(), base.cargar_cursos(),
+                                        base.cargar_inscripciones(), base.cargar_matriculas())
+        consultas.suscribir(base.registrar_cambios)
+        consultas.agregar_inscripcion(Inscripcion("i1", "1", "MAT101", "2024-01-15"))
+        consultas.agregar_matricula(Matricula("m1", "i1", "1", "MAT101", "2024-01-20"))
+        consultas.asignar_nota(consultas.matriculas[0], 4.5)
+        consultas.actualizar_curso(consultas.buscar_curso_por_codigo("MAT101"), codigo="MAT102", creditos=5)
+        consultas.eliminar_estudiante(consultas.buscar_estudiante_por_id("2"))
+        base.cerrar()
+        
+        recargada = PersistenciaSQLite(self.temp_dir)
+        self.assertEqual([e.id for e in recargada.cargar_estudiantes()], ["1"])
+        self.assertEqual(sorted((c.codigo, c.creditos) for c in recargada.cargar_cursos()),
+                         [("FIS101", 4), ("MAT102", 5)])
+        matricula = recargada.cargar_matriculas()[0]
+        self.assertEqual((matricula.curso_codigo, matricula.nota), ("MAT102", 4.5))
+        self.assertEqual(recargada.cargar_inscripciones()[0].curso_codigo, "MAT102")
+        recargada.cerrar()
+    
+    def test_sqlite_eliminar_y_crear_no_pisa_registros(self):
+        """Un alta tras una baja no reemplaza la fila de otro estudiante en la base"""
+        base = PersistenciaSQLite(self.temp_dir)
+        base.guardar_estudiantes(self.estudiantes_prueba)
+        consultas = ConsultasAcademicas(base.cargar_estudiantes(), [], [], [])
+        consultas.suscribir(base.registrar_cambios)
+        consultas.eliminar_estudiante(consultas.buscar_estudiante_por_id("1"))
+        consultas.agregar_estudiante(Estudiante(consultas.siguiente_id('estudiantes', '', 1), "11223344", "Ana",
+                                                "López", "ana@test.com", "1997-03-03"))
+        base.cerrar()
+        
+        recargada = PersistenciaSQLite(self.temp_dir)
+        self.assertEqual([(e.id, e.nombres) for e in recargada.cargar_estudiantes()], [("2", "María"), ("3", "Ana")])
+        recargada.cerrar()
+    
+    def test_importar_csv_con_claves_repetidas(self):
+        """Las claves repetidas se informan y la base no queda a medio importar"""
+        base = PersistenciaSQLite(self.temp_dir)
+        base.guardar_cursos(self.cursos_prueba)
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos([Curso("QUI101", "Química", 3, "Dr. Ruiz")])
+        self.persistencia.guardar_matriculas([Matricula("m1", "i1", "1", "QUI101", "2024-01-20"),
+                                              Matricula("m1", "i2", "2", "QUI101", "2024-01-20")])
+        
+        with self.assertRaises(ValueError) as contexto:
+            importar_csv(base, self.temp_dir)
+        self.assertIn("matriculas: m1", str(contexto.exception))
+        self.assertEqual(base.cargar_estudiantes(), [])
+        self.assertEqual([c.codigo for c in base.cargar_cursos()], ["MAT101", "FIS101"])
+        base.cerrar()
+    
+    def test_backends_cumplen_el_protocolo(self):
+        """CSV, SQLite y memoria guardan, actualizan por fila y eliminan igual"""
+        backends = {
+            'csv': lambda: PersistenciaCSV(self.temp_dir),
+            'sqlite': lambda: PersistenciaSQLite(self.temp_dir),
+            'memoria': PersistenciaMemoria,
+        }
+        for nombre, crear in backends.items():
+            with self.subTest(backend=nombre):
+                backend = crear()
+                self.assertIsInstance(backend, Almacenamiento)
+                backend.guardar_estudiantes(self.estudiantes_prueba)
+                backend.upsert('estudiantes', [Estudiante("2", "87654321", "María", "Gómez",
+                                                          "maria@test.com", "1996-02-02")])
+                backend.eliminar('estudiantes', ["1"])
+                backend.cerrar()
+                
+                estudiantes = (backend if nombre == 'memoria' else crear()).cargar_estudiantes()
+                self.assertEqual([(e.id, e.apellidos) for e in estudiantes], [("2", "Gómez")])
+    
+    def test_guardar_al_salir_con_otro_backend(self):
+        """Un backend que solo cumple el protocolo se guarda completo al salir"""
+        class SinEscrituraPorFila(PersistenciaMemoria):
+            escritura_por_fila = False
+        
+        backend = SinEscrituraPorFila()
+        self.assertIsInstance(backend, Almacenamiento)
+        guardar_datos(backend, self.estudiantes_prueba, self.cursos_prueba, [], [], diario=True)
+        self.assertEqual([c.codigo for c in backend.cargar_cursos()], ["MAT101", "FIS101"])
+    
+    def test_opciones_de_csv_con_otro_backend(self):
+        """--diario y --autoguardado se rechazan con un backend que no es CSV"""
+        for opciones in (['--diario'], ['--autoguardado', '0']):
+            with self.subTest(opciones=opciones), redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main(['--backend', 'memoria'] + opciones)
+    
+    def test_memoria_con_datos_sinteticos(self):
+        """El backend en memoria sostiene volúmenes grandes sin tocar el disco"""
+        memoria = PersistenciaMemoria()
+        estudiantes, cursos, inscripciones, matriculas = datos_sinteticos(2000, 40, 4, semilla=7)
+        self.assertEqual(datos_sinteticos(2000, 40, 4, semilla=7)[3], matriculas)
+        memoria.guardar_estudiantes(estudiantes)
+        memoria.guardar_cursos(cursos)
+        memoria.guardar_inscripciones(inscripciones)
+        memoria.guardar_matriculas(matriculas)
+        
+        consultas = ConsultasAcademicas(memoria.cargar_estudiantes(), memoria.cargar_cursos(),
+                                        memoria.cargar_inscripciones(), memoria.cargar_matriculas())
+        consultas.suscribir(memoria.registrar_cambios)
+        self.assertEqual(len(consultas.inscripciones), 8000)
+        consultas.eliminar_matriculas(consultas.obtener_matriculas_de_estudiante("E000000"))
+        
+        self.assertEqual(len(memoria.cargar_matriculas()), len(consultas.matriculas))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+    
+    def test_cargar_todo_concurrente(self):
+        """cargar_todo entrega las mismas tablas que las cargas por separado, con tiempos"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        self.persistencia.upsert('cursos', [Curso("QUI101", "Química", 3, "Dra. Ruiz")])
+        base = PersistenciaSQLite(self.temp_dir)
+        importar_csv(base, self.temp_dir)
+        
+        for nombre, carga in (('hilos', self.persistencia.cargar_todo()),
+                              ('procesos', self.persistencia.cargar_todo(procesos=2)),
+                              ('sqlite', base.cargar_todo())):
+            with self.subTest(carga=nombre):
+                self.assertEqual(carga.estudiantes, self.estudiantes_prueba)
+                self.assertEqual([c.codigo for c in carga.cursos], ["MAT101", "FIS101", "QUI101"])
+                self.assertEqual((carga.inscripciones, carga.matriculas), ([], []))
+                self.assertEqual(sorted(carga.tiempos), ['cursos', 'estudiantes', 'inscripciones', 'matriculas'])
+        # La cuenta del diario reproducido en otro proceso llega al principal
+        self.assertEqual(self.persistencia.entradas_diario['cursos'], 1)
+        base.cerrar()
 
 class TestConsultas(unittest.TestCase):
     """Pruebas para las consultas académicas"""
@@ -188,14 +417,21 @@ class TestConsultas(unittest.TestCase):
             Curso("FIS101", "Física", 4, "Dr. García")
         ]
         
+        self.inscripciones = [
+            Inscripcion("i1", "1", "MAT101", "2024-01-20"),
+            Inscripcion("i2", "2", "MAT101", "2024-01-20"),
+            Inscripcion("i3", "3", "MAT101", "2024-01-21"),
+            Inscripcion("i4", "1", "FIS101", "2024-01-21")
+        ]
+        
         self.matriculas = [
-            Matricula("m1", "1", "MAT101", "2024-02-01", 4.5),
-            Matricula("m2", "2", "MAT101", "2024-02-01", 3.8),
-            Matricula("m3", "3", "MAT101", "2024-02-01", 2.1),
-            Matricula("m4", "1", "FIS101", "2024-02-01", None)
+            Matricula("m1", "i1", "1", "MAT101", "2024-02-01", 4.5),
+            Matricula("m2", "i2", "2", "MAT101", "2024-02-01", 3.8),
+            Matricula("m3", "i3", "3", "MAT101", "2024-02-01", 2.1),
+            Matricula("m4", "i4", "1", "FIS101", "2024-02-01", None)
         ]
         
-        self.consultas = ConsultasAcademicas(self.estudiantes, self.cursos, self.matriculas)
+        self.consultas = ConsultasAcademicas(self.estudiantes, self.cursos, self.inscripciones, self.matriculas)
     
     def test_buscar_estudiante_por_documento(self):
         """Prueba búsqueda de estudiante por documento"""
@@ -235,6 +471,107 @@ class TestConsultas(unittest.TestCase):
         self.assertEqual(top[1][1], 3.8)  # María
         self.assertEqual(top[2][1], 2.1)  # Ana - nota más baja
     
+    def test_tabla_posiciones_se_actualiza_con_asignar_nota(self):
+        """Prueba que asignar_nota actualiza el top del curso sin recalcularlo"""
+        self.consultas.asignar_nota(self.matriculas[2], 4.9)  # Ana sube al primer lugar
+        top = self.consultas.obtener_top_promedios_por_curso("MAT101", 2)
+        self.assertEqual([(e.id, nota) for e, nota in top], [("3", 4.9), ("1", 4.5)])
+        
+        self.assertEqual(self.consultas.obtener_top_promedios_por_curso("FIS101"), [])
+        self.consultas.asignar_nota(self.matriculas[3], 3.5)
+        top = self.consultas.obtener_top_promedios_por_curso("FIS101")
+        self.assertEqual([(e.id, nota) for e, nota in top], [("1", 3.5)])
+        
+        self.consultas.eliminar_matriculas([self.matriculas[0]])
+        top = self.consultas.obtener_top_promedios_por_curso("MAT101")
+        self.assertEqual([e.id for e, _ in top], ["3", "2"])
+    
+    def test_obtener_estadisticas_cursos(self):
+        """Prueba las estadísticas de notas por curso"""
+        estadisticas = self.consultas.obtener_estadisticas_cursos()
+        
+        # FIS101 no tiene notas registradas
+        self.assertEqual(list(estadisticas), ["MAT101"])
+        mat = estadisticas["MAT101"]
+        self.assertEqual(mat.cantidad, 3)
+        self.assertAlmostEqual(mat.promedio, (4.5 + 3.8 + 2.1) / 3)
+        self.assertAlmostEqual(mat.mediana, 3.8)
+        self.assertAlmostEqual(mat.tasa_aprobacion, 2 / 3)
+        self.assertEqual(mat.histograma, [0, 0, 1, 1, 1])
+        
+        self.consultas.asignar_nota(self.matriculas[3], 5.0)
+        fis = self.consultas.obtener_estadisticas_curso("FIS101")
+        self.assertEqual(fis.histograma, [0, 0, 0, 0, 1])
+        self.assertEqual(fis.desviacion, 0.0)
+    
+    def test_obtener_promedios_ponderados(self):
+        """Prueba el promedio ponderado por créditos y el ranking"""
+        self.consultas.asignar_nota(self.matriculas[3], 2.0)  # Juan en FIS101 (4 créditos)
+        ranking = self.consultas.obtener_promedios_ponderados()
+        
+        self.assertEqual([p.estudiante_id for p in ranking], ["2", "1", "3"])
+        juan = ranking[1]
+        self.assertAlmostEqual(juan.promedio, (4.5 * 3 + 2.0 * 4) / 7)
+        self.assertEqual(juan.creditos_cursados, 7)
+        self.assertEqual(juan.creditos_aprobados, 3)
+        self.assertEqual([p.puesto for p in ranking], [1, 2, 3])
+        
+        # Los empates comparten puesto
+        self.consultas.asignar_nota(self.matriculas[2], 3.8)
+        ranking = self.consultas.obtener_promedios_ponderados()
+        self.assertEqual([p.puesto for p in ranking], [1, 1, 3])
+    
+    def test_cache_de_consultas_invalida_por_version(self):
+        """Prueba aciertos de caché e invalidación solo de consultas dependientes"""
+        reprobados = self.consultas.obtener_reprobados()
+        dominios = self.consultas.obtener_dominios_correo_unicos()
+        self.assertIs(self.consultas.obtener_reprobados(), reprobados)
+        self.assertEqual(self.consultas.estadisticas_cache()['aciertos'], 1)
+        
+        # Cambiar una nota invalida reprobados, pero no los dominios
+        self.consultas.asignar_nota(self.matriculas[3], 1.0)
+        self.assertEqual(len(self.consultas.obtener_reprobados()), 2)
+        self.assertIs(self.consultas.obtener_dominios_correo_unicos(), dominios)
+        
+        # Argumentos distintos son entradas distintas
+        self.assertEqual(len(self.consultas.obtener_reprobados(2.0)), 1)
+        
+        estadisticas = self.consultas.estadisticas_cache()
+        self.assertEqual(estadisticas['aciertos'], 2)
+        self.assertEqual(estadisticas['fallos'], 4)
+    
+    def test_cache_respeta_capacidad(self):
+        """Prueba que la caché descarta la entrada menos usada"""
+        consultas = ConsultasAcademicas(self.estudiantes, self.cursos, self.inscripciones,
+                                        self.matriculas, capacidad_cache=1)
+        consultas.obtener_reprobados()
+        consultas.obtener_dominios_correo_unicos()
+        consultas.obtener_reprobados()
+        
+        self.assertEqual(consultas.estadisticas_cache()['fallos'], 3)
+        self.assertEqual(consultas.estadisticas_cache()['entradas'], 1)
+    
+    def test_iteradores_con_offset_y_limite(self):
+        """Prueba las variantes perezosas paginadas de las consultas"""
+        pagina = list(self.consultas.iterar_estudiantes_ordenados_por_apellido(offset=1, limite=1))
+        self.assertEqual([e.apellidos for e in pagina], ["López"])
+        
+        self.assertEqual(len(list(self.consultas.iterar_reprobados(4.0, limite=1))), 1)
+        self.assertEqual(len(list(self.consultas.iterar_reprobados(4.0, offset=1))), 1)
+        self.assertEqual(len(list(self.consultas.iterar_matriculas_con_inscripcion(offset=2))), 2)
+        self.assertEqual(list(self.consultas.iterar_inscripciones_sin_matricular()), [])
+    
+    def test_cursor_por_apellido(self):
+        """Prueba que el cursor continúa después del último estudiante visto"""
+        primero = next(self.consultas.iterar_estudiantes_ordenados_por_apellido())
+        cursor = self.consultas.cursor_apellido(primero)
+        
+        # Un alta anterior al cursor no desplaza la página siguiente
+        self.consultas.agregar_estudiante(
+            Estudiante("4", "44444444", "Luis", "Acosta", "luis@test.com", "1998-04-04"))
+        siguientes = list(self.consultas.iterar_estudiantes_ordenados_por_apellido(despues_de=cursor))
+        self.assertEqual([e.apellidos for e in siguientes], ["López", "Pérez"])
+    
     def test_obtener_reprobados(self):
         """Prueba obtención de reprobados"""
         reprobados = self.consultas.obtener_reprobados(3.0)
@@ -259,12 +596,415 @@ class TestConsultas(unittest.TestCase):
     
     def test_buscar_binario_estudiante(self):
         """Prueba búsqueda binaria por apellido"""
-        estudiante = self.consultas.buscar_binario_estudiante("López")
-        self.assertIsNotNone(estudiante)
-        self.assertEqual(estudiante.nombres, "Ana")
+        estudiantes = self.consultas.buscar_binario_estudiante("López")
+        self.assertEqual(len(estudiantes), 1)
+        self.assertEqual(estudiantes[0].nombres, "Ana")
         
-        estudiante_inexistente = self.consultas.buscar_binario_estudiante("Inexistente")
-        self.assertIsNone(estudiante_inexistente)
+        estudiantes_inexistentes = self.consultas.buscar_binario_estudiante("Inexistente")
+        self.assertEqual(estudiantes_inexistentes, [])
+    
+    def test_indice_apellidos_se_mantiene(self):
+        """Prueba que el índice ordenado refleja altas, ediciones y bajas"""
+        nuevo = Estudiante("4", "44444444", "Luis", "lópez", "luis@test.com", "1998-04-04")
+        self.consultas.agregar_estudiante(nuevo)
+        
+        homonimos = self.consultas.buscar_binario_estudiante("LÓPEZ")
+        self.assertEqual([e.id for e in homonimos], ["3", "4"])
+        
+        self.consultas.actualizar_estudiante(nuevo, apellidos="Álvarez")
+        self.assertEqual(len(self.consultas.buscar_binario_estudiante("López")), 1)
+        self.assertEqual(self.consultas.listar_estudiantes_ordenados_por_apellido()[-1].apellidos, "Álvarez")
+        
+        self.consultas.eliminar_estudiante(nuevo)
+        self.assertEqual(len(self.consultas.listar_estudiantes_ordenados_por_apellido()), 3)
+    
+    def test_buscar_estudiantes_por_nombre(self):
+        """Prueba búsqueda por prefijo, sin tildes y aproximada"""
+        resultados = self.consultas.buscar_estudiantes_por_nombre("gonz")
+        self.assertEqual([e.id for e, _ in resultados], ["2"])
+        
+        # Sin tildes y combinando nombre y apellido parciales
+        resultados = self.consultas.buscar_estudiantes_por_nombre("Juan Perez")
+        self.assertEqual(resultados[0][0].id, "1")
+        
+        # Con errores de escritura
+        resultados = self.consultas.buscar_estudiantes_por_nombre("Gonzales")
+        self.assertEqual(resultados[0][0].id, "2")
+        
+        self.assertEqual(self.consultas.buscar_estudiantes_por_nombre("Zuluaga"), [])
+    
+    def test_buscar_estudiantes_por_nombre_ranking_y_limite(self):
+        """Prueba que las coincidencias exactas preceden a las de prefijo"""
+        self.consultas.agregar_estudiante(
+            Estudiante("4", "44444444", "Anabel", "Ruiz", "anabel@test.com", "1998-04-04"))
+        
+        resultados = self.consultas.buscar_estudiantes_por_nombre("ana")
+        self.assertEqual([e.id for e, _ in resultados], ["3", "4"])
+        self.assertGreater(resultados[0][1], resultados[1][1])
+        
+        self.assertEqual(len(self.consultas.buscar_estudiantes_por_nombre("ana", limite=1)), 1)
+        
+        self.consultas.actualizar_estudiante(self.estudiantes[-1], nombres="Beatriz")
+        self.assertEqual([e.id for e, _ in self.consultas.buscar_estudiantes_por_nombre("ana")], ["3"])
+    
+    def test_indices_se_mantienen_al_mutar(self):
+        """Prueba que los índices reflejan altas, ediciones y bajas"""
+        nuevo = Estudiante("4", "44444444", "Luis", "Ruiz", "Luis@Test.com", "1998-04-04")
+        self.consultas.agregar_estudiante(nuevo)
+        self.assertIs(self.consultas.buscar_estudiante_por_id("4"), nuevo)
+        self.assertIs(self.consultas.buscar_estudiante_por_correo("luis@test.com"), nuevo)
+        
+        self.consultas.actualizar_estudiante(nuevo, documento="55555555", correo="luis@otro.com")
+        self.assertIsNone(self.consultas.buscar_estudiante_por_documento("44444444"))
+        self.assertIsNone(self.consultas.buscar_estudiante_por_correo("luis@test.com"))
+        self.assertIs(self.consultas.buscar_estudiante_por_documento("55555555"), nuevo)
+        
+        self.consultas.eliminar_estudiante(nuevo)
+        self.assertIsNone(self.consultas.buscar_estudiante_por_id("4"))
+        self.assertNotIn(nuevo, self.estudiantes)
+    
+    def test_actualizar_codigo_curso_actualiza_referencias(self):
+        """Prueba que renombrar un curso propaga el código"""
+        curso = self.consultas.buscar_curso_por_codigo("FIS101")
+        self.consultas.actualizar_curso(curso, codigo="FIS102")
+        
+        self.assertIsNone(self.consultas.buscar_curso_por_codigo("FIS101"))
+        self.assertIs(self.consultas.buscar_curso_por_codigo("FIS102"), curso)
+        self.assertEqual(self.inscripciones[3].curso_codigo, "FIS102")
+        self.assertEqual(self.matriculas[3].curso_codigo, "FIS102")
+    
+    def test_renombrar_curso_publica_una_sola_vez(self):
+        """El cambio de código y las referencias reescritas llegan en una sola publicación"""
+        publicaciones = []
+        self.consultas.suscribir(publicaciones.append)
+        self.consultas.actualizar_curso(self.consultas.buscar_curso_por_codigo("MAT101"), codigo="MAT102")
+        
+        self.assertEqual(len(publicaciones), 1)
+        cambios = [(c.tabla, c.operacion, c.clave) for c in publicaciones[0]]
+        self.assertEqual(cambios[:2], [('cursos', 'eliminar', 'MAT101'), ('cursos', 'guardar', 'MAT102')])
+        self.assertEqual({tabla for tabla, _, _ in cambios[2:]}, {'inscripciones', 'matriculas'})
+    
+    def test_eliminar_inscripciones_conserva_la_lista(self):
+        """Prueba que la eliminación modifica la lista compartida en sitio"""
+        self.consultas.eliminar_inscripciones([self.inscripciones[0]])
+        
+        self.assertIs(self.consultas.inscripciones, self.inscripciones)
+        self.assertEqual(len(self.inscripciones), 3)
+        self.assertIsNone(self.consultas.buscar_inscripcion_por_id("i1"))
+    
+    def test_indices_agrupados_por_clave_foranea(self):
+        """Prueba los índices agrupados por estudiante, curso e inscripción"""
+        self.assertEqual(len(self.consultas.obtener_inscripciones_de_estudiante("1")), 2)
+        self.assertEqual(len(self.consultas.obtener_matriculas_de_curso("MAT101")), 3)
+        self.assertTrue(self.consultas.inscripcion_tiene_matricula("i4"))
+        
+        # Reasignar una inscripción mueve el registro de grupo
+        self.consultas.actualizar_inscripcion(self.inscripciones[3], estudiante_id="2")
+        self.assertEqual(len(self.consultas.obtener_inscripciones_de_estudiante("1")), 1)
+        self.assertIsNotNone(self.consultas.buscar_inscripcion_de_estudiante_en_curso("2", "FIS101"))
+        
+        # Eliminar matrículas vacía los grupos correspondientes
+        self.consultas.eliminar_matriculas(self.consultas.obtener_matriculas_de_inscripcion("i4"))
+        self.assertFalse(self.consultas.inscripcion_tiene_matricula("i4"))
+        self.assertEqual(self.consultas.obtener_matriculas_de_curso("FIS101"), [])
+    
+    def test_eliminar_grupo_completo_en_cascada(self):
+        """Prueba que borrar todo un curso en lote deja al día los demás grupos"""
+        self.consultas.eliminar_matriculas(self.consultas.obtener_matriculas_de_curso("MAT101"))
+        self.consultas.eliminar_inscripciones(self.consultas.obtener_inscripciones_de_curso("MAT101"))
+        
+        self.assertEqual(self.consultas.obtener_inscripciones_de_curso("MAT101"), [])
+        self.assertEqual(self.consultas.obtener_matriculas_de_estudiante("2"), [])
+        self.assertEqual([i.id for i in self.consultas.obtener_inscripciones_de_estudiante("1")], ["i4"])
+        self.assertEqual([m.id for m in self.consultas.obtener_matriculas_de_estudiante("1")], ["m4"])
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("1"), 4)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("2"), 0)
+    
+    def test_unir_hash_inner_y_left(self):
+        """Prueba el operador hash join con índice y con lado de construcción iterable"""
+        filas = [(m,) for m in self.matriculas]
+        
+        internas = list(unir_hash(filas, lambda f: f[0].inscripcion_id, {"i1": "x", "i4": "y"}))
+        self.assertEqual([pareja for _, pareja in internas], ["x", "y"])
+        
+        izquierdas = list(unir_hash(filas, lambda f: f[0].curso_codigo, self.cursos[:1],
+                                    clave_construccion=lambda c: c.codigo, tipo='left'))
+        self.assertEqual(len(izquierdas), len(self.matriculas))
+        self.assertIsNone(izquierdas[3][1])
+        self.assertIs(izquierdas[0][1], self.cursos[0])
+        
+        # Con lado de construcción iterable, cada fila repetida es una pareja
+        por_curso = list(unir_hash([("MAT101",), ("QUI101",)], lambda f: f[0], self.inscripciones,
+                                   clave_construccion=lambda i: i.curso_codigo, tipo='left'))
+        self.assertEqual([pareja.id if pareja else None for _, pareja in por_curso], ["i1", "i2", "i3", None])
+        
+        # Los argumentos inválidos fallan al llamar, sin recorrer el resultado
+        with self.assertRaises(ValueError):
+            unir_hash(filas, lambda f: f[0].id, self.cursos, tipo='full')
+        with self.assertRaises(ValueError):
+            unir_hash(filas, lambda f: f[0].id, self.cursos)
+    
+    def test_reportes_con_join(self):
+        """Prueba los reportes construidos sobre el hash join"""
+        self.assertEqual(len(self.consultas.obtener_matriculas_con_inscripcion()), len(self.matriculas))
+        
+        self.consultas.eliminar_matriculas(self.consultas.obtener_matriculas_de_inscripcion("i4"))
+        pendientes = self.consultas.obtener_inscripciones_sin_matricular()
+        self.assertEqual([inscripcion.id for inscripcion, _, _ in pendientes], ["i4"])
+    
+    def test_consulta_declarativa_usa_indices(self):
+        """Prueba filtros, orden, límite y proyección del constructor de consultas"""
+        consulta = (self.consultas.consulta('matriculas').donde(curso_codigo="MAT101")
+                    .entre('nota', 3.0, None).ordenar_por('nota', descendente=True)
+                    .seleccionar('estudiante_id', 'nota'))
+        self.assertEqual(consulta.plan().acceso, 'rango')
+        self.assertEqual(consulta.ejecutar(), [{'estudiante_id': "1", 'nota': 4.5},
+                                               {'estudiante_id': "2", 'nota': 3.8}])
+        
+        por_estudiante = self.consultas.consulta('inscripciones').donde(estudiante_id="1")
+        self.assertEqual(por_estudiante.plan().acceso, 'igualdad')
+        self.assertEqual(por_estudiante.contar(), 2)
+        
+        recorrido = self.consultas.consulta('estudiantes').filtrar(lambda e: e.nombres.startswith("A"))
+        self.assertIn("Recorrido completo", recorrido.explicar())
+        self.assertEqual([e.id for e in recorrido], ["3"])
+        
+        with self.assertRaises(ValueError):
+            self.consultas.consulta('matriculas').donde(promedio=3)
+    
+    def test_indice_de_notas_sigue_las_mutaciones(self):
+        """Prueba que el índice de rango de notas se mantiene al asignar y eliminar"""
+        # Se construye en la primera consulta y desde ahí lo mantienen las mutaciones
+        self.assertEqual(self.consultas.indice_rango('matriculas', 'nota').contar(4.0, 5.0), 1)
+        self.consultas.asignar_nota(self.matriculas[3], 2.5)
+        self.consultas.eliminar_matriculas([self.matriculas[0]])
+        self.consultas.agregar_inscripcion(Inscripcion("i9", "1", "FIS101", "2024-03-01"))
+        self.assertEqual([i.id for i in self.consultas.obtener_inscripciones_por_fecha("2024-03-01")], ["i9"])
+        self.consultas.eliminar_inscripciones([self.consultas.inscripciones[-1]])
+        self.assertEqual(self.consultas.obtener_inscripciones_por_fecha("2024-03-01"), [])
+        
+        bajas = self.consultas.consulta('matriculas').entre('nota', None, 3.0).ordenar_por('nota')
+        self.assertEqual([m.id for m in bajas], ["m3", "m4"])
+        self.assertEqual(self.consultas.indice_rango('matriculas', 'nota').contar(4.0, 5.0), 0)
+    
+    def test_consultas_por_rango_de_fechas_y_notas(self):
+        """Prueba los índices de rango sobre fechas y notas"""
+        inscripciones = self.consultas.obtener_inscripciones_por_fecha("2024-01-21", "2024-01-31")
+        self.assertEqual([i.id for i in inscripciones], ["i3", "i4"])
+        
+        nacidos = self.consultas.obtener_estudiantes_por_fecha_nacimiento(desde="1996-01-01")
+        self.assertEqual([e.id for e in nacidos], ["2", "3"])
+        
+        self.consultas.actualizar_estudiante(self.estudiantes[0], fecha_nacimiento="1998-05-05")
+        nacidos = self.consultas.obtener_estudiantes_por_fecha_nacimiento(desde="1996-01-01")
+        self.assertEqual([e.id for e in nacidos], ["2", "3", "1"])
+        
+        notas = self.consultas.obtener_matriculas_por_nota(2.0, 4.0)
+        self.assertEqual([m.id for m in notas], ["m3", "m2"])
+        self.assertEqual(len(self.consultas.obtener_matriculas_por_fecha(hasta="2024-01-31")), 0)
+        
+        por_fecha = self.consultas.consulta('inscripciones').entre('fecha_inscripcion', "2024-01-21")
+        self.assertEqual(por_fecha.plan().acceso, 'rango')
+        self.assertEqual(por_fecha.contar(), 2)
+    
+    def test_creditos_materializados_y_limite(self):
+        """Prueba que el contador de créditos sigue inscripciones y cursos"""
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("1"), 7)
+        
+        # Cambio de créditos y renombrado del curso
+        self.consultas.actualizar_curso(self.cursos[1], codigo="FIS201", creditos=6)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("1"), 9)
+        
+        # Reasignar y eliminar inscripciones
+        self.consultas.actualizar_inscripcion(self.inscripciones[0], estudiante_id="2")
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("1"), 6)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("2"), 6)
+        self.consultas.eliminar_inscripciones([self.inscripciones[3]])
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("1"), 0)
+        
+        # Eliminar el curso descuenta sus créditos a los inscritos
+        self.consultas.eliminar_curso(self.cursos[0])
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("2"), 0)
+        
+        self.consultas.agregar_curso(Curso("MAT101", "Matemáticas", 3, "Dr. López"))
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("2"), 6)
+        self.consultas.actualizar_curso(self.consultas.buscar_curso_por_codigo("MAT101"), creditos=7)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("2"), 14)
+        self.consultas.agregar_curso(Curso("ALG101", "Álgebra", 8, "Dr. Ruiz"))
+        self.consultas.agregar_curso(Curso("QUI101", "Química", 3, "Dr. Ruiz"))
+        self.assertTrue(self.consultas.supera_limite_creditos("2", "ALG101"))
+        self.assertFalse(self.consultas.supera_limite_creditos("2", "QUI101"))
+        self.assertFalse(self.consultas.supera_limite_creditos("2", "ALG101", reemplaza=self.inscripciones[0]))
+    
+    def test_reportes_por_curso_en_paralelo(self):
+        """Prueba que los reportes por curso coinciden en serie y con varios procesos"""
+        directorio = tempfile.mkdtemp()
+        try:
+            en_serie = generar_reportes_por_curso(self.consultas, None, procesos=1)
+            en_paralelo = generar_reportes_por_curso(self.consultas, directorio, procesos=2)
+            
+            self.assertEqual([r.curso_codigo for r in en_paralelo], ["FIS101", "MAT101"])
+            self.assertEqual([(r.estadisticas, r.mejores, r.reprobados) for r in en_serie],
+                             [(r.estadisticas, r.mejores, r.reprobados) for r in en_paralelo])
+            
+            matematicas = en_paralelo[1]
+            self.assertEqual(matematicas.mejores[0][0], "1")
+            self.assertEqual([fila[2] for fila in matematicas.reprobados], [2.1])
+            self.assertIsNone(en_paralelo[0].estadisticas)
+            self.assertEqual(sorted(os.listdir(directorio)), ["reporte_FIS101.txt", "reporte_MAT101.txt"])
+        finally:
+            shutil.rmtree(directorio)
+    
+    def test_reportes_con_codigos_que_se_confunden(self):
+        """Prueba que códigos con símbolos o repetidos no comparten archivo"""
+        # Un CSV antiguo puede traer códigos repetidos
+        cursos = self.cursos + [Curso("MAT*1", "Álgebra", 3, "Dr. Ruiz"), Curso("MAT?1", "Cálculo", 3, "Dr. Ruiz"),
+                                Curso("FIS101", "Física II", 4, "Dr. García")]
+        consultas = ConsultasAcademicas(self.estudiantes, cursos, self.inscripciones, self.matriculas)
+        directorio = tempfile.mkdtemp()
+        try:
+            reportes = generar_reportes_por_curso(consultas, directorio, procesos=2)
+            
+            archivos = [r.archivo for r in reportes]
+            self.assertEqual(len(set(archivos)), len(reportes))
+            self.assertEqual(len(os.listdir(directorio)), len(reportes))
+            self.assertIn(os.path.join(directorio, "reporte_MAT101.txt"), archivos)
+        finally:
+            shutil.rmtree(directorio)
+    
+    def test_busquedas_por_lote(self):
+        """Prueba las búsquedas por lote con particiones encontrados/faltantes"""
+        resultado = self.consultas.buscar_estudiantes_por_documentos(["87654321", "000", "12345678", "000"])
+        self.assertEqual(list(resultado.encontrados), ["87654321", "12345678"])
+        self.assertEqual(resultado.faltantes, ["000"])
+        
+        resultado = self.consultas.buscar_estudiantes_por_correos(["ANA@test.com", "nadie@test.com", "ana@TEST.com",
+                                                                   "Nadie@test.com"])
+        self.assertEqual(list(resultado.encontrados), ["ANA@test.com"])
+        self.assertEqual(resultado.encontrados["ANA@test.com"].id, "3")
+        self.assertEqual(resultado.faltantes, ["nadie@test.com"])
+        
+        resultado = self.consultas.buscar_estudiantes_por_ids(iter(["2", "9"]))
+        self.assertEqual(resultado.encontrados["2"].nombres, "María")
+        self.assertEqual(resultado.faltantes, ["9"])
+    
+    def test_indice_de_dominios(self):
+        """Prueba conteos, top y estudiantes por dominio tras las mutaciones"""
+        self.consultas.actualizar_estudiante(self.estudiantes[0], correo="juan@Uni.edu")
+        self.consultas.agregar_estudiante(Estudiante("4", "22222222", "Luis", "Mora", "luis@uni.EDU", "1998-04-04"))
+        self.consultas.agregar_estudiante(Estudiante("5", "33333333", "Eva", "Díaz", "eva@otro.org", "1998-05-05"))
+        
+        self.assertEqual(self.consultas.obtener_conteo_dominios(),
+                         [("otro.org", 1), ("test.com", 2), ("uni.edu", 2)])
+        self.assertEqual(self.consultas.obtener_top_dominios(2), [("test.com", 2), ("uni.edu", 2)])
+        self.assertEqual([e.id for e in self.consultas.obtener_estudiantes_de_dominio("UNI.edu")], ["1", "4"])
+        
+        self.consultas.eliminar_estudiante(self.estudiantes[-1])
+        self.assertNotIn("otro.org", self.consultas.obtener_dominios_correo_unicos())
+    
+    def test_cohortes_por_periodo(self):
+        """Prueba la matriz curso x periodo de inscripción"""
+        self.consultas.actualizar_inscripcion(self.inscripciones[2], fecha_inscripcion="2024-08-05")
+        
+        por_mes = self.consultas.obtener_cohortes('mes')
+        self.assertEqual(sorted(por_mes["MAT101"]), ["2024-01", "2024-08"])
+        enero = por_mes["MAT101"]["2024-01"]
+        self.assertEqual((enero.cantidad, enero.calificadas, enero.aprobadas), (2, 2, 2))
+        self.assertAlmostEqual(enero.promedio, 4.15)
+        self.assertEqual(por_mes["MAT101"]["2024-08"].tasa_aprobacion, 0.0)
+        self.assertEqual(por_mes["FIS101"]["2024-01"].calificadas, 0)
+        
+        por_semestre = self.consultas.obtener_cohortes('semestre')
+        self.assertEqual(sorted(por_semestre["MAT101"]), ["2024-1", "2024-2"])
+        self.assertEqual(fecha_entera("2024-08-05"), 20240805)
+        self.assertIsNone(fecha_entera("05/08/2024"))
+        
+        with self.assertRaises(ValueError):
+            self.consultas.obtener_cohortes('anio')
+    
+    def test_percentiles_con_empates(self):
+        """Prueba puestos y percentiles por curso y generales"""
+        tabla = self.consultas.obtener_percentiles().por_curso["MAT101"]
+        self.assertEqual(list(tabla.puestos), [1, 2, 3])
+        self.assertAlmostEqual(tabla.percentiles[0], 250 / 3)
+        
+        self.consultas.asignar_nota(self.matriculas[1], 4.5)
+        percentiles = self.consultas.obtener_percentiles()
+        tabla = percentiles.por_curso["MAT101"]
+        self.assertEqual(list(tabla.puestos), [1, 1, 3])
+        self.assertEqual(tabla.percentiles[0], tabla.percentiles[1])
+        self.assertAlmostEqual(tabla.percentiles[2], 100 / 6)
+        self.assertEqual(len(percentiles.general), 3)
+        
+        por_curso, general = self.consultas.obtener_percentiles_de_estudiante("3")
+        self.assertEqual(por_curso["MAT101"][1], 3)
+        self.assertEqual(general[1], 3)
+        self.assertEqual(self.consultas.obtener_percentiles_de_estudiante("9"), ({}, None))
+    
+    def test_transcript_con_totales_acumulados(self):
+        """Prueba el historial académico y su exportación en bloque"""
+        self.consultas.agregar_inscripcion(Inscripcion("i5", "1", "MAT101", "2024-03-01"))
+        historial = self.consultas.transcript("1")
+        
+        self.assertEqual([l.estado for l in historial.lineas], ["Aprobado", "Matriculado", "Inscrito"])
+        self.assertEqual([l.creditos_inscritos for l in historial.lineas], [3, 7, 10])
+        self.assertEqual(historial.lineas[1].curso_nombre, "Física")
+        self.assertEqual((historial.creditos_aprobados, historial.promedio), (3, 4.5))
+        self.assertEqual(self.consultas.transcript("3").lineas[0].estado, "Reprobado")
+        self.assertIsNone(self.consultas.transcript("9"))
+        
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "historiales.csv")
+            self.assertEqual(exportar_transcripts(self.consultas, ruta), 3)
+            with open(ruta, encoding='utf-8') as archivo:
+                self.assertEqual(len(archivo.readlines()), 1 + 3 + 1 + 1)
+        finally:
+            shutil.rmtree(directorio)
+    
+    def test_transcript_inscripcion_con_dos_matriculas(self):
+        """Los créditos de una inscripción se cuentan una vez aunque tenga dos matrículas"""
+        # Estudiante 3 repite MAT101 (3 créditos) sobre la misma inscripción
+        self.consultas.agregar_matricula(Matricula("m5", "i3", "3", "MAT101", "2024-06-01", 3.5))
+        historial = self.consultas.transcript("3")
+        
+        self.assertEqual([l.matricula_id for l in historial.lineas], ["m3", "m5"])
+        self.assertEqual([l.creditos_inscritos for l in historial.lineas], [3, 3])
+        self.assertEqual(historial.creditos_inscritos,
+                         self.consultas.obtener_creditos_inscritos_por_estudiante("3"))
+    
+    def test_carga_docentes(self):
+        """Prueba el reporte de carga docente y el índice por docente"""
+        self.consultas.agregar_curso(Curso("MAT201", "Álgebra", 3, "dr.  lopez"))
+        cargas = self.consultas.obtener_carga_docentes()
+        
+        self.assertEqual([c.docente for c in cargas], ["Dr. López", "Dr. García"])
+        lopez = cargas[0]
+        self.assertEqual((lopez.cursos, lopez.creditos), (["MAT101", "MAT201"], 6))
+        self.assertEqual((lopez.inscritos, lopez.estudiantes, lopez.calificados), (3, 3, 3))
+        self.assertEqual(cargas[1].calificados, 0)
+        
+        self.consultas.actualizar_curso(self.cursos[1], docente="Dra. Díaz")
+        self.assertEqual(self.consultas.obtener_carga_docentes()[1].docente, "Dra. Díaz")
+
+class TestPaginacion(unittest.TestCase):
+    """Pruebas para el paginador"""
+    
+    def test_paginador_entrega_paginas_bajo_demanda(self):
+        """Prueba páginas completas, la última parcial y el fin"""
+        paginador = Paginador(iter(range(5)), tamano_pagina=2)
+        
+        self.assertTrue(paginador.hay_mas)
+        self.assertEqual(paginador.siguiente_pagina(), [0, 1])
+        self.assertEqual(paginador.siguiente_pagina(), [2, 3])
+        self.assertEqual(paginador.siguiente_pagina(), [4])
+        self.assertFalse(paginador.hay_mas)
+        self.assertEqual(paginador.siguiente_pagina(), [])
+        self.assertEqual(paginador.entregados, 5)
+    
+    def test_paginador_vacio(self):
+        """Prueba un iterable vacío"""
+        self.assertFalse(Paginador([], tamano_pagina=3).hay_mas)
 
 if __name__ == '__main__':
     print("Ejecutando pruebas básicas de MiniSIGA...")